@@ -6,17 +6,28 @@ from __future__ import print_function, absolute_import, unicode_literals, divisi
 
 import sys
 import os
+import time
 import inspect
 
 import PySide
 from PySide import QtCore
 from PySide import QtGui
 from pyaid.OsUtils import OsUtils
+from pyaid.debug.Logger import Logger
 from pyaid.file.FileUtils import FileUtils
 from pyaid.json.JSON import JSON
 from pyaid.system.SystemUtils import SystemUtils
 
 from pyglass.app.PyGlassEnvironment import PyGlassEnvironment
+from pyglass.threading.AsyncRemoteExecution import AsyncRemoteExecution
+from pyglass.threading.ProcessExecutionPool import ProcessExecutionPool
+from pyglass.threading.RemoteExecutionPool import RemoteExecutionPool
+from pyglass.threading.RemoteJobScheduler import RemoteJobScheduler
+from pyglass.threading.RemoteTaskRegistry import RemoteTaskRegistry
+from pyglass.threading.SubprocessRemoteExecutionThread import SubprocessRemoteExecutionThread
+from pyglass.web.HttpsRemoteExecutionThread import HttpsRemoteExecutionThread
+from pyglass.web.request.AsyncRequestBackend import AsyncRequestBackend
+from pyglass.web.request.RequestSessionPool import RequestSessionPool
 
 try:
     import appdirs
@@ -33,6 +44,9 @@ class PyGlassApplication(QtCore.QObject):
     _MIN_PYSIDE_VERSION = '1.2.1'
     _LOCATION_PATH = os.path.abspath(os.path.dirname(os.path.abspath(__file__)))
 
+    # The total number of seconds the background execution facilities are given to finish on exit
+    SHUTDOWN_TIMEOUT = 5.0
+
 #___________________________________________________________________________________________________ __init__
     def __init__(self, *args, **kwargs):
         """Creates a new instance of PyGlassApplication."""
@@ -40,6 +54,7 @@ class PyGlassApplication(QtCore.QObject):
         self._qApplication      = None
         self._window            = None
         self._splashScreen      = None
+        self._log               = Logger(self)
 
         self.redirectLogOutputs()
         PyGlassEnvironment.initializeAppSettings(self)
@@ -228,6 +243,9 @@ class PyGlassApplication(QtCore.QObject):
         self.mainWindow.preShow()
         self.mainWindow.show()
 
+        # Scheduled background jobs are paused while the main window is hidden or minimised
+        RemoteJobScheduler.getInstance().watchWindow(self.mainWindow)
+
         self._qApplication.setQuitOnLastWindowClosed(False)
         self._qApplication.lastWindowClosed.connect(self._handleLastWindowClosed)
         result = self._qApplication.exec_()
@@ -273,6 +291,12 @@ class PyGlassApplication(QtCore.QObject):
         FileUtils.mergeCopy(storagePath, resourcePath)
         return True
 
+#___________________________________________________________________________________________________ _getShutdownRemaining
+    @classmethod
+    def _getShutdownRemaining(cls, end):
+        """ Returns the seconds left before the shutdown end time, which is never negative. """
+        return max(0.0, end - time.time())
+
 #___________________________________________________________________________________________________ _showSplashScreen
     def _showSplashScreen(self):
         """_showSplashScreen doc..."""
@@ -315,6 +339,24 @@ class PyGlassApplication(QtCore.QObject):
         if self.mainWindow:
             self.mainWindow.postShow()
         self._onApplicationExit()
+
+        RemoteJobScheduler.getInstance().pause()
+
+        # Cancel any tasks still running and give them the chance to finish, so that no worker
+        # thread is destroyed while running during interpreter shutdown. Every facility shares
+        # the one shutdown timeout so that exit is never delayed by more than its length.
+        end = time.time() + self.SHUTDOWN_TIMEOUT
+        if not RemoteTaskRegistry.getInstance().shutdown(timeout=self._getShutdownRemaining(end)):
+            self._log.write('WARNING: Background tasks were still running at exit')
+        AsyncRequestBackend.shutdownInstance(timeout=self._getShutdownRemaining(end))
+        AsyncRemoteExecution.shutdownInstance(timeout=self._getShutdownRemaining(end))
+        RemoteExecutionPool.getInstance().shutdown(timeout=self._getShutdownRemaining(end))
+        SubprocessRemoteExecutionThread.shutdownSubprocessPool(
+            timeout=self._getShutdownRemaining(end))
+        HttpsRemoteExecutionThread.shutdownStreamPool(timeout=self._getShutdownRemaining(end))
+        ProcessExecutionPool.getInstance().shutdown(wait=False)
+        RequestSessionPool.getInstance().close()
+
         self._qApplication.exit()
 
 #===================================================================================================
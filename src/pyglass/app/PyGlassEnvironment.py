@@ -18,7 +18,8 @@ import requests.utils
 from pyaid.OsUtils import OsUtils
 from pyaid.decorators.ClassGetter import ClassGetter
 from pyaid.file.FileUtils import FileUtils
-from pyaid.json.JSON import JSON
+
+from pyglass.data.JSONCodec import JSONCodec
 
 # AS NEEDED: from pyglass.elements.icons.TextureAtlasManager import TextureAtlasManager
 
@@ -40,6 +41,7 @@ class PyGlassEnvironment(object):
     _rootLocalResourcePath = None
     _isDeployed            = None
     _atlasManager          = None
+    _requestsCABundle      = None
 
 #===================================================================================================
 #                                                                                   G E T / S E T
@@ -93,10 +95,20 @@ class PyGlassEnvironment(object):
 #___________________________________________________________________________________________________ requestsCABundle
     @ClassGetter
     def requestsCABundle(cls):
+        """ The path of the CA bundle used to verify secure requests. The path is resolved once
+            the environment has been initialized and cached for subsequent requests. """
+        if cls._requestsCABundle is not None:
+            return cls._requestsCABundle
+
         if cls.isDeployed:
-            return  cls.getRootResourcePath(
+            bundle = cls.getRootResourcePath(
                 'pythonRoot', 'site-packages', 'requests', 'cacert.pem', isFile=True)
-        return requests.utils.DEFAULT_CA_BUNDLE_PATH
+        else:
+            bundle = requests.utils.DEFAULT_CA_BUNDLE_PATH
+
+        if cls.isInitialized or not cls.isDeployed:
+            cls._requestsCABundle = bundle
+        return bundle
 
 #===================================================================================================
 #                                                                                     P U B L I C
@@ -263,7 +275,7 @@ class PyGlassEnvironment(object):
 
         f = open(envPath, 'w+')
         try:
-            f.write(JSON.asString(cls._ENV_SETTINGS))
+            f.write(JSONCodec.asString(cls._ENV_SETTINGS))
         except Exception:
             print('ERROR: Unable to write environmental settings file at: ' + envPath)
             return False
@@ -291,7 +303,7 @@ class PyGlassEnvironment(object):
                 f.close()
 
             try:
-                settings = JSON.fromString(res)
+                settings = JSONCodec.fromString(res)
             except Exception:
                 print('ERROR: Unable to parse environmental settings file at: ' + envPath)
                 return
@@ -19,6 +19,7 @@ from pyaid.system.SystemUtils import SystemUtils
 from pyglass.compile.SiteLibraryEnum import SiteLibraryEnum
 from pyglass.compile.ResourceCollector import ResourceCollector
 from pyglass.app.PyGlassEnvironment import PyGlassEnvironment
+from pyglass.threading.SubprocessRemoteExecutionThread import SubprocessRemoteExecutionThread
 
 
 #___________________________________________________________________________________________________ PyGlassApplicationCompiler
@@ -111,21 +112,29 @@ class PyGlassApplicationCompiler(object):
 
         os.chdir(binPath)
 
-        ResourceCollector(self, verbose=True).run()
-
-        cmd = [
-            FileUtils.makeFilePath(sys.prefix, 'bin', 'python'),
-            '"%s"' % self._createSetupFile(binPath),
-            OsUtils.getPerOsValue('py2exe', 'py2app'), '>',
-            '"%s"' % self.getBinPath('setup.log', isFile=True)]
-
-        print('[COMPILING]: Executing %s' % OsUtils.getPerOsValue('py2exe', 'py2app'))
-        print('[COMMAND]: %s' % ' '.join(cmd))
-        result = SystemUtils.executeCommand(cmd, remote=False, wait=True)
-        if result['code']:
+        try:
+            # The ui files compiled by the resource collector share the subprocess pool with
+            # the py2app/py2exe thread, so the pool is only shut down once both are done
+            ResourceCollector(self, verbose=True).run()
+
+            cmd = [
+                FileUtils.makeFilePath(sys.prefix, 'bin', 'python'),
+                '"%s"' % self._createSetupFile(binPath),
+                OsUtils.getPerOsValue('py2exe', 'py2app'), '>',
+                '"%s"' % self.getBinPath('setup.log', isFile=True)]
+
+            print('[COMPILING]: Executing %s' % OsUtils.getPerOsValue('py2exe', 'py2app'))
+            print('[COMMAND]: %s' % ' '.join(cmd))
+            thread = SubprocessRemoteExecutionThread(
+                None, ' '.join(cmd), shell=True, captureOutput=True, logOutput=False)
+            thread.execute().wait()
+        finally:
+            # The pool workers must be stopped before the interpreter exits
+            SubprocessRemoteExecutionThread.shutdownSubprocessPool()
+        if not thread.success:
             print('COMPILATION ERROR:')
-            print(result['out'])
-            print(result['error'])
+            print(thread.output)
+            print(thread.error)
             return False
 
         if self.appFilename and OsUtils.isWindows():
@@ -120,7 +120,7 @@ class ResourceCollector(object):
 #___________________________________________________________________________________________________ _copyResourceFolder
     def _copyResourceFolder(self, sourcePath, parts):
         targetPath = FileUtils.createPath(self._targetPath, *parts, isDir=True)
-        WidgetUiCompiler(sourcePath).run()
+        WidgetUiCompiler(sourcePath, shutdownPool=False).run()
 
         if self._verbose:
             self._log.write('COPYING: %s -> %s' % (sourcePath, targetPath))
@@ -8,7 +8,6 @@ import sys
 import os
 import re
 import py_compile
-import subprocess
 
 from pyaid.ArgsUtils import ArgsUtils
 from pyaid.debug.Logger import Logger
@@ -16,6 +15,7 @@ from pyaid.file.FileUtils import FileUtils
 from pyaid.string.StringUtils import StringUtils
 
 from pyglass.app.PyGlassEnvironment import PyGlassEnvironment
+from pyglass.threading.SubprocessRemoteExecutionThread import SubprocessRemoteExecutionThread
 
 #___________________________________________________________________________________________________ WidgetUiCompiler
 class WidgetUiCompiler(object):
@@ -38,8 +38,10 @@ class WidgetUiCompiler(object):
         """Creates a new instance of WidgetUiCompiler."""
         self._log        = Logger(self)
         self._verbose    = ArgsUtils.get('verbose', False, kwargs)
+        self._ownsPool   = ArgsUtils.get('shutdownPool', True, kwargs)
         self._recursive  = recursive
         self._pythonPath = os.path.normpath(sys.exec_prefix)
+        self._compiles   = []
 
         if rootPath and os.path.isabs(rootPath):
             self._rootPath = FileUtils.cleanupPath(rootPath, isDir=True)
@@ -56,8 +58,22 @@ class WidgetUiCompiler(object):
     def run(self):
         """Doc..."""
 
-        FileUtils.walkPath(
-            self._rootPath, self._compileInFolder, data=dict(), recursive=self._recursive)
+        # The ui files are compiled concurrently, limited by the subprocess pool, and their
+        # results are then processed in the order they were found
+        self._compiles = []
+        try:
+            FileUtils.walkPath(
+                self._rootPath, self._compileInFolder, data=dict(), recursive=self._recursive)
+
+            compiles = self._compiles
+            self._compiles = []
+            for path, filename, thread in compiles:
+                self._compileUiFile(path, filename, thread)
+        finally:
+            # The pool workers must be stopped before the interpreter exits, unless the compiler
+            # is nested inside another that still uses the pool and shuts it down itself
+            if self._ownsPool:
+                SubprocessRemoteExecutionThread.shutdownSubprocessPool()
 
 #===================================================================================================
 #                                                                               P R O T E C T E D
@@ -67,11 +83,12 @@ class WidgetUiCompiler(object):
         for name in data.files:
             if not name.endswith('.ui'):
                 continue
-            self._compileUiFile(data.folder, name)
+            self._compiles.append((
+                data.folder, name, self._startUiCompile(data.folder, name)))
 
-#___________________________________________________________________________________________________ _compileUiFile
-    def _compileUiFile(self, path, filename):
-        """Doc..."""
+#___________________________________________________________________________________________________ _startUiCompile
+    def _startUiCompile(self, path, filename):
+        """ Starts the pyside-uic subprocess for the ui file and returns its thread. """
 
         source = FileUtils.createPath(path, filename, isFile=True)
         if self._verbose:
@@ -82,20 +99,32 @@ class WidgetUiCompiler(object):
         else:
             uicCommand = 'pyside-uic'
 
-        cmd = '%s %s' % (uicCommand, source)
-        pipe = subprocess.Popen(
-            cmd,
+        thread = SubprocessRemoteExecutionThread(
+            None, '%s %s' % (uicCommand, source),
             shell=True,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE)
-        out, error = pipe.communicate()
+            captureOutput=True,
+            logOutput=False)
+        thread.execute()
+        return thread
+
+#___________________________________________________________________________________________________ _compileUiFile
+    def _compileUiFile(self, path, filename, thread =None):
+        """ Writes the python module for the ui file from the output of its pyside-uic thread,
+            starting the thread first if one is not specified. """
 
-        if pipe.returncode or error:
+        source = FileUtils.createPath(path, filename, isFile=True)
+        if thread is None:
+            thread = self._startUiCompile(path, filename)
+        thread.future.wait()
+
+        error = thread.errorOutput
+        if not thread.success or error:
+            if not error:
+                error = thread.error
             self._log.write('ERROR: Failed to compile %s widget: %s' % (str(source), str(error)))
             return False
 
-        out = StringUtils.toUnicode(out)
+        out = StringUtils.toUnicode(thread.output)
         res = WidgetUiCompiler._CLASS_NAME_RE.search(out)
         if not res:
             self._log.write('ERROR: Failed to find widget class name for ' + str(source))
@@ -0,0 +1,170 @@
+# JSONCodec.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import json
+import time
+import importlib
+
+#___________________________________________________________________________________________________ JSONCodec
+class JSONCodec(object):
+    """ The JSON encoder and decoder used throughout pyglass. The fastest installed backend is
+        selected on first use, in the order of PREFERRED_BACKENDS, falling back to the standard
+        library json module when none of the C-accelerated libraries are installed. The
+        backend can be overridden with setBackend().
+
+        Values that a faster backend cannot encode, such as integers beyond 64 bits or non-string
+        dictionary keys, are encoded by the standard library instead so that every backend
+        accepts the same values. Note that orjson decodes integers beyond 64 bits as floats. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    # The backends selected automatically, fastest first. simplejson is supported but not
+    # preferred as it is no faster than the standard library's C-accelerated json module.
+    PREFERRED_BACKENDS = ('orjson', 'ujson', 'json')
+
+    SUPPORTED_BACKENDS = ('orjson', 'ujson', 'simplejson', 'json')
+
+    # Payload shapes exchanged by pyglass, used by benchmark()
+    BENCHMARK_PAYLOADS = dict(
+        communicatorResult=dict(
+            success=True, error=False, payload=dict(id='widget-1', values=list(range(20)))),
+        environmentSettings=dict(
+            rootPath='/usr/local/share/app', debug=False, recent=['a.txt', 'b.txt', 'c.txt'],
+            windows=dict(main=dict(x=10, y=20, width=1280, height=800, maximized=False))),
+        apiResponse=dict(
+            count=100,
+            items=[dict(
+                id=i, name='Item %s' % i, score=i*0.25, tags=['x', 'y'], active=bool(i % 2),
+                owner=dict(id=i*7, name='Owner %s' % i)) for i in range(100)]))
+
+    _backend     = None
+    _backendName = None
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ getBackendName
+    @classmethod
+    def getBackendName(cls):
+        """ Returns the name of the backend module in use. """
+        if cls._backend is None:
+            cls._resolveBackend()
+        return cls._backendName
+
+#___________________________________________________________________________________________________ getAvailableBackends
+    @classmethod
+    def getAvailableBackends(cls):
+        """ Returns the names of the supported backends that are installed. """
+        return [name for name in cls.SUPPORTED_BACKENDS if cls._importBackend(name)]
+
+#___________________________________________________________________________________________________ setBackend
+    @classmethod
+    def setBackend(cls, name):
+        """ Selects the named backend, raising a ValueError if it is not installed. """
+        module = cls._importBackend(name)
+        if module is None:
+            raise ValueError('JSON backend "%s" is not available' % name)
+        cls._backend     = module
+        cls._backendName = name
+
+#___________________________________________________________________________________________________ asString
+    @classmethod
+    def asString(cls, value, backend =None):
+        """ Returns the JSON serialization of the value as a unicode string. """
+        backend, module = cls._getBackend(backend)
+
+        if backend == 'orjson':
+            try:
+                return module.dumps(value).decode('utf-8')
+            except TypeError:
+                return cls._encodeStandard(value)
+        elif backend == 'ujson':
+            try:
+                return module.dumps(value, ensure_ascii=False)
+            except (TypeError, OverflowError):
+                return cls._encodeStandard(value)
+        elif backend == 'simplejson':
+            return module.dumps(value, ensure_ascii=False, separators=(',', ':'))
+        return cls._encodeStandard(value)
+
+#___________________________________________________________________________________________________ fromString
+    @classmethod
+    def fromString(cls, value, backend =None):
+        """ Parses the JSON value, which may be a unicode or UTF-8 encoded byte string. Raises a
+            ValueError if it is not valid JSON. """
+        backend, module = cls._getBackend(backend)
+        if backend not in ('orjson', 'ujson') and isinstance(value, bytes):
+            value = value.decode('utf-8')
+        return module.loads(value)
+
+#___________________________________________________________________________________________________ benchmark
+    @classmethod
+    def benchmark(cls, iterations =1000, payloads =None):
+        """ Times encoding and decoding each payload, defaulting to BENCHMARK_PAYLOADS, with
+            every available backend. Returns a dictionary of backend names to dictionaries of
+            payload names to the encode and decode times in microseconds per operation. """
+        payloads = payloads if payloads else cls.BENCHMARK_PAYLOADS
+        out = dict()
+        for name in cls.getAvailableBackends():
+            results = dict()
+            for payloadName, payload in payloads.items():
+                encoded = cls.asString(payload, backend=name)
+
+                start = time.time()
+                for index in range(iterations):
+                    cls.asString(payload, backend=name)
+                encodeTime = time.time() - start
+
+                start = time.time()
+                for index in range(iterations):
+                    cls.fromString(encoded, backend=name)
+                decodeTime = time.time() - start
+
+                results[payloadName] = dict(
+                    encode=1.0e6*encodeTime/iterations,
+                    decode=1.0e6*decodeTime/iterations)
+            out[name] = results
+        return out
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _getBackend
+    @classmethod
+    def _getBackend(cls, name):
+        """ Returns the name and module of the named backend, or of the selected backend if no
+            name is specified. """
+        if name is None:
+            if cls._backend is None:
+                cls._resolveBackend()
+            return cls._backendName, cls._backend
+        return name, cls._importBackend(name)
+
+#___________________________________________________________________________________________________ _resolveBackend
+    @classmethod
+    def _resolveBackend(cls):
+        for name in cls.PREFERRED_BACKENDS:
+            module = cls._importBackend(name)
+            if module is not None:
+                cls._backend     = module
+                cls._backendName = name
+                return
+
+#___________________________________________________________________________________________________ _importBackend
+    @classmethod
+    def _importBackend(cls, name):
+        if name == 'json':
+            return json
+        try:
+            return importlib.import_module(name)
+        except Exception:
+            return None
+
+#___________________________________________________________________________________________________ _encodeStandard
+    @classmethod
+    def _encodeStandard(cls, value):
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
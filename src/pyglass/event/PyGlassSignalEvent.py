@@ -13,6 +13,9 @@ class PyGlassSignalEvent(object):
 #===================================================================================================
 #                                                                                       C L A S S
 
+    # Events are created for every cross-thread dispatch, so slots keep them compact
+    __slots__ = ('_target', '_data')
+
 #___________________________________________________________________________________________________ __init__
     def __init__(self, target, data):
         """Creates a new instance of PyGlassSignalEvent."""
@@ -11,11 +11,11 @@ from pyaid.string.StringUtils import StringUtils
 import sqlalchemy as sqla
 from sqlalchemy.ext.hybrid import hybrid_property
 
-from pyaid.json.JSON import JSON
 from pyaid.radix.Base64 import Base64
 from pyaid.time.TimeUtils import TimeUtils
 
 from pyglass.app.PyGlassEnvironment import PyGlassEnvironment
+from pyglass.data.JSONCodec import JSONCodec
 from pyglass.sqlalchemy.AbstractPyGlassModelsMeta import AbstractPyGlassModelsMeta
 from pyglass.sqlalchemy.PyGlassModelUtils import PyGlassModelUtils
 
@@ -51,14 +51,18 @@ class PyGlassModelsDefault(object):
 #___________________________________________________________________________________________________ GS: data
     @hybrid_property
     def json_data(self):
-        return JSON.fromString(self._json_data) if self._json_data else None
+        """ The parsed value of the _json_data column. Each read parses the column with the
+            JSONCodec into a new object, which is cheaper than copying a cached value, so that
+            modifying the returned value never changes other reads. Assign modified values back
+            to json_data to store them. """
+        return JSONCodec.fromString(self._json_data) if self._json_data else None
     @json_data.setter
     def json_data(self, value):
         if value is None:
-            self.json_data = ''
+            self._json_data = ''
             return
 
-        self.json_data = JSON.asString(value)
+        self._json_data = JSONCodec.asString(value)
 
 #___________________________________________________________________________________________________ GS: upts
     @hybrid_property
@@ -0,0 +1,202 @@
+# AsyncRemoteExecution.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import threading
+
+try:
+    import asyncio
+except Exception as err:
+    asyncio = None
+
+#___________________________________________________________________________________________________ AsyncRemoteExecution
+class AsyncRemoteExecution(object):
+    """ Runs a single asyncio event loop on a background thread and executes coroutines on it.
+        I/O-bound work written as coroutines shares this one thread instead of occupying a thread
+        per task. Coroutines are normally executed through an AsyncRemoteExecutionThread, which
+        delivers their results to the GUI thread through the usual completeSignal.
+
+        The loop thread is started on first use. Requires a Python version that includes asyncio.
+        """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    _instance = None
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, name =None):
+        """Creates a new instance of AsyncRemoteExecution."""
+        self._name    = name if name else self.__class__.__name__
+        self._lock    = threading.Lock()
+        self._loop    = None
+        self._thread  = None
+        self._futures = set()
+        self._count   = 0
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: name
+    @property
+    def name(self):
+        """ The name of the loop thread. """
+        return self._name
+
+#___________________________________________________________________________________________________ GS: loop
+    @property
+    def loop(self):
+        """ The asyncio event loop running on the background thread, or None if it has not been
+            started. """
+        return self._loop
+
+#___________________________________________________________________________________________________ GS: isRunning
+    @property
+    def isRunning(self):
+        return self._loop is not None
+
+#___________________________________________________________________________________________________ GS: pendingCount
+    @property
+    def pendingCount(self):
+        """ The number of coroutines scheduled on the loop that have not yet completed. """
+        return len(self._futures)
+
+#___________________________________________________________________________________________________ GS: taskCount
+    @property
+    def taskCount(self):
+        """ The total number of coroutines scheduled on the loop. """
+        return self._count
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ getInstance
+    @classmethod
+    def getInstance(cls):
+        """ Returns the shared instance, creating it on first access. """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+#___________________________________________________________________________________________________ isAvailable
+    @classmethod
+    def isAvailable(cls):
+        """ Specifies whether or not asyncio is available to the running Python interpreter. """
+        return asyncio is not None
+
+#___________________________________________________________________________________________________ shutdownInstance
+    @classmethod
+    def shutdownInstance(cls, timeout =None):
+        """ Shuts down the shared instance if it has been created. Called by the PyGlassApplication
+            when its last window closes. """
+        if cls._instance is None:
+            return False
+        return cls._instance.shutdown(timeout=timeout)
+
+#___________________________________________________________________________________________________ start
+    def start(self):
+        """ Starts the loop thread if it is not already running and returns the loop. """
+        if asyncio is None:
+            raise RuntimeError('AsyncRemoteExecution requires asyncio')
+
+        with self._lock:
+            if self._loop is not None:
+                return self._loop
+
+            loop    = asyncio.new_event_loop()
+            started = threading.Event()
+            thread  = threading.Thread(
+                target=self._runLoop, args=(loop, started), name=self._name)
+            thread.daemon = True
+            thread.start()
+            started.wait()
+
+            self._loop   = loop
+            self._thread = thread
+            return loop
+
+#___________________________________________________________________________________________________ runCoroutine
+    def runCoroutine(self, coroutine):
+        """ Schedules the coroutine on the loop thread and returns a concurrent.futures.Future for
+            its result. Cancelling the returned future cancels the coroutine. Callbacks added to
+            the returned future are invoked on the loop thread. """
+        loop   = self.start()
+        future = asyncio.run_coroutine_threadsafe(coroutine, loop)
+
+        with self._lock:
+            self._futures.add(future)
+            self._count += 1
+        future.add_done_callback(self._handleFutureDone)
+        return future
+
+#___________________________________________________________________________________________________ cancelAll
+    def cancelAll(self):
+        """ Cancels every coroutine that is still pending on the loop. Returns the number of
+            coroutines cancelled. """
+        with self._lock:
+            futures = list(self._futures)
+
+        return len([f for f in futures if f.cancel()])
+
+#___________________________________________________________________________________________________ shutdown
+    def shutdown(self, timeout =None):
+        """ Stops the loop thread, cancelling any coroutines that are still pending and waiting
+            up to timeout seconds for the thread to finish. The loop is started again if another
+            coroutine is scheduled afterwards. """
+        with self._lock:
+            loop   = self._loop
+            thread = self._thread
+            self._loop   = None
+            self._thread = None
+
+        if loop is None:
+            return False
+
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not threading.current_thread():
+            thread.join(timeout)
+        return True
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _runLoop
+    @classmethod
+    def _runLoop(cls, loop, started):
+        """ The loop thread target. Once the loop is stopped any remaining tasks are cancelled and
+            given the chance to finish before the loop is closed. """
+        asyncio.set_event_loop(loop)
+        loop.call_soon(started.set)
+        try:
+            loop.run_forever()
+        finally:
+            allTasks = getattr(asyncio, 'all_tasks', None) or asyncio.Task.all_tasks
+            tasks    = [t for t in allTasks(loop) if not t.done()]
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+#===================================================================================================
+#                                                                                 H A N D L E R S
+
+#___________________________________________________________________________________________________ _handleFutureDone
+    def _handleFutureDone(self, future):
+        with self._lock:
+            self._futures.discard(future)
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        return self.__str__()
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return '<%s running[%s] pending[%s]>' % (
+            self.__class__.__name__, self.isRunning, len(self._futures))
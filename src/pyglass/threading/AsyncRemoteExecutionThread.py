@@ -0,0 +1,99 @@
+# AsyncRemoteExecutionThread.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+from pyglass.threading.AsyncRemoteExecution import AsyncRemoteExecution
+from pyglass.threading.RemoteExecutionThread import RemoteExecutionThread
+from pyglass.threading.RemoteTaskRegistry import RemoteTaskRegistry
+
+#___________________________________________________________________________________________________ AsyncRemoteExecutionThread
+class AsyncRemoteExecutionThread(RemoteExecutionThread):
+    """ Executes a coroutine on the shared AsyncRemoteExecution loop instead of a worker thread.
+        The coroutine's return value, or the exception it raised, is delivered through the same
+        completeSignal, RemoteThreadEvent and future as any other RemoteExecutionThread.
+
+        Cancelling the thread cancels the coroutine, which sees a CancelledError at its current
+        await and completes with a cancelled status. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, parent, coroutine, **kwargs):
+        """Creates a new instance of AsyncRemoteExecutionThread."""
+        super(AsyncRemoteExecutionThread, self).__init__(parent, **kwargs)
+        self._coroutine = coroutine
+        self._executor  = kwargs.get('executor')
+        self._task      = None
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: executor
+    @property
+    def executor(self):
+        """ The AsyncRemoteExecution on which the coroutine runs. Defaults to the shared
+            instance. """
+        return self._executor if self._executor else AsyncRemoteExecution.getInstance()
+    @executor.setter
+    def executor(self, value):
+        self._executor = value
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ submit
+    @classmethod
+    def submit(cls, coroutine, **kwargs):
+        """ Executes the coroutine on the shared loop and returns the RemoteExecutionFuture for
+            its result. Keyword arguments are passed to execute(). """
+        return cls(None, coroutine).execute(**kwargs)
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _executeImpl
+    def _executeImpl(self):
+        if self._token.isCancelled:
+            self._coroutine.close()
+            self._runCancelled()
+            return
+
+        executor = self.executor
+        RemoteTaskRegistry.getInstance().markStarted(self, worker=executor.name)
+        try:
+            self._task = executor.runCoroutine(self._coroutine)
+        except Exception as err:
+            self._error = err
+            self._log.writeError('FAILED: Unable to schedule coroutine', err)
+            self._runComplete(1)
+            return
+
+        self._token.addCallback(self._handleCancelled)
+        self._task.add_done_callback(self._handleTaskDone)
+
+#===================================================================================================
+#                                                                                 H A N D L E R S
+
+#___________________________________________________________________________________________________ _handleCancelled
+    def _handleCancelled(self):
+        self._task.cancel()
+
+#___________________________________________________________________________________________________ _handleTaskDone
+    def _handleTaskDone(self, task):
+        """ Invoked on the loop thread once the coroutine has finished. """
+        if task.cancelled():
+            self._runCancelled()
+            return
+
+        error = task.exception()
+        if error is not None:
+            self._error = error
+            self._log.writeError('FAILED: Coroutine execution', error)
+            self._runComplete(1)
+            return
+
+        self._output = task.result()
+        self._runComplete(0)
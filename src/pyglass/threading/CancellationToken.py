@@ -0,0 +1,111 @@
+# CancellationToken.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import threading
+
+from pyglass.threading.RemoteTaskCancelledError import RemoteTaskCancelledError
+
+#___________________________________________________________________________________________________ CancellationToken
+class CancellationToken(object):
+    """ A thread-safe flag used to cooperatively cancel background work. The running task polls
+        the token, or calls raiseIfCancelled(), at convenient points and stops early once the
+        token has been cancelled. Tokens can be chained so that cancelling a parent token also
+        cancels all of its children. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    _CURRENT = threading.local()
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, parent =None):
+        """Creates a new instance of CancellationToken."""
+        self._event     = threading.Event()
+        self._callbacks = []
+        self._lock      = threading.Lock()
+
+        if parent is not None:
+            parent.addCallback(self.cancel)
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: isCancelled
+    @property
+    def isCancelled(self):
+        return self._event.is_set()
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ current
+    @classmethod
+    def current(cls):
+        """ Returns the token for the task executing on the calling thread, or None if the
+            calling thread is not executing a cancellable task. Functions run through a
+            FunctionRemoteExecutionThread use this to poll for cancellation. """
+        return getattr(cls._CURRENT, 'token', None)
+
+#___________________________________________________________________________________________________ cancel
+    def cancel(self):
+        """ Cancels the token and notifies any registered callbacks. Returns False if the token
+            had already been cancelled. """
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self._event.set()
+            callbacks = self._callbacks
+            self._callbacks = []
+
+        for callback in callbacks:
+            callback()
+        return True
+
+#___________________________________________________________________________________________________ addCallback
+    def addCallback(self, callback):
+        """ Registers a callable that is invoked, on the cancelling thread, when the token is
+            cancelled. If the token is already cancelled the callback is invoked immediately. """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+#___________________________________________________________________________________________________ raiseIfCancelled
+    def raiseIfCancelled(self):
+        if self._event.is_set():
+            raise RemoteTaskCancelledError('Task was cancelled')
+
+#___________________________________________________________________________________________________ wait
+    def wait(self, timeout =None):
+        """ Blocks until the token is cancelled or the timeout in seconds expires. Useful as an
+            interruptible replacement for time.sleep() inside background tasks. Returns True if
+            the token was cancelled. """
+        self._event.wait(timeout)
+        return self._event.is_set()
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _setCurrent
+    @classmethod
+    def _setCurrent(cls, token):
+        """ Sets the token for the task executing on the calling thread and returns the token that
+            was previously set so that it can be restored. """
+        previous = getattr(cls._CURRENT, 'token', None)
+        cls._CURRENT.token = token
+        return previous
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        return self.__str__()
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return '<%s cancelled[%s]>' % (self.__class__.__name__, self.isCancelled)
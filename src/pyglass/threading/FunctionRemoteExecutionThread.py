@@ -8,7 +8,9 @@ from pyglass.threading.RemoteExecutionThread import RemoteExecutionThread
 
 #___________________________________________________________________________________________________ FunctionRemoteExecutionThread
 class FunctionRemoteExecutionThread(RemoteExecutionThread):
-    """A class for..."""
+    """ Executes a function with the specified arguments in the background. Long running functions
+        can cooperatively support cancellation by polling CancellationToken.current() or calling
+        its raiseIfCancelled() method. """
 
 #===================================================================================================
 #                                                                                       C L A S S
@@ -22,6 +24,16 @@ class FunctionRemoteExecutionThread(RemoteExecutionThread):
         self._args = args
         self._kwargs = kwargs
 
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ submit
+    @classmethod
+    def submit(cls, function, *args, **kwargs):
+        """ Executes the function with the specified arguments in the background and returns the
+            RemoteExecutionFuture for its result. """
+        return cls(None, function, *args, **kwargs).execute()
+
 #===================================================================================================
 #                                                                               P R O T E C T E D
 
@@ -0,0 +1,270 @@
+# MemoizingRemoteExecutor.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import sys
+import time
+import threading
+from collections import OrderedDict
+
+from pyglass.threading.FunctionRemoteExecutionThread import FunctionRemoteExecutionThread
+from pyglass.threading.RemoteExecutionFuture import RemoteExecutionFuture
+from pyglass.threading.RemoteTaskStatusEnum import RemoteTaskStatusEnum
+
+#___________________________________________________________________________________________________ MemoizingRemoteExecutor
+class MemoizingRemoteExecutor(object):
+    """ Executes functions in the background through FunctionRemoteExecutionThread while caching
+        their results by function and arguments. Submissions matching a cached result resolve
+        immediately, and submissions matching a task that is still running share that task
+        instead of starting another, with its result fanned out to every caller's future.
+
+        Cached results are evicted in least recently used order once there are more than
+        maxEntries of them or their estimated size exceeds maxBytes, and expire ttl seconds after
+        they were computed. Only successful results are cached. Submissions with unhashable
+        arguments are executed without memoization. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    DEFAULT_MAX_ENTRIES = 256
+
+    _instance = None
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(
+            self, maxEntries =None, ttl =None, maxBytes =None, sizeFunction =None,
+            threadClass =None
+    ):
+        """ Creates a new instance of MemoizingRemoteExecutor.
+
+            @@@param ttl:number
+                The number of seconds for which a result remains valid. Results never expire when
+                None.
+
+            @@@param maxBytes:int
+                The memory budget for cached results, as measured by sizeFunction. Unlimited when
+                None.
+
+            @@@param sizeFunction:function
+                Returns the estimated size in bytes of a result. Defaults to sys.getsizeof, which
+                does not include the size of the objects a container refers to.
+
+            @@@param threadClass:class
+                The FunctionRemoteExecutionThread class used to execute the functions.
+        """
+        self.maxEntries   = self.DEFAULT_MAX_ENTRIES if maxEntries is None else maxEntries
+        self.ttl          = ttl
+        self.maxBytes     = maxBytes
+        self.sizeFunction = sizeFunction if sizeFunction else sys.getsizeof
+        self.threadClass  = threadClass if threadClass else FunctionRemoteExecutionThread
+
+        self._lock      = threading.RLock()
+        self._entries   = OrderedDict()
+        self._inFlight  = dict()
+        self._byteCount = 0
+
+        self._hitCount        = 0
+        self._missCount       = 0
+        self._coalescedCount  = 0
+        self._evictionCount   = 0
+        self._expirationCount = 0
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: size
+    @property
+    def size(self):
+        """ The number of cached results. """
+        return len(self._entries)
+
+#___________________________________________________________________________________________________ GS: byteCount
+    @property
+    def byteCount(self):
+        """ The estimated size in bytes of the cached results. """
+        return self._byteCount
+
+#___________________________________________________________________________________________________ GS: inFlightCount
+    @property
+    def inFlightCount(self):
+        """ The number of distinct tasks currently running. """
+        return len(self._inFlight)
+
+#___________________________________________________________________________________________________ GS: stats
+    @property
+    def stats(self):
+        lookups = self._hitCount + self._missCount + self._coalescedCount
+        return dict(
+            entries=len(self._entries),
+            bytes=self._byteCount,
+            inFlight=len(self._inFlight),
+            hits=self._hitCount,
+            misses=self._missCount,
+            coalesced=self._coalescedCount,
+            evictions=self._evictionCount,
+            expirations=self._expirationCount,
+            hitRatio=float(self._hitCount + self._coalescedCount)/lookups if lookups else 0.0)
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ getInstance
+    @classmethod
+    def getInstance(cls):
+        """ Returns the shared executor, creating it on first access. """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+#___________________________________________________________________________________________________ submit
+    def submit(self, function, *args, **kwargs):
+        """ Returns a RemoteExecutionFuture for the result of calling the function with the
+            specified arguments, reusing a cached result or running task where possible. Each
+            call returns its own future, so cancelling it does not affect other callers. """
+        key = self._createKey(function, args, kwargs)
+        if key is None:
+            return self.threadClass(None, function, *args, **kwargs).execute()
+
+        with self._lock:
+            entry = self._getEntry(key)
+            if entry is not None:
+                self._hitCount += 1
+                return RemoteExecutionFuture.resolved(entry[0])
+
+            shared = self._inFlight.get(key)
+            isNew  = shared is None
+            if isNew:
+                self._missCount += 1
+                shared = self.threadClass(None, function, *args, **kwargs).future
+                self._inFlight[key] = shared
+            else:
+                self._coalescedCount += 1
+
+        if isNew:
+            # Executed outside of the lock, as the task may complete before execute() returns
+            shared._addResolveListener(lambda future: self._handleResolved(key, future))
+            shared.target.execute()
+
+        out = RemoteExecutionFuture()
+        shared._addResolveListener(out._resolveFrom)
+        return out
+
+#___________________________________________________________________________________________________ invalidate
+    def invalidate(self, function, *args, **kwargs):
+        """ Removes the cached result for the function and arguments. Returns True if a result
+            was removed. """
+        key = self._createKey(function, args, kwargs)
+        with self._lock:
+            if key is None or key not in self._entries:
+                return False
+            self._removeEntry(key)
+            return True
+
+#___________________________________________________________________________________________________ clear
+    def clear(self):
+        """ Removes all cached results. Running tasks are not affected. """
+        with self._lock:
+            self._entries.clear()
+            self._byteCount = 0
+
+#___________________________________________________________________________________________________ purge
+    def purge(self):
+        """ Removes any expired results. Returns the number of results removed. """
+        if self.ttl is None:
+            return 0
+
+        with self._lock:
+            now     = time.time()
+            expired = [k for k, e in self._entries.items() if now - e[1] >= self.ttl]
+            for key in expired:
+                self._removeEntry(key)
+            self._expirationCount += len(expired)
+            return len(expired)
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _createKey
+    @classmethod
+    def _createKey(cls, function, args, kwargs):
+        """ Returns the cache key for the call, or None if any argument is unhashable. """
+        key = (function, tuple(args), tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+#___________________________________________________________________________________________________ _getEntry
+    def _getEntry(self, key):
+        """ Returns the valid entry for the key, marking it as most recently used, or None. Must
+            be called while holding the lock. """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if self.ttl is not None and time.time() - entry[1] >= self.ttl:
+            self._removeEntry(key)
+            self._expirationCount += 1
+            return None
+
+        # Moves the entry to the most recently used end
+        del self._entries[key]
+        self._entries[key] = entry
+        return entry
+
+#___________________________________________________________________________________________________ _addEntry
+    def _addEntry(self, key, output):
+        """ Caches the output and evicts the least recently used results until the cache is
+            within its limits. Must be called while holding the lock. """
+        try:
+            size = self.sizeFunction(output)
+        except Exception:
+            size = 0
+
+        if self.maxBytes is not None and size > self.maxBytes:
+            return False
+
+        if key in self._entries:
+            self._removeEntry(key)
+        self._entries[key] = (output, time.time(), size)
+        self._byteCount   += size
+
+        while self._entries and (
+            len(self._entries) > self.maxEntries or
+            (self.maxBytes is not None and self._byteCount > self.maxBytes)
+        ):
+            self._removeEntry(next(iter(self._entries)))
+            self._evictionCount += 1
+        return True
+
+#___________________________________________________________________________________________________ _removeEntry
+    def _removeEntry(self, key):
+        entry = self._entries.pop(key)
+        self._byteCount -= entry[2]
+
+#===================================================================================================
+#                                                                                 H A N D L E R S
+
+#___________________________________________________________________________________________________ _handleResolved
+    def _handleResolved(self, key, future):
+        """ Invoked on the thread that resolves a running task. """
+        with self._lock:
+            if self._inFlight.get(key) is future:
+                del self._inFlight[key]
+            if future.status == RemoteTaskStatusEnum.SUCCESS:
+                self._addEntry(key, future.output)
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        return self.__str__()
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return '<%s entries[%s] inFlight[%s]>' % (
+            self.__class__.__name__, len(self._entries), len(self._inFlight))
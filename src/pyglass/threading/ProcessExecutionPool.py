@@ -0,0 +1,121 @@
+# ProcessExecutionPool.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import threading
+import multiprocessing
+
+#___________________________________________________________________________________________________ ProcessExecutionPool
+class ProcessExecutionPool(object):
+    """ A pool of warm worker processes used to execute CPU-bound functions outside of the GUI
+        process so that they do not contend for the GIL. The worker processes are started on first
+        use and reused for every subsequent task until the pool is shut down.
+
+        Functions and their arguments are pickled to the worker processes, so they must be
+        importable module-level callables with picklable arguments and return values. Deployed
+        Windows applications must call multiprocessing.freeze_support() at startup. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    DEFAULT_PROCESS_COUNT = max(1, multiprocessing.cpu_count() - 1)
+
+    _instance = None
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, processCount =None):
+        """Creates a new instance of ProcessExecutionPool."""
+        self._processCount = max(1, int(
+            processCount if processCount else self.DEFAULT_PROCESS_COUNT))
+        self._pool         = None
+        self._lock         = threading.Lock()
+        self._taskCount    = 0
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: processCount
+    @property
+    def processCount(self):
+        """ The number of worker processes in the pool. Changing the value restarts the pool once
+            any running tasks complete. """
+        return self._processCount
+    @processCount.setter
+    def processCount(self, value):
+        value = max(1, int(value))
+        if value == self._processCount:
+            return
+        self._processCount = value
+        self.shutdown()
+
+#___________________________________________________________________________________________________ GS: isRunning
+    @property
+    def isRunning(self):
+        """ Specifies whether or not the worker processes have been started. """
+        return self._pool is not None
+
+#___________________________________________________________________________________________________ GS: taskCount
+    @property
+    def taskCount(self):
+        """ The number of tasks submitted to the pool's worker processes. """
+        return self._taskCount
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ getInstance
+    @classmethod
+    def getInstance(cls):
+        """ Returns the shared process pool, creating it on first access. """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+#___________________________________________________________________________________________________ start
+    def start(self):
+        """ Starts the worker processes if they are not already running. Calling this during
+            application startup avoids the process spawn cost on the first submitted task. """
+        with self._lock:
+            if self._pool is None:
+                self._pool = multiprocessing.Pool(processes=self._processCount)
+            return self._pool
+
+#___________________________________________________________________________________________________ submit
+    def submit(self, function, args =None, kwargs =None):
+        """ Queues the function for execution in a worker process and returns the
+            multiprocessing AsyncResult used to retrieve the result. """
+        pool = self.start()
+        self._taskCount += 1
+        return pool.apply_async(function, args if args else (), kwargs if kwargs else {})
+
+#___________________________________________________________________________________________________ shutdown
+    def shutdown(self, wait =True):
+        """ Stops the worker processes. When wait is True, queued tasks are allowed to finish
+            first. Otherwise the worker processes are terminated immediately. """
+        with self._lock:
+            pool = self._pool
+            self._pool = None
+
+        if pool is None:
+            return False
+
+        if wait:
+            pool.close()
+        else:
+            pool.terminate()
+        pool.join()
+        return True
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        return self.__str__()
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return '<%s processes[%s] running[%s]>' % (
+            self.__class__.__name__, self._processCount, self.isRunning)
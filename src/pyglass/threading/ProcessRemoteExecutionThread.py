@@ -0,0 +1,70 @@
+# ProcessRemoteExecutionThread.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+from pyglass.threading.FunctionRemoteExecutionThread import FunctionRemoteExecutionThread
+from pyglass.threading.ProcessExecutionPool import ProcessExecutionPool
+
+#___________________________________________________________________________________________________ ProcessRemoteExecutionThread
+class ProcessRemoteExecutionThread(FunctionRemoteExecutionThread):
+    """ A FunctionRemoteExecutionThread that executes its function in a ProcessExecutionPool
+        worker process instead of the executing thread. This keeps CPU-bound Python work from
+        holding the GIL of the GUI process while exposing the same signals and result properties.
+
+        Exceptions raised by the function, or while pickling it and its arguments, are stored in
+        the error property and reported with a non-zero return code. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    # The interval, in seconds, at which the waiting thread checks for cancellation
+    _POLL_INTERVAL = 0.05
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, parent, function, *args, **kwargs):
+        """Creates a new instance of ProcessRemoteExecutionThread."""
+        super(ProcessRemoteExecutionThread, self).__init__(parent, function, *args, **kwargs)
+        self._processPool = None
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: processPool
+    @property
+    def processPool(self):
+        """ The ProcessExecutionPool on which the function executes. Defaults to the shared
+            instance. """
+        return self._processPool if self._processPool else ProcessExecutionPool.getInstance()
+    @processPool.setter
+    def processPool(self, value):
+        self._processPool = value
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _runImpl
+    def _runImpl(self):
+        """Doc..."""
+        try:
+            result = self.processPool.submit(self._function, self._args, self._kwargs)
+        except Exception as err:
+            self._error = err
+            self._log.writeError('FAILED: Unable to submit function to process pool', err)
+            return 1
+
+        # Wait in short intervals so that cancellation is noticed while the worker process runs.
+        # The process itself cannot be interrupted so its eventual result is discarded.
+        while not result.ready():
+            if self._token.isCancelled:
+                return self.CANCELLED_CODE
+            result.wait(self._POLL_INTERVAL)
+
+        try:
+            self._output = result.get()
+        except Exception as err:
+            self._error = err
+            self._log.writeError('FAILED: Process pool function execution', err)
+            return 1
+        return 0
@@ -0,0 +1,151 @@
+# RemoteEventBus.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import threading
+import traceback
+from collections import deque
+
+from PySide import QtCore
+
+#___________________________________________________________________________________________________ RemoteEventBus
+class RemoteEventBus(QtCore.QObject):
+    """ Collects events dispatched by worker threads and delivers them on the GUI thread in
+        batches. Instead of each event being posted to the GUI event loop individually, workers
+        append their events to a lock-protected deque and a single wake up is posted for the whole
+        batch, which the GUI thread drains in one pass. When drainInterval is greater than zero
+        the drain is additionally deferred by that many milliseconds so that events arriving
+        within one timer tick share a single drain.
+
+        Used by RemoteExecutionThread.dispatchEvent() when USE_EVENT_BUS is enabled. Events are
+        delivered in the order they were posted. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    DEFAULT_DRAIN_INTERVAL = 0
+
+    DEFAULT_MAX_BATCH_SIZE = 0
+
+    _instance = None
+
+    _wakeSignal = QtCore.Signal()
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, parent =None):
+        """Creates a new instance of RemoteEventBus."""
+        QtCore.QObject.__init__(self, parent)
+        self._lock        = threading.Lock()
+        self._queue       = deque()
+        self._isScheduled = False
+
+        self._postedCount  = 0
+        self._drainCount   = 0
+        self._largestBatch = 0
+
+        self.drainInterval = self.DEFAULT_DRAIN_INTERVAL
+        self.maxBatchSize  = self.DEFAULT_MAX_BATCH_SIZE
+
+        self._wakeSignal.connect(self._handleWake)
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: queueDepth
+    @property
+    def queueDepth(self):
+        """ The number of events waiting to be delivered. """
+        return len(self._queue)
+
+#___________________________________________________________________________________________________ GS: stats
+    @property
+    def stats(self):
+        return dict(
+            posted=self._postedCount,
+            drains=self._drainCount,
+            largestBatch=self._largestBatch,
+            queueDepth=len(self._queue))
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ getInstance
+    @classmethod
+    def getInstance(cls):
+        """ Returns the shared event bus, creating it on first access. The bus is moved to the
+            thread of the application so that it drains on the GUI thread even if it was first
+            accessed from a worker. """
+        if cls._instance is None:
+            bus = cls()
+            app = QtCore.QCoreApplication.instance()
+            if app is not None:
+                bus.moveToThread(app.thread())
+            cls._instance = bus
+        return cls._instance
+
+#___________________________________________________________________________________________________ post
+    def post(self, signal, event):
+        """ Queues the event for emission by the signal on the GUI thread. Safe to call from any
+            thread. """
+        with self._lock:
+            self._queue.append((signal, event))
+            self._postedCount += 1
+            if self._isScheduled:
+                return
+            self._isScheduled = True
+
+        self._wakeSignal.emit()
+
+#___________________________________________________________________________________________________ drain
+    def drain(self):
+        """ Emits the queued events. Must be called on the GUI thread. Returns the number of
+            events delivered. """
+        with self._lock:
+            if self.maxBatchSize > 0 and len(self._queue) > self.maxBatchSize:
+                batch = [self._queue.popleft() for i in range(self.maxBatchSize)]
+                reschedule = True
+            else:
+                batch = list(self._queue)
+                self._queue.clear()
+                reschedule = False
+            self._isScheduled = reschedule
+
+            self._drainCount  += 1
+            self._largestBatch = max(self._largestBatch, len(batch))
+
+        for signal, event in batch:
+            try:
+                signal.emit(event)
+            except Exception:
+                traceback.print_exc()
+
+        if reschedule:
+            # Yields to the event loop before delivering the rest of a large backlog. The timer
+            # is used even without a drain interval because emitting the wake signal here, on the
+            # GUI thread, would call drain directly and recurse through the backlog.
+            QtCore.QTimer.singleShot(max(0, self.drainInterval), self.drain)
+        return len(batch)
+
+#===================================================================================================
+#                                                                                 H A N D L E R S
+
+#___________________________________________________________________________________________________ _handleWake
+    def _handleWake(self):
+        if self.drainInterval > 0:
+            QtCore.QTimer.singleShot(self.drainInterval, self.drain)
+        else:
+            self.drain()
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        return self.__str__()
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return '<%s queued[%s] drains[%s]>' % (
+            self.__class__.__name__, len(self._queue), self._drainCount)
@@ -0,0 +1,325 @@
+# RemoteExecutionFuture.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import threading
+import traceback
+
+from PySide import QtCore
+
+from pyglass.threading.RemoteTaskCancelledError import RemoteTaskCancelledError
+from pyglass.threading.RemoteTaskStatusEnum import RemoteTaskStatusEnum
+from pyglass.threading.RemoteTaskTimeoutError import RemoteTaskTimeoutError
+
+#___________________________________________________________________________________________________ RemoteExecutionFuture
+class RemoteExecutionFuture(QtCore.QObject):
+    """ The eventual result of a background task. The result can be retrieved by blocking with
+        result(), which is useful for scripts and tests, or by registering callbacks with then()
+        and addDoneCallback(). Callbacks are always invoked on the thread that owns the future,
+        normally the GUI thread, and so require a running event loop. Blocking waits do not.
+
+        Futures are composable. then() returns a new future for the callback's return value,
+        while gather() and any() combine several futures into one. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    _resolvedSignal = QtCore.Signal()
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, parent =None, target =None):
+        """Creates a new instance of RemoteExecutionFuture."""
+        QtCore.QObject.__init__(self, parent)
+        self._target    = target
+        self._lock      = threading.Lock()
+        self._done      = threading.Event()
+        self._notified  = False
+        self._callbacks = []
+        self._listeners = []
+        self._output    = None
+        self._error     = None
+        self._status    = None
+
+        # Queued when resolved from another thread so that callbacks run on the owning thread
+        self._resolvedSignal.connect(self._notify)
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: target
+    @property
+    def target(self):
+        """ The RemoteExecutionThread that resolves this future, if any. """
+        return self._target
+
+#___________________________________________________________________________________________________ GS: isDone
+    @property
+    def isDone(self):
+        return self._done.is_set()
+
+#___________________________________________________________________________________________________ GS: status
+    @property
+    def status(self):
+        """ The RemoteTaskStatusEnum value of the future once resolved, or None otherwise. """
+        return self._status
+
+#___________________________________________________________________________________________________ GS: success
+    @property
+    def success(self):
+        return self._status == RemoteTaskStatusEnum.SUCCESS
+
+#___________________________________________________________________________________________________ GS: isCancelled
+    @property
+    def isCancelled(self):
+        return self._status == RemoteTaskStatusEnum.CANCELLED
+
+#___________________________________________________________________________________________________ GS: output
+    @property
+    def output(self):
+        return self._output
+
+#___________________________________________________________________________________________________ GS: error
+    @property
+    def error(self):
+        return self._error
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ resolved
+    @classmethod
+    def resolved(cls, output =None, parent =None):
+        """ Creates a future that has already succeeded with the specified output. """
+        out = cls(parent=parent)
+        out._resolve(output=output, status=RemoteTaskStatusEnum.SUCCESS)
+        return out
+
+#___________________________________________________________________________________________________ gather
+    @classmethod
+    def gather(cls, futures, parent =None):
+        """ Returns a future that succeeds with the list of outputs, in the order of the specified
+            futures, once all of them have succeeded. It fails or is cancelled as soon as any one
+            of the futures fails or is cancelled. """
+        futures = list(futures)
+        out     = cls(parent=parent)
+        if not futures:
+            return cls.resolved([], parent=parent)
+
+        lock  = threading.Lock()
+        state = dict(remaining=len(futures))
+
+        def onResolved(future):
+            if not future.success:
+                out._resolveFrom(future)
+                return
+
+            with lock:
+                state['remaining'] -= 1
+                finished = not state['remaining']
+
+            if finished:
+                out._resolve(
+                    output=[f.output for f in futures],
+                    status=RemoteTaskStatusEnum.SUCCESS)
+
+        for f in futures:
+            f._addResolveListener(onResolved)
+        return out
+
+#___________________________________________________________________________________________________ any
+    @classmethod
+    def any(cls, futures, parent =None):
+        """ Returns a future that succeeds with the output of the first of the specified futures
+            to succeed. It only fails if all of the futures fail, in which case it adopts the
+            result of the last one to complete, or fails immediately if no futures are
+            specified. """
+        futures = list(futures)
+        out     = cls(parent=parent)
+        if not futures:
+            out._resolve(
+                error=ValueError('No futures were specified'),
+                status=RemoteTaskStatusEnum.FAILED)
+            return out
+
+        lock    = threading.Lock()
+        state   = dict(remaining=len(futures))
+
+        def onResolved(future):
+            with lock:
+                state['remaining'] -= 1
+                finished = not state['remaining']
+
+            if future.success or finished:
+                out._resolveFrom(future)
+
+        for f in futures:
+            f._addResolveListener(onResolved)
+        return out
+
+#___________________________________________________________________________________________________ result
+    def result(self, timeout =None):
+        """ Blocks until the future is resolved and returns its output. Raises the task's error
+            if it failed, RemoteTaskCancelledError if it was cancelled, or RemoteTaskTimeoutError
+            if the timeout, in seconds, expires first. This does not require an event loop. """
+        if not self._done.wait(timeout):
+            raise RemoteTaskTimeoutError('Timed out waiting for %s' % self)
+
+        if self._status == RemoteTaskStatusEnum.CANCELLED:
+            raise RemoteTaskCancelledError('Task was cancelled')
+
+        if self._status != RemoteTaskStatusEnum.SUCCESS:
+            if isinstance(self._error, Exception):
+                raise self._error
+            raise RuntimeError('Task failed: %s' % (self._error,))
+        return self._output
+
+#___________________________________________________________________________________________________ wait
+    def wait(self, timeout =None):
+        """ Blocks until the future is resolved or the timeout, in seconds, expires. Returns True
+            if the future was resolved. """
+        return self._done.wait(timeout)
+
+#___________________________________________________________________________________________________ cancel
+    def cancel(self):
+        """ Cancels the task that resolves this future, or the future itself if it is not backed
+            by a task. Returns False if the future was already resolved. """
+        if self.isDone:
+            return False
+
+        if self._target is not None:
+            self._target.cancel()
+        else:
+            self._resolve(status=RemoteTaskStatusEnum.CANCELLED)
+        return True
+
+#___________________________________________________________________________________________________ addDoneCallback
+    def addDoneCallback(self, callback):
+        """ Registers a callback that is called with this future once it is resolved, whether it
+            succeeded, failed or was cancelled. If it has already been resolved the callback is
+            called immediately. Must be called on the thread that owns the future. """
+        if self._notified:
+            callback(self)
+        else:
+            self._callbacks.append(callback)
+        return self
+
+#___________________________________________________________________________________________________ then
+    def then(self, callback, errorCallback =None):
+        """ Registers a callback that is called with the output of this future if it succeeds
+            and returns a new future resolved with the callback's return value. If the callback
+            returns a future, the new future adopts its result instead. When this future fails or
+            is cancelled, errorCallback is called with this future, if specified, and the new
+            future adopts its result. """
+        out = self.__class__(parent=self.parent())
+
+        def onDone(future):
+            if not future.success:
+                if errorCallback is not None:
+                    errorCallback(future)
+                out._resolveFrom(future)
+                return
+
+            try:
+                value = callback(future.output)
+            except Exception as err:
+                traceback.print_exc()
+                out._resolve(error=err, status=RemoteTaskStatusEnum.FAILED)
+                return
+
+            if isinstance(value, RemoteExecutionFuture):
+                value._addResolveListener(out._resolveFrom)
+            else:
+                out._resolve(output=value, status=RemoteTaskStatusEnum.SUCCESS)
+
+        self.addDoneCallback(onDone)
+        return out
+
+#___________________________________________________________________________________________________ timeout
+    def timeout(self, seconds):
+        """ Returns a new future that adopts the result of this one, or fails with a
+            RemoteTaskTimeoutError if this future has not resolved within the specified number of
+            seconds. The underlying task is not cancelled. Must be called from a thread with a
+            running event loop. """
+        out = self.__class__(parent=self.parent())
+
+        def onTimeout():
+            out._resolve(
+                error=RemoteTaskTimeoutError('Timed out after %s seconds' % seconds),
+                status=RemoteTaskStatusEnum.FAILED)
+
+        self._addResolveListener(out._resolveFrom)
+        if not out.isDone:
+            QtCore.QTimer.singleShot(int(1000*seconds), onTimeout)
+        return out
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _resolve
+    def _resolve(self, output =None, error =None, status =None):
+        """ Stores the result of the future, releases any blocking waiters and schedules the
+            callbacks on the owning thread. This is safe to call from any thread. Returns False if
+            the future was already resolved. """
+        with self._lock:
+            if self._done.is_set():
+                return False
+
+            self._output = output
+            self._error  = error
+            self._status = status
+            self._done.set()
+            listeners = self._listeners
+            self._listeners = []
+
+        for listener in listeners:
+            try:
+                listener(self)
+            except Exception:
+                traceback.print_exc()
+
+        self._resolvedSignal.emit()
+        return True
+
+#___________________________________________________________________________________________________ _addResolveListener
+    def _addResolveListener(self, listener):
+        """ Registers a callable that is invoked with this future on whichever thread resolves
+            it. Used to compose futures without requiring an event loop. """
+        with self._lock:
+            if not self._done.is_set():
+                self._listeners.append(listener)
+                return
+        listener(self)
+
+#___________________________________________________________________________________________________ _resolveFrom
+    def _resolveFrom(self, future):
+        """ Resolves this future with the result of another resolved future. """
+        self._resolve(output=future.output, error=future.error, status=future.status)
+
+#___________________________________________________________________________________________________ _notify
+    def _notify(self):
+        """ Invokes the registered callbacks. Must be called on the thread that owns the future
+            once it has been resolved. """
+        if self._notified or not self._done.is_set():
+            return
+
+        self._notified = True
+        callbacks = self._callbacks
+        self._callbacks = []
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception:
+                traceback.print_exc()
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        return self.__str__()
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return '<%s status[%s]>' % (self.__class__.__name__, self._status)
@@ -0,0 +1,358 @@
+# RemoteExecutionPool.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import time
+import heapq
+import threading
+
+from PySide import QtCore
+
+from pyglass.threading.RemoteExecutionPoolTask import RemoteExecutionPoolTask
+from pyglass.threading.RemoteExecutionWorker import RemoteExecutionWorker
+
+#___________________________________________________________________________________________________ RemoteExecutionPool
+class RemoteExecutionPool(object):
+    """ A bounded pool of worker threads that executes queued tasks. Workers are created lazily
+        as tasks are submitted, up to the maximum concurrency, and are then reused for all
+        subsequent tasks instead of creating a new thread per task.
+
+        Queued tasks are started in order of descending priority. Tasks submitted with a
+        supersede key replace any older tasks sharing that key: pending ones are discarded from
+        the queue and running ones have their cancellation tokens cancelled. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    DEFAULT_MAX_WORKERS = max(2, QtCore.QThread.idealThreadCount())
+
+    _instance = None
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, maxWorkers =None, name =None):
+        """Creates a new instance of RemoteExecutionPool."""
+        self._name           = name if name else 'RemoteExecutionPool'
+        self._maxWorkers     = max(1, int(maxWorkers if maxWorkers else self.DEFAULT_MAX_WORKERS))
+        self._lock           = threading.Lock()
+        self._condition      = threading.Condition(self._lock)
+        self._doneCondition  = threading.Condition(self._lock)
+        self._queue          = []
+        self._queuedCount    = 0
+        self._sequence       = 0
+        self._keyedTasks     = dict()
+        self._workers        = []
+        self._workerIndex    = 0
+        self._idleCount      = 0
+        self._activeCount    = 0
+        self._submittedCount = 0
+        self._completedCount = 0
+        self._discardedCount = 0
+        self._busyTime       = 0.0
+        self._isShutdown     = False
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: name
+    @property
+    def name(self):
+        return self._name
+
+#___________________________________________________________________________________________________ GS: maxWorkers
+    @property
+    def maxWorkers(self):
+        """ The maximum number of tasks that will be executed concurrently by the pool. """
+        return self._maxWorkers
+    @maxWorkers.setter
+    def maxWorkers(self, value):
+        with self._lock:
+            self._maxWorkers = max(1, int(value))
+            # Excess workers exit the next time they look for work
+            self._condition.notify_all()
+        self._spawnWorkers()
+
+#___________________________________________________________________________________________________ GS: workerCount
+    @property
+    def workerCount(self):
+        """ The number of worker threads currently alive in the pool. """
+        return len(self._workers)
+
+#___________________________________________________________________________________________________ GS: activeCount
+    @property
+    def activeCount(self):
+        """ The number of workers currently executing a task. """
+        return self._activeCount
+
+#___________________________________________________________________________________________________ GS: queueDepth
+    @property
+    def queueDepth(self):
+        """ The number of tasks waiting for a free worker. """
+        return self._queuedCount
+
+#___________________________________________________________________________________________________ GS: utilization
+    @property
+    def utilization(self):
+        """ The fraction, between 0 and 1, of the maximum concurrency currently in use. """
+        return float(self._activeCount) / float(self._maxWorkers)
+
+#___________________________________________________________________________________________________ GS: isShutdown
+    @property
+    def isShutdown(self):
+        return self._isShutdown
+
+#___________________________________________________________________________________________________ GS: stats
+    @property
+    def stats(self):
+        """ A snapshot dictionary of the pool's load and throughput counters. """
+        with self._lock:
+            return dict(
+                maxWorkers=self._maxWorkers,
+                workers=len(self._workers),
+                active=self._activeCount,
+                queueDepth=self._queuedCount,
+                utilization=float(self._activeCount) / float(self._maxWorkers),
+                submitted=self._submittedCount,
+                completed=self._completedCount,
+                discarded=self._discardedCount,
+                busyTime=self._busyTime)
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ getInstance
+    @classmethod
+    def getInstance(cls):
+        """ Returns the shared pool used by RemoteExecutionThread instances that do not specify
+            their own pool, creating it on first access. """
+        if cls._instance is None or cls._instance.isShutdown:
+            cls._instance = cls()
+        return cls._instance
+
+#___________________________________________________________________________________________________ submit
+    def submit(
+            self, function, priority =None, supersedeKey =None, cancellationToken =None,
+            onDiscard =None
+    ):
+        """ Queues the specified callable for execution on one of the pool's workers. Returns the
+            queued RemoteExecutionPoolTask, or None if the pool has been shut down and the task
+            was not accepted.
+
+            @@@param priority:int
+                The RemoteTaskPriorityEnum value, or any integer, that orders the task within the
+                queue. Defaults to NORMAL.
+
+            @@@param supersedeKey:object
+                When specified, older tasks submitted with the same key are superseded by this
+                one. Pending tasks are discarded and running tasks are cancelled.
+
+            @@@param cancellationToken:CancellationToken
+                The token the task polls for cancellation. A new token is created if omitted.
+
+            @@@param onDiscard:function
+                Called, on the thread responsible for the discard, if the task is removed from the
+                queue without being executed.
+        """
+        superseded = []
+        with self._lock:
+            if self._isShutdown:
+                return None
+
+            task = RemoteExecutionPoolTask(
+                function=function,
+                sequence=self._sequence,
+                priority=priority,
+                supersedeKey=supersedeKey,
+                cancellationToken=cancellationToken,
+                onDiscard=onDiscard)
+            self._sequence += 1
+
+            if supersedeKey is not None:
+                superseded = self._keyedTasks.get(supersedeKey, [])
+                self._keyedTasks[supersedeKey] = [task]
+                for oldTask in superseded:
+                    if oldTask.isPending:
+                        self._removePending(oldTask)
+
+            heapq.heappush(self._queue, task)
+            self._queuedCount    += 1
+            self._submittedCount += 1
+            self._condition.notify()
+
+        self._spawnWorkers()
+
+        for oldTask in superseded:
+            if oldTask.isDiscarded:
+                oldTask.discard()
+            else:
+                oldTask.token.cancel()
+        return task
+
+#___________________________________________________________________________________________________ discard
+    def discard(self, task):
+        """ Removes the specified task from the queue if it has not yet started, notifying its
+            owner through the task's discard callback. Returns True if the task was removed. """
+        with self._lock:
+            if not task.isPending:
+                return False
+            self._removePending(task)
+            self._releaseKey(task)
+
+        task.discard()
+        return True
+
+#___________________________________________________________________________________________________ waitForDone
+    def waitForDone(self, timeout =None):
+        """ Blocks until the queue is empty and no tasks are running, or until the timeout in
+            seconds expires. Returns True if the pool became idle. """
+        deadline = None if timeout is None else (time.time() + timeout)
+        with self._lock:
+            while self._queuedCount or self._activeCount:
+                if deadline is None:
+                    self._doneCondition.wait()
+                    continue
+
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self._doneCondition.wait(remaining)
+        return True
+
+#___________________________________________________________________________________________________ shutdown
+    def shutdown(self, wait =True, timeout =None):
+        """ Stops the pool from accepting new tasks, discards any tasks that have not started and
+            lets the workers exit once their current task completes. """
+        with self._lock:
+            self._isShutdown = True
+            pending = [t for t in self._queue if t.isPending]
+            for task in pending:
+                self._removePending(task)
+            self._queue       = []
+            self._keyedTasks  = dict()
+            self._condition.notify_all()
+            self._doneCondition.notify_all()
+            workers = list(self._workers)
+
+        for task in pending:
+            task.discard()
+
+        if not wait:
+            return True
+
+        # The timeout applies to all of the workers together rather than to each one
+        end    = None if timeout is None else time.time() + timeout
+        result = True
+        for worker in workers:
+            if end is None:
+                worker.wait()
+            elif not worker.wait(int(1000*max(0.0, end - time.time()))):
+                result = False
+        return result
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _spawnWorkers
+    def _spawnWorkers(self):
+        """ Starts new workers while there is queued work that the idle workers cannot absorb and
+            the pool is below its maximum size. """
+        while True:
+            with self._lock:
+                if self._isShutdown or len(self._workers) >= self._maxWorkers:
+                    return
+                if self._queuedCount <= self._idleCount:
+                    return
+                worker = RemoteExecutionWorker(self, self._workerIndex)
+                self._workerIndex += 1
+                self._workers.append(worker)
+                # Counted as idle until it takes its first task so that concurrent submissions
+                # do not over-spawn workers.
+                self._idleCount += 1
+            worker.start()
+
+#___________________________________________________________________________________________________ _takeTask
+    def _takeTask(self, worker):
+        """ Called by a worker thread to block until a task is available. Returns None when the
+            worker should exit. """
+        with self._lock:
+            while True:
+                if self._isShutdown or len(self._workers) > self._maxWorkers:
+                    self._idleCount -= 1
+                    if worker in self._workers:
+                        self._workers.remove(worker)
+                    return None
+
+                while self._queue and not self._queue[0].isPending:
+                    # Lazily drop entries that were discarded while still in the heap
+                    heapq.heappop(self._queue)
+
+                if self._queue:
+                    task = heapq.heappop(self._queue)
+                    task.isPending     = False
+                    self._queuedCount -= 1
+                    self._idleCount   -= 1
+                    self._activeCount += 1
+                    return task
+
+                self._condition.wait()
+
+#___________________________________________________________________________________________________ _taskDone
+    def _taskDone(self, worker, task, elapsed):
+        """ Called by a worker thread after it finishes executing a task. """
+        with self._lock:
+            self._releaseKey(task)
+            self._activeCount    -= 1
+            self._idleCount      += 1
+            self._completedCount += 1
+            self._busyTime       += elapsed
+            if self._queuedCount:
+                self._condition.notify()
+            elif not self._activeCount:
+                self._doneCondition.notify_all()
+
+#___________________________________________________________________________________________________ _removePending
+    def _removePending(self, task):
+        """ Marks a pending task as discarded. The entry is left in the heap and skipped when it
+            reaches the front to avoid re-heapifying. Must be called while holding the lock. """
+        task.isPending    = False
+        task.isDiscarded  = True
+        self._queuedCount    -= 1
+        self._discardedCount += 1
+
+        # Compact the heap when discarded entries dominate it, such as after a long burst of
+        # superseded low priority tasks that never reach the front of the queue.
+        if len(self._queue) > 2*self._queuedCount + 64:
+            self._queue = [t for t in self._queue if t.isPending]
+            heapq.heapify(self._queue)
+
+        if not self._queuedCount and not self._activeCount:
+            self._doneCondition.notify_all()
+
+#___________________________________________________________________________________________________ _releaseKey
+    def _releaseKey(self, task):
+        """ Removes a finished or discarded task from the supersede key registry. Must be called
+            while holding the lock. """
+        key = task.supersedeKey
+        if key is None:
+            return
+
+        tasks = self._keyedTasks.get(key)
+        if not tasks or task not in tasks:
+            return
+        tasks.remove(task)
+        if not tasks:
+            del self._keyedTasks[key]
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        return self.__str__()
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return '<%s %s active[%s/%s] queued[%s]>' % (
+            self.__class__.__name__, self._name, self._activeCount, self._maxWorkers,
+            self._queuedCount)
@@ -0,0 +1,69 @@
+# RemoteExecutionPoolTask.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+from pyglass.threading.CancellationToken import CancellationToken
+from pyglass.threading.RemoteTaskPriorityEnum import RemoteTaskPriorityEnum
+
+#___________________________________________________________________________________________________ RemoteExecutionPoolTask
+class RemoteExecutionPoolTask(object):
+    """ A unit of work queued on a RemoteExecutionPool. Tasks order themselves by descending
+        priority and then by submission order so that they can be stored in a heap. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(
+            self, function, sequence, priority =None, supersedeKey =None,
+            cancellationToken =None, onDiscard =None
+    ):
+        """Creates a new instance of RemoteExecutionPoolTask."""
+        self.function     = function
+        self.sequence     = sequence
+        self.priority     = RemoteTaskPriorityEnum.NORMAL if priority is None else priority
+        self.supersedeKey = supersedeKey
+        self.token        = cancellationToken if cancellationToken else CancellationToken()
+        self.onDiscard    = onDiscard
+        self.isPending    = True
+        self.isDiscarded  = False
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ run
+    def run(self):
+        """ Executes the task function with the task's cancellation token registered as the
+            current token for the executing thread. """
+        previous = CancellationToken._setCurrent(self.token)
+        try:
+            return self.function()
+        finally:
+            CancellationToken._setCurrent(previous)
+
+#___________________________________________________________________________________________________ discard
+    def discard(self):
+        """ Notifies the owner of the task that it was removed from the queue without running. """
+        self.token.cancel()
+        if self.onDiscard is not None:
+            self.onDiscard()
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __lt__
+    def __lt__(self, other):
+        if self.priority != other.priority:
+            return self.priority > other.priority
+        return self.sequence < other.sequence
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        return self.__str__()
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return '<%s priority[%s] key[%s]>' % (
+            self.__class__.__name__, self.priority, self.supersedeKey)
@@ -4,12 +4,23 @@
 
 from __future__ import print_function, absolute_import, unicode_literals, division
 
+import time
 import warnings
 
 from PySide import QtCore
 
 from pyaid.ArgsUtils import ArgsUtils
 from pyaid.debug.Logger import Logger
+from pyglass.threading.CancellationToken import CancellationToken
+from pyglass.threading.RemoteEventBus import RemoteEventBus
+from pyglass.threading.RemoteExecutionFuture import RemoteExecutionFuture
+from pyglass.threading.RemoteExecutionPool import RemoteExecutionPool
+from pyglass.threading.RemoteLogBuffer import RemoteLogBuffer
+from pyglass.threading.RemoteProgressChannel import RemoteProgressChannel
+from pyglass.threading.RemoteTaskCancelledError import RemoteTaskCancelledError
+from pyglass.threading.RemoteTaskPriorityEnum import RemoteTaskPriorityEnum
+from pyglass.threading.RemoteTaskRegistry import RemoteTaskRegistry
+from pyglass.threading.RemoteTaskStatusEnum import RemoteTaskStatusEnum
 from pyglass.threading.RemoteThreadEvent import RemoteThreadEvent
 
 #___________________________________________________________________________________________________ RemoteExecutionThread
@@ -19,7 +30,17 @@ class RemoteExecutionThread(QtCore.QThread):
 #===================================================================================================
 #                                                                                       C L A S S
 
-    _ACTIVE_THREAD_STORAGE = []
+    # When True, execute() runs the thread on a shared RemoteExecutionPool worker instead of
+    # starting a dedicated QThread for each task.
+    USE_EXECUTION_POOL = True
+
+    # When True, events dispatched from worker threads are batched through the shared
+    # RemoteEventBus and delivered in a single drain on the GUI thread instead of being posted
+    # to the event loop individually.
+    USE_EVENT_BUS = False
+
+    # The return code reported by threads that were cancelled before they completed
+    CANCELLED_CODE = -1
 
     completeSignal = QtCore.Signal(object)
     eventSignal    = QtCore.Signal(object)
@@ -34,20 +55,35 @@ class RemoteExecutionThread(QtCore.QThread):
 
         self._events           = dict()
         self._log              = Logger(self)
-        self._log.trace        = True
+        self._log.trace        = False
         self._log.addPrintCallback(self._handleLogWritten)
         self._logger           = self._log
 
-        self._maxLogBufferSize = 0
-        self._logBuffer        = []
+        self._logBuffer        = RemoteLogBuffer(self._deliverLogLines)
         self._returnCode         = None
         self._output           = None
         self._error            = None
         self._explicitComplete = ArgsUtils.get('explicitComplete', False, kwargs)
-
-        # Add the thread to the static active thread storage so that it won't be garbage collected
-        # until the thread completes.
-        self.__class__._ACTIVE_THREAD_STORAGE.append(self)
+        self._pool             = ArgsUtils.get('pool', None, kwargs)
+        self._poolTask         = None
+        self._priority         = ArgsUtils.get('priority', RemoteTaskPriorityEnum.NORMAL, kwargs)
+        self._supersedeKey     = ArgsUtils.get('supersedeKey', None, kwargs)
+        self._status           = None
+        self._token            = ArgsUtils.get('cancellationToken', None, kwargs)
+        if self._token is None:
+            self._token = CancellationToken()
+
+        self._progress = RemoteProgressChannel(
+            deliver=self._deliverProgress,
+            maxRate=ArgsUtils.get('maxProgressRate', None, kwargs))
+
+        self._future = RemoteExecutionFuture(target=self)
+
+        # Registering the thread keeps it from being garbage collected until it completes. The
+        # dispatch handler is connected before any callbacks so that it measures the delivery of
+        # the complete event rather than the time taken by the callbacks.
+        self._record = RemoteTaskRegistry.getInstance().register(self)
+        self.completeSignal.connect(self._handleCompleteDispatched)
 
         self._connectSignals(**kwargs)
 
@@ -78,6 +114,90 @@ class RemoteExecutionThread(QtCore.QThread):
         self._log.write('[DEPRECATION WARNING]: Use returnCode instead of response', traceStack=True)
         return self._returnCode
 
+#___________________________________________________________________________________________________ GS: pool
+    @property
+    def pool(self):
+        """ The RemoteExecutionPool on which this thread executes, or None if the thread executes
+            within its own QThread. """
+        if not self.USE_EXECUTION_POOL:
+            return None
+        return self._pool if self._pool else RemoteExecutionPool.getInstance()
+    @pool.setter
+    def pool(self, value):
+        self._pool = value
+
+#___________________________________________________________________________________________________ GS: taskRecord
+    @property
+    def taskRecord(self):
+        """ The RemoteTaskRecord of the thread's timing and outcome. """
+        return self._record
+
+#___________________________________________________________________________________________________ GS: future
+    @property
+    def future(self):
+        """ The RemoteExecutionFuture resolved when this thread completes. """
+        return self._future
+
+#___________________________________________________________________________________________________ GS: cancellationToken
+    @property
+    def cancellationToken(self):
+        """ The CancellationToken polled by the thread's running task to detect cancellation. """
+        return self._token
+
+#___________________________________________________________________________________________________ GS: isCancelled
+    @property
+    def isCancelled(self):
+        return self._token.isCancelled
+
+#___________________________________________________________________________________________________ GS: priority
+    @property
+    def priority(self):
+        """ The RemoteTaskPriorityEnum value used to order this thread in its execution pool. """
+        return self._priority
+    @priority.setter
+    def priority(self, value):
+        self._priority = value
+
+#___________________________________________________________________________________________________ GS: supersedeKey
+    @property
+    def supersedeKey(self):
+        """ When set, executing this thread supersedes any older thread executed with the same
+            key. Superseded threads complete with a cancelled status. """
+        return self._supersedeKey
+    @supersedeKey.setter
+    def supersedeKey(self, value):
+        self._supersedeKey = value
+
+#___________________________________________________________________________________________________ GS: status
+    @property
+    def status(self):
+        """ The RemoteTaskStatusEnum value of the thread once complete, or None if the thread has
+            not yet completed. """
+        return self._status
+
+#___________________________________________________________________________________________________ GS: maxProgressRate
+    @property
+    def maxProgressRate(self):
+        """ The maximum number of progress updates per second delivered by dispatchProgress().
+            A value of zero or less delivers every update. """
+        return self._progress.maxRate
+    @maxProgressRate.setter
+    def maxProgressRate(self, value):
+        self._progress.maxRate = value
+
+#___________________________________________________________________________________________________ GS: progressStats
+    @property
+    def progressStats(self):
+        """ A dictionary with the number of progress updates delivered and dropped by the rate
+            limited progress channel. """
+        return self._progress.stats
+
+#___________________________________________________________________________________________________ GS: logBuffer
+    @property
+    def logBuffer(self):
+        """ The RemoteLogBuffer that batches log lines when log buffering is enabled. """
+        return self._logBuffer
+
 #___________________________________________________________________________________________________ GS: returnCode
     @property
     def returnCode(self):
@@ -98,16 +218,26 @@ class RemoteExecutionThread(QtCore.QThread):
 
 #___________________________________________________________________________________________________ dispatchEvent
     def dispatchEvent(self, signal, identifier =None, data =None):
-        signal.emit(RemoteThreadEvent(
-            identifier=identifier,
-            target=self,
-            data=data))
+        event = RemoteThreadEvent(identifier=identifier, target=self, data=data)
+        if self.USE_EVENT_BUS and QtCore.QThread.currentThread() != self.thread():
+            RemoteEventBus.getInstance().post(signal, event)
+        else:
+            signal.emit(event)
+
+#___________________________________________________________________________________________________ dispatchProgress
+    def dispatchProgress(self, data =None, identifier ='progress'):
+        """ Reports progress through the progressSignal, coalescing updates so that at most
+            maxProgressRate updates per second are delivered. Only the most recent update is kept
+            while rate limited and it is always delivered before the thread completes. """
+        return self._progress.report(identifier, data)
 
 #___________________________________________________________________________________________________ execute
     def execute(
             self, callback =None, logCallback =None, progressCallback =None,
             eventCallback =None, **kwargs
     ):
+        """ Connects the specified callbacks and schedules the thread for execution. Returns the
+            RemoteExecutionFuture that resolves when the thread completes. """
         self._connectSignals(
             callback=callback,
             logCallback=logCallback,
@@ -115,16 +245,58 @@ class RemoteExecutionThread(QtCore.QThread):
             eventCallback=eventCallback,
             **kwargs)
 
-        self.start()
+        # The stack capture of log events is only worth the cost when someone is listening
+        self._log.trace = self._hasLogListeners()
+
+        pool = ArgsUtils.get('pool', None, kwargs)
+        if pool:
+            self._pool = pool
+        self._priority     = ArgsUtils.get('priority', self._priority, kwargs)
+        self._supersedeKey = ArgsUtils.get('supersedeKey', self._supersedeKey, kwargs)
+
+        RemoteTaskRegistry.getInstance().markSubmitted(self)
+        self._executeImpl()
+        return self._future
+
+#___________________________________________________________________________________________________ cancel
+    def cancel(self):
+        """ Cancels the thread. If it has not yet started it is removed from its execution pool
+            and completes immediately with a cancelled status. If it is running, its cancellation
+            token is cancelled so that the running task can stop cooperatively. """
+        self._token.cancel()
+        if self._poolTask and self._poolTask.isPending:
+            self.pool.discard(self._poolTask)
 
 #___________________________________________________________________________________________________ run
     def run(self):
         """ Thread run method."""
-        response = self._runImpl()
+        if self._token.isCancelled:
+            self._runCancelled()
+            return
+
+        RemoteTaskRegistry.getInstance().markStarted(self)
+        previousToken = CancellationToken._setCurrent(self._token)
+        try:
+            response = self._runImpl()
+        except RemoteTaskCancelledError:
+            self._runCancelled()
+            return
+        except Exception as err:
+            # Complete with a failure so that callbacks and futures are never left waiting
+            self._error = err
+            self._log.writeError('FAILED: Unhandled exception during remote execution', err)
+            self._runComplete(1)
+            return
+        finally:
+            CancellationToken._setCurrent(previousToken)
+
         if self._explicitComplete:
             return
 
-        self._runComplete(response)
+        if self._token.isCancelled:
+            self._runCancelled()
+        else:
+            self._runComplete(response)
 
 #___________________________________________________________________________________________________ connectSignals
     def connectSignals(self, onComplete =None, onLog =None, onProgress =None, onEvent =None):
@@ -137,8 +309,20 @@ class RemoteExecutionThread(QtCore.QThread):
             eventCallback=onEvent)
 
 #___________________________________________________________________________________________________ enableLogBuffer
-    def enableLogBuffer(self, maxLength = 0):
-        self._maxLogBufferSize = maxLength
+    def enableLogBuffer(self, maxLength = 0, flushInterval =None, maxLines =None, maxChars =None):
+        """ Batches log output into combined log events. A batch is flushed once it holds more
+            than maxLength lines, if maxLength is greater than zero, or once flushInterval seconds
+            have passed since its oldest line. When the batch exceeds maxLines lines or maxChars
+            characters the oldest lines are dropped and counted in the logBuffer. """
+        b = self._logBuffer
+        b.flushCount = maxLength + 1 if maxLength > 0 else 0
+        if flushInterval is not None:
+            b.flushInterval = flushInterval
+        if maxLines is not None:
+            b.maxLines = maxLines
+        if maxChars is not None:
+            b.maxChars = maxChars
+        b.enabled = True
 
 #___________________________________________________________________________________________________ disableLogBuffer
     def disableLogBuffer(self):
@@ -147,12 +331,8 @@ class RemoteExecutionThread(QtCore.QThread):
 #___________________________________________________________________________________________________ flushLogBuffer
     def flushLogBuffer(self, disable =False):
         if disable:
-            self._maxLogBufferSize = 0
-
-        if self._logBuffer:
-            b = self._logBuffer
-            self._logBuffer = []
-            self.dispatchEvent(self.logSignal, 'log', {'message':'\n'.join(b)})
+            self._logBuffer.enabled = False
+        self._logBuffer.flush()
 
 #===================================================================================================
 #                                                                               P R O T E C T E D
@@ -175,34 +355,101 @@ class RemoteExecutionThread(QtCore.QThread):
         if eventCallback:
             self.eventSignal.connect(eventCallback)
 
+#___________________________________________________________________________________________________ _executeImpl
+    def _executeImpl(self):
+        """ Schedules the run method for execution. By default the thread is queued on its
+            execution pool, falling back to starting a dedicated QThread when pooling is disabled
+            or the pool has been shut down. """
+        pool = self.pool
+        if pool:
+            self._poolTask = pool.submit(
+                function=self.run,
+                priority=self._priority,
+                supersedeKey=self._supersedeKey,
+                cancellationToken=self._token,
+                onDiscard=self._runCancelled)
+            if self._poolTask:
+                return
+        self.start()
+
 #___________________________________________________________________________________________________ _runComplete
-    def _runComplete(self, response):
+    def _runComplete(self, response, status =None):
+        if self._status is not None:
+            # Already completed, such as a thread that was discarded from the pool queue
+            return
+
+        endTime = time.time()
+
         self._returnCode = response
         if self._returnCode is None:
             self._returnCode = 0
 
+        self._progress.flush()
+        self._logBuffer.flush()
+
+        if status is None:
+            status = RemoteTaskStatusEnum.SUCCESS if self._returnCode == 0 \
+                else RemoteTaskStatusEnum.FAILED
+        self._status = status
+
+        # Releases blocking waiters immediately, while future callbacks are queued to the GUI thread
+        self._future._resolve(output=self._output, error=self._error, status=self._status)
+
+        # Removes the thread from the active threads so that it can be garbage collected once the
+        # complete event has been handled.
+        RemoteTaskRegistry.getInstance().markEnded(
+            self, status=self._status, returnCode=self._returnCode, endTime=endTime)
+
         self.dispatchEvent(self.completeSignal, 'complete', {
             'response':self._returnCode,
+            'status':self._status,
             'error':self._error,
             'output':self._output,
             'thread':self,
             'userData':self.userData })
 
-        # Remove the thread from the active thread storage so that it can be garbage collected.
-        self.__class__._ACTIVE_THREAD_STORAGE.remove(self)
+#___________________________________________________________________________________________________ _hasLogListeners
+    def _hasLogListeners(self):
+        """ Specifies whether or not any slots are connected to the logSignal. """
+        try:
+            return self.receivers(QtCore.SIGNAL('logSignal(PyObject)')) > 0
+        except Exception:
+            return True
+
+#___________________________________________________________________________________________________ _runCancelled
+    def _runCancelled(self):
+        self._runComplete(self.CANCELLED_CODE, RemoteTaskStatusEnum.CANCELLED)
 
 #___________________________________________________________________________________________________ _runImpl
     def _runImpl(self):
         return 0
 
+#___________________________________________________________________________________________________ _deliverLogLines
+    def _deliverLogLines(self, lines, dropped):
+        # Listeners are checked when the lines are delivered, so that listeners connected after
+        # the thread was executed still receive its log output
+        if not self._hasLogListeners():
+            return
+
+        data = {'message':'\n'.join(lines), 'lines':lines}
+        if dropped:
+            data['dropped'] = dropped
+        self.dispatchEvent(self.logSignal, 'log', data)
+
+#___________________________________________________________________________________________________ _deliverProgress
+    def _deliverProgress(self, identifier, data):
+        self.dispatchEvent(self.progressSignal, identifier, data)
+
 #===================================================================================================
 #                                                                                 H A N D L E R S
 
+#___________________________________________________________________________________________________ _handleCompleteDispatched
+    def _handleCompleteDispatched(self, event):
+        RemoteTaskRegistry.getInstance().markDispatched(self._record)
+
 #___________________________________________________________________________________________________ _handleLogWritten
     def _handleLogWritten(self, logger, value):
-        if self._maxLogBufferSize > 0:
-            self._logBuffer.append(value)
-            if len(self._logBuffer) > self._maxLogBufferSize:
-                self.flushLogBuffer()
-        else:
+        if self._logBuffer.enabled:
+            self._logBuffer.write(value)
+        elif self._hasLogListeners():
             self.dispatchEvent(self.logSignal, 'log', {'message':value})
@@ -0,0 +1,89 @@
+# RemoteExecutionWorker.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import time
+import traceback
+
+from PySide import QtCore
+
+#___________________________________________________________________________________________________ RemoteExecutionWorker
+class RemoteExecutionWorker(QtCore.QThread):
+    """ A long-lived thread owned by a RemoteExecutionPool that repeatedly pulls tasks from the
+        pool's queue and runs them until the pool is shut down. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, pool, index):
+        """Creates a new instance of RemoteExecutionWorker."""
+        QtCore.QThread.__init__(self)
+        self._pool      = pool
+        self._index     = index
+        self._busy      = False
+        self._taskCount = 0
+        self._busyTime  = 0.0
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: name
+    @property
+    def name(self):
+        return '%s-%s' % (self._pool.name, self._index)
+
+#___________________________________________________________________________________________________ GS: isBusy
+    @property
+    def isBusy(self):
+        return self._busy
+
+#___________________________________________________________________________________________________ GS: taskCount
+    @property
+    def taskCount(self):
+        """ The number of tasks this worker has executed. """
+        return self._taskCount
+
+#___________________________________________________________________________________________________ GS: busyTime
+    @property
+    def busyTime(self):
+        """ The total number of seconds this worker has spent executing tasks. """
+        return self._busyTime
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ run
+    def run(self):
+        """ Thread run method."""
+        while True:
+            task = self._pool._takeTask(self)
+            if task is None:
+                return
+
+            self._busy = True
+            start = time.time()
+            try:
+                task.run()
+            except Exception:
+                print('ERROR: Unhandled exception in %s' % self.name)
+                traceback.print_exc()
+            finally:
+                elapsed = time.time() - start
+                self._busy = False
+                self._taskCount += 1
+                self._busyTime += elapsed
+                self._pool._taskDone(self, task, elapsed)
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        return self.__str__()
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return '<%s %s>' % (self.__class__.__name__, self.name)
@@ -0,0 +1,359 @@
+# RemoteJobScheduler.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import time
+import random
+import traceback
+
+from PySide import QtCore
+
+from pyaid.debug.Logger import Logger
+
+from pyglass.threading.FunctionRemoteExecutionThread import FunctionRemoteExecutionThread
+from pyglass.threading.RemoteScheduledJob import RemoteScheduledJob
+from pyglass.threading.RemoteTaskPriorityEnum import RemoteTaskPriorityEnum
+
+#___________________________________________________________________________________________________ RemoteJobScheduler
+class RemoteJobScheduler(QtCore.QObject):
+    """ Schedules recurring and idle-time jobs to run in the background on the shared execution
+        pool. A single timer on the GUI thread is set for the next due job, so that no timer or
+        thread is held per job. Unless a job allows overlap, a run is skipped while a previous run
+        of the same job is still executing.
+
+        Once a window is watched with watchWindow(), which the PyGlassApplication does for its
+        main window, jobs are paused while that window is hidden or minimised and resume when it
+        is shown again. Idle time is measured from the last user input received by the
+        application. The input is only monitored while idle jobs are registered. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    # The minimum number of milliseconds between the checks for idle jobs that are due again
+    MIN_IDLE_CHECK_INTERVAL = 250
+
+    _instance = None
+
+    _ACTIVITY_EVENTS = (
+        QtCore.QEvent.MouseButtonPress,
+        QtCore.QEvent.MouseMove,
+        QtCore.QEvent.KeyPress,
+        QtCore.QEvent.Wheel)
+
+    _WINDOW_EVENTS = (
+        QtCore.QEvent.Show,
+        QtCore.QEvent.Hide,
+        QtCore.QEvent.WindowStateChange)
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, parent =None):
+        """Creates a new instance of RemoteJobScheduler."""
+        QtCore.QObject.__init__(self, parent)
+        self._jobs             = []
+        self._isPaused         = False
+        self._isHidden         = False
+        self._window           = None
+        self._lastActivityTime = time.time()
+        self._isMonitoringIdle = False
+        self._isIdleDeferred   = False
+        self._log              = Logger(self)
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._handleTimer)
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: jobs
+    @property
+    def jobs(self):
+        return list(self._jobs)
+
+#___________________________________________________________________________________________________ GS: isPaused
+    @property
+    def isPaused(self):
+        """ Specifies whether or not all jobs are paused by pause(). """
+        return self._isPaused
+
+#___________________________________________________________________________________________________ GS: isHidden
+    @property
+    def isHidden(self):
+        """ Specifies whether or not the watched window is hidden or minimised, in which case
+            jobs that do not run when hidden are paused. """
+        return self._isHidden
+
+#___________________________________________________________________________________________________ GS: idleDuration
+    @property
+    def idleDuration(self):
+        """ The number of milliseconds since the last user input. """
+        return int(1000*(time.time() - self._lastActivityTime))
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ getInstance
+    @classmethod
+    def getInstance(cls):
+        """ Returns the shared scheduler, creating it on first access. Must first be accessed
+            from the GUI thread. """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+#___________________________________________________________________________________________________ addRecurringJob
+    def addRecurringJob(self, function, interval, jitter =0.0, runImmediately =False, **kwargs):
+        """ Schedules the function to run every interval seconds and returns its
+            RemoteScheduledJob.
+
+            @@@param jitter:number
+                The fraction of the interval, between 0 and 1, by which each run is randomly
+                shifted earlier or later so that jobs started together do not stay in lockstep.
+
+            @@@param runImmediately:boolean
+                Whether the first run happens immediately rather than after one interval.
+
+            @@@param kwargs:dict
+                The args, kwargs, name, priority, allowOverlap, runWhenHidden and callback
+                attributes of the RemoteScheduledJob. The callback is invoked on the GUI thread
+                with the complete event of each run.
+        """
+        job = RemoteScheduledJob(function, interval=interval, jitter=jitter, **kwargs)
+        job.nextRunTime = time.time() if runImmediately else self._getNextRunTime(job)
+        return self._addJob(job)
+
+#___________________________________________________________________________________________________ addIdleJob
+    def addIdleJob(self, function, idleTime, interval =None, **kwargs):
+        """ Schedules the function to run once the application has been idle for idleTime
+            milliseconds and returns its RemoteScheduledJob. Without an interval, the job runs once
+            per idle period. With one, it repeats every interval seconds while still idle. Accepts
+            the same keyword arguments as addRecurringJob(). """
+        job = RemoteScheduledJob(function, idleTime=idleTime, interval=interval, **kwargs)
+        return self._addJob(job)
+
+#___________________________________________________________________________________________________ removeJob
+    def removeJob(self, job):
+        """ Removes the job from the scheduler. A run that is already executing is not
+            cancelled. """
+        if job not in self._jobs:
+            return False
+
+        job.isEnabled = False
+        self._jobs.remove(job)
+        self._updateIdleMonitoring()
+        self._schedule()
+        return True
+
+#___________________________________________________________________________________________________ runNow
+    def runNow(self, job):
+        """ Runs the job immediately, subject to its overlap restriction. Returns True if a run
+            was started. """
+        return self._runJob(job, time.time())
+
+#___________________________________________________________________________________________________ pause
+    def pause(self):
+        self._isPaused = True
+        self._schedule()
+
+#___________________________________________________________________________________________________ resume
+    def resume(self):
+        self._isPaused = False
+        self._schedule()
+
+#___________________________________________________________________________________________________ watchWindow
+    def watchWindow(self, window):
+        """ Pauses the jobs that do not run when hidden while the window is hidden or
+            minimised. """
+        if self._window is not None:
+            self._window.removeEventFilter(self)
+        self._window = window
+        if window is not None:
+            window.installEventFilter(self)
+        self._updateVisibility()
+
+#___________________________________________________________________________________________________ eventFilter
+    def eventFilter(self, target, event):
+        eventType = event.type()
+        if eventType in self._ACTIVITY_EVENTS:
+            self._lastActivityTime = time.time()
+        elif target is self._window and eventType in self._WINDOW_EVENTS:
+            self._updateVisibility()
+        return False
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _addJob
+    def _addJob(self, job):
+        self._jobs.append(job)
+        self._updateIdleMonitoring()
+        self._schedule()
+        return job
+
+#___________________________________________________________________________________________________ _isJobActive
+    def _isJobActive(self, job):
+        """ Specifies whether or not the job is currently allowed to run. """
+        if not job.isEnabled or self._isPaused:
+            return False
+        return job.runWhenHidden or not self._isHidden
+
+#___________________________________________________________________________________________________ _getNextRunTime
+    def _getNextRunTime(self, job, now =None):
+        now = time.time() if now is None else now
+        if not job.jitter:
+            return now + job.interval
+        return now + job.interval*(1.0 + random.uniform(-job.jitter, job.jitter))
+
+#___________________________________________________________________________________________________ _getDueTime
+    def _getDueTime(self, job):
+        """ Returns the time at which the job will next be due, or None if it is waiting for an
+            event such as the user becoming idle again. """
+        if not job.isIdleJob:
+            return job.nextRunTime
+
+        idleStart = self._lastActivityTime + job.idleTime/1000.0
+        if job.lastRunTime is None or job.lastRunTime < idleStart:
+            # Has not yet run in the current idle period
+            return idleStart
+
+        if job.interval is None:
+            return None
+        return max(idleStart, job.nextRunTime)
+
+#___________________________________________________________________________________________________ _schedule
+    def _schedule(self):
+        """ Sets the timer for the earliest due job. """
+        if self._isIdleDeferred:
+            self._updateIdleMonitoring()
+
+        dueTimes = [self._getDueTime(j) for j in self._jobs if self._isJobActive(j)]
+        dueTimes = [t for t in dueTimes if t is not None]
+
+        if self._isMonitoringIdle and not self._isPaused:
+            # Idle jobs that have already run are due again once further activity is followed by
+            # another idle period, so the timer checks back periodically
+            minIdle = max(
+                self.MIN_IDLE_CHECK_INTERVAL,
+                min([j.idleTime for j in self._jobs if j.isIdleJob]))/1000.0
+            dueTimes.append(time.time() + minIdle)
+
+        if not dueTimes:
+            self._timer.stop()
+            return
+
+        delay = max(0, int(1000*(min(dueTimes) - time.time())))
+        self._timer.start(delay)
+
+#___________________________________________________________________________________________________ _runJob
+    def _runJob(self, job, now):
+        if job.isRunning and not job.allowOverlap:
+            job.skippedCount += 1
+            return False
+
+        job.lastRunTime  = now
+        job.runningCount += 1
+        if job.interval is not None:
+            job.nextRunTime = self._getNextRunTime(job, now)
+
+        thread = FunctionRemoteExecutionThread(None, job.function, *job.args, **job.kwargs)
+        thread.userData = job
+        thread.execute(
+            callback=self._handleJobComplete,
+            priority=RemoteTaskPriorityEnum.LOW if job.priority is None else job.priority)
+        return True
+
+#___________________________________________________________________________________________________ _updateIdleMonitoring
+    def _updateIdleMonitoring(self):
+        """ Monitors user input through an application event filter only while idle jobs are
+            registered, as the filter is invoked for every event the application receives. """
+        monitor = len([j for j in self._jobs if j.isIdleJob]) > 0
+        if monitor == self._isMonitoringIdle:
+            return
+
+        app = QtCore.QCoreApplication.instance()
+        if app is None:
+            # Retried whenever the jobs are rescheduled until the application has been created
+            if monitor and not self._isIdleDeferred:
+                self._log.write(
+                    'WARNING: Idle jobs will not run until the application has been created')
+            self._isIdleDeferred = monitor
+            return
+
+        self._isIdleDeferred = False
+        if monitor:
+            self._lastActivityTime = time.time()
+            app.installEventFilter(self)
+        else:
+            app.removeEventFilter(self)
+        self._isMonitoringIdle = monitor
+
+#___________________________________________________________________________________________________ _updateVisibility
+    def _updateVisibility(self):
+        window = self._window
+        hidden = window is not None and (window.isHidden() or window.isMinimized())
+        if hidden == self._isHidden:
+            return
+
+        self._isHidden = hidden
+        if not hidden:
+            # Recurring jobs missed while hidden run once on resume rather than catching up
+            now = time.time()
+            for job in self._jobs:
+                if not job.isIdleJob and job.nextRunTime < now:
+                    job.nextRunTime = now
+        self._schedule()
+
+#===================================================================================================
+#                                                                                 H A N D L E R S
+
+#___________________________________________________________________________________________________ _handleTimer
+    def _handleTimer(self):
+        now = time.time()
+        for job in list(self._jobs):
+            if not self._isJobActive(job):
+                continue
+
+            due = self._getDueTime(job)
+            if due is None or due > now:
+                continue
+
+            if self._runJob(job, now):
+                continue
+
+            # Skipped because the previous run is still executing, which counts as this period's
+            # run so that the job is not immediately due again
+            if job.isIdleJob:
+                job.lastRunTime = now
+            if job.interval is not None:
+                job.nextRunTime = self._getNextRunTime(job, now)
+
+        self._schedule()
+
+#___________________________________________________________________________________________________ _handleJobComplete
+    def _handleJobComplete(self, event):
+        job = event.target.userData
+        job.runningCount -= 1
+        job.runCount     += 1
+        job.lastEndTime   = time.time()
+        if not event.target.success:
+            job.failureCount += 1
+
+        if job.callback is not None:
+            try:
+                job.callback(event)
+            except Exception:
+                traceback.print_exc()
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        return self.__str__()
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return '<%s jobs[%s] paused[%s] hidden[%s]>' % (
+            self.__class__.__name__, len(self._jobs), self._isPaused, self._isHidden)
@@ -0,0 +1,175 @@
+# RemoteLogBuffer.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import time
+import threading
+from collections import deque
+
+from pyglass.threading.RemoteTimerQueue import RemoteTimerQueue
+
+#___________________________________________________________________________________________________ RemoteLogBuffer
+class RemoteLogBuffer(object):
+    """ Batches log lines written on a worker thread so that they are delivered to the GUI thread
+        in groups instead of one event per line. A batch is delivered when it holds flushCount
+        lines or when flushInterval seconds have passed since its oldest line was written. The
+        buffer is a ring bounded by maxLines and maxChars. When either limit is exceeded the
+        oldest lines are dropped and counted instead of growing without bound. Lines are only
+        joined into a message when a batch is delivered.
+
+        A flush is scheduled on the shared RemoteTimerQueue when the first line of a batch is
+        written so that the batch is still delivered on time when no further lines are
+        written. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    DEFAULT_FLUSH_INTERVAL = 0.25
+
+    DEFAULT_MAX_LINES      = 1000
+
+    DEFAULT_MAX_CHARS      = 1048576
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, deliver):
+        """ Creates a new instance of RemoteLogBuffer.
+
+            @@@param deliver:function
+                Called with the list of buffered lines and the number of lines dropped since the
+                previous delivery whenever the buffer is flushed.
+        """
+        self._deliver       = deliver
+        self._lock          = threading.Lock()
+        self._lines         = deque()
+        self._charCount     = 0
+        self._firstLineTime = None
+        self._droppedCount  = 0
+        self._totalDropped  = 0
+        self._enabled       = False
+        self._timer         = None
+
+        self.flushCount    = 0
+        self.flushInterval = self.DEFAULT_FLUSH_INTERVAL
+        self.maxLines      = self.DEFAULT_MAX_LINES
+        self.maxChars      = self.DEFAULT_MAX_CHARS
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: enabled
+    @property
+    def enabled(self):
+        return self._enabled
+    @enabled.setter
+    def enabled(self, value):
+        self._enabled = bool(value)
+
+#___________________________________________________________________________________________________ GS: droppedCount
+    @property
+    def droppedCount(self):
+        """ The total number of lines dropped because the buffer exceeded its memory limits. """
+        return self._totalDropped
+
+#___________________________________________________________________________________________________ GS: size
+    @property
+    def size(self):
+        """ The number of lines currently held in the buffer. """
+        return len(self._lines)
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ write
+    def write(self, value):
+        """ Adds a line to the buffer and flushes the buffer if the line count or time window
+            threshold has been reached. """
+        with self._lock:
+            now = time.time()
+            if self._firstLineTime is None:
+                self._firstLineTime = now
+                self._startTimer()
+
+            self._lines.append(value)
+            self._charCount += len(value)
+
+            while len(self._lines) > 1 and (
+                len(self._lines) > self.maxLines or self._charCount > self.maxChars
+            ):
+                self._charCount -= len(self._lines.popleft())
+                self._droppedCount += 1
+                self._totalDropped += 1
+
+            if self.flushCount > 0 and len(self._lines) >= self.flushCount:
+                ready = True
+            else:
+                ready = now - self._firstLineTime >= self.flushInterval
+
+            if not ready:
+                return False
+
+            lines, dropped = self._drain()
+
+        self._deliver(lines, dropped)
+        return True
+
+#___________________________________________________________________________________________________ flush
+    def flush(self):
+        """ Delivers any buffered lines immediately. """
+        with self._lock:
+            if not self._lines:
+                return False
+            lines, dropped = self._drain()
+
+        self._deliver(lines, dropped)
+        return True
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _drain
+    def _drain(self):
+        """ Empties the buffer and returns its lines and dropped count. Must be called while
+            holding the lock. """
+        lines   = list(self._lines)
+        dropped = self._droppedCount
+
+        self._lines.clear()
+        self._charCount     = 0
+        self._droppedCount  = 0
+        self._firstLineTime = None
+
+        if self._timer is not None:
+            RemoteTimerQueue.getInstance().cancel(self._timer)
+            self._timer = None
+        return lines, dropped
+
+#___________________________________________________________________________________________________ _startTimer
+    def _startTimer(self):
+        """ Schedules the flush of the batch once its flush interval has passed. Must be called
+            while holding the lock. """
+        if self.flushInterval <= 0:
+            return
+
+        self._timer = RemoteTimerQueue.getInstance().schedule(
+            self.flushInterval, self._handleTimer)
+
+#===================================================================================================
+#                                                                                 H A N D L E R S
+
+#___________________________________________________________________________________________________ _handleTimer
+    def _handleTimer(self):
+        self.flush()
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        return self.__str__()
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return '<%s lines[%s] dropped[%s]>' % (
+            self.__class__.__name__, len(self._lines), self._totalDropped)
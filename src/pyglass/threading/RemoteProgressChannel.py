@@ -0,0 +1,139 @@
+# RemoteProgressChannel.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import time
+import threading
+
+from pyglass.threading.RemoteTimerQueue import RemoteTimerQueue
+
+#___________________________________________________________________________________________________ RemoteProgressChannel
+class RemoteProgressChannel(object):
+    """ Coalesces progress updates reported from a worker thread so that no more than maxRate
+        updates per second are delivered to the GUI thread. Updates arriving faster than that are
+        held and replaced by newer ones, so that only the latest value is delivered. A held
+        update is delivered by the shared RemoteTimerQueue once the rate limit allows, even if no
+        further updates are reported, and flush() guarantees that the final held value is
+        delivered when the task completes. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    DEFAULT_MAX_RATE = 20
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, deliver, maxRate =None):
+        """ Creates a new instance of RemoteProgressChannel.
+
+            @@@param deliver:function
+                Called with the identifier and data arguments of each delivered update.
+
+            @@@param maxRate:number
+                The maximum number of updates delivered per second. A value of zero or less
+                disables rate limiting.
+        """
+        self._deliver        = deliver
+        self._maxRate        = self.DEFAULT_MAX_RATE if maxRate is None else maxRate
+        self._lock           = threading.Lock()
+        self._pending        = None
+        self._lastDelivery   = 0.0
+        self._deliveredCount = 0
+        self._droppedCount   = 0
+        self._timer          = None
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: maxRate
+    @property
+    def maxRate(self):
+        return self._maxRate
+    @maxRate.setter
+    def maxRate(self, value):
+        self._maxRate = value
+
+#___________________________________________________________________________________________________ GS: deliveredCount
+    @property
+    def deliveredCount(self):
+        """ The number of updates delivered to the GUI thread. """
+        return self._deliveredCount
+
+#___________________________________________________________________________________________________ GS: droppedCount
+    @property
+    def droppedCount(self):
+        """ The number of updates that were superseded by a newer update before delivery. """
+        return self._droppedCount
+
+#___________________________________________________________________________________________________ GS: stats
+    @property
+    def stats(self):
+        return dict(delivered=self._deliveredCount, dropped=self._droppedCount)
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ report
+    def report(self, identifier, data):
+        """ Reports a progress update, delivering it immediately if the rate limit allows or
+            holding it as the latest pending update otherwise. """
+        with self._lock:
+            if self._pending is not None:
+                self._droppedCount += 1
+            self._pending = None
+
+            now = time.time()
+            if self._maxRate > 0 and now - self._lastDelivery < 1.0/self._maxRate:
+                self._pending = (identifier, data)
+                if self._timer is None:
+                    self._timer = RemoteTimerQueue.getInstance().schedule(
+                        self._lastDelivery + 1.0/self._maxRate - now, self._handleTimer)
+                return False
+
+            self._lastDelivery    = now
+            self._deliveredCount += 1
+
+        self._deliver(identifier, data)
+        return True
+
+#___________________________________________________________________________________________________ flush
+    def flush(self):
+        """ Delivers the pending update, if any, regardless of the rate limit. """
+        with self._lock:
+            pending = self._pending
+            if pending is None:
+                return False
+
+            self._pending         = None
+            self._lastDelivery    = time.time()
+            self._deliveredCount += 1
+
+            if self._timer is not None:
+                RemoteTimerQueue.getInstance().cancel(self._timer)
+                self._timer = None
+
+        self._deliver(*pending)
+        return True
+
+#===================================================================================================
+#                                                                                 H A N D L E R S
+
+#___________________________________________________________________________________________________ _handleTimer
+    def _handleTimer(self):
+        """ Delivers the update held since the last delivery once the rate limit allows. """
+        with self._lock:
+            self._timer = None
+        self.flush()
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        return self.__str__()
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return '<%s delivered[%s] dropped[%s]>' % (
+            self.__class__.__name__, self._deliveredCount, self._droppedCount)
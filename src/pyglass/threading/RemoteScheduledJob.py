@@ -0,0 +1,68 @@
+# RemoteScheduledJob.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+#___________________________________________________________________________________________________ RemoteScheduledJob
+class RemoteScheduledJob(object):
+    """ A job registered with the RemoteJobScheduler, along with its schedule and run history.
+        Recurring jobs run every interval seconds. Idle jobs run once the application has been
+        idle for idleTime milliseconds, either once per idle period or, when an interval is also
+        specified, repeatedly while the application remains idle. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(
+            self, function, args =None, kwargs =None, name =None, interval =None, jitter =0.0,
+            idleTime =None, priority =None, allowOverlap =False, runWhenHidden =False,
+            callback =None
+    ):
+        """Creates a new instance of RemoteScheduledJob."""
+        self.function      = function
+        self.args          = list(args) if args else []
+        self.kwargs        = dict(kwargs) if kwargs else dict()
+        self.name          = name if name else getattr(function, '__name__', 'job')
+        self.interval      = interval
+        self.jitter        = jitter
+        self.idleTime      = idleTime
+        self.priority      = priority
+        self.allowOverlap  = allowOverlap
+        self.runWhenHidden = runWhenHidden
+        self.callback      = callback
+
+        self.isEnabled     = True
+        self.nextRunTime   = None
+        self.lastRunTime   = None
+        self.lastEndTime   = None
+        self.runningCount  = 0
+        self.runCount      = 0
+        self.failureCount  = 0
+        self.skippedCount  = 0
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: isIdleJob
+    @property
+    def isIdleJob(self):
+        return self.idleTime is not None
+
+#___________________________________________________________________________________________________ GS: isRunning
+    @property
+    def isRunning(self):
+        return self.runningCount > 0
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        return self.__str__()
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return '<%s %s runs[%s] running[%s]>' % (
+            self.__class__.__name__, self.name, self.runCount, self.isRunning)
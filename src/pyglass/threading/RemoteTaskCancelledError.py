@@ -0,0 +1,10 @@
+# RemoteTaskCancelledError.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+#___________________________________________________________________________________________________ RemoteTaskCancelledError
+class RemoteTaskCancelledError(Exception):
+    """ Raised from within a running task when its cancellation token has been cancelled so that
+        the task can unwind cooperatively. """
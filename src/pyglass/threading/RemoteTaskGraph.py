@@ -0,0 +1,296 @@
+# RemoteTaskGraph.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import time
+import threading
+from collections import OrderedDict
+
+from pyglass.threading.CancellationToken import CancellationToken
+from pyglass.threading.RemoteExecutionPool import RemoteExecutionPool
+from pyglass.threading.RemoteExecutionThread import RemoteExecutionThread
+from pyglass.threading.RemoteTaskCancelledError import RemoteTaskCancelledError
+from pyglass.threading.RemoteTaskGraphNode import RemoteTaskGraphNode
+from pyglass.threading.RemoteTaskRegistry import RemoteTaskRegistry
+from pyglass.threading.RemoteTaskStatusEnum import RemoteTaskStatusEnum
+
+#___________________________________________________________________________________________________ RemoteTaskGraph
+class RemoteTaskGraph(RemoteExecutionThread):
+    """ Executes a set of tasks with declared dependencies as a directed acyclic graph. Each task
+        is queued on the execution pool as soon as all of its dependencies have succeeded, so
+        independent branches run in parallel, and its function is called with the outputs of its
+        dependencies directly on the worker thread without a round trip through the GUI thread.
+
+        The graph completes once every task has finished, or once running tasks have finished
+        after a failure or cancellation, in which case the remaining tasks are skipped. Its output
+        is a dictionary of the outputs of the succeeded tasks by name and the per-task timing is
+        available from the timings property and written to the log on completion. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, parent =None, **kwargs):
+        """Creates a new instance of RemoteTaskGraph."""
+        super(RemoteTaskGraph, self).__init__(parent, **kwargs)
+        self._nodes        = OrderedDict()
+        self._graphLock    = threading.Lock()
+        self._runningCount = 0
+        self._isFailed     = False
+        self._startTime    = None
+        self._endTime      = None
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: nodes
+    @property
+    def nodes(self):
+        """ The RemoteTaskGraphNode instances of the graph in the order they were added. """
+        return list(self._nodes.values())
+
+#___________________________________________________________________________________________________ GS: elapsed
+    @property
+    def elapsed(self):
+        """ The wall time, in seconds, taken to execute the graph. """
+        if self._startTime is None or self._endTime is None:
+            return None
+        return self._endTime - self._startTime
+
+#___________________________________________________________________________________________________ GS: timings
+    @property
+    def timings(self):
+        """ A list containing the timing dictionary of each node in the order they were added. """
+        return [n.timing for n in self._nodes.values()]
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ addTask
+    def addTask(self, name, function, dependsOn =None, args =None, kwargs =None, priority =None):
+        """ Adds a task to the graph and returns its RemoteTaskGraphNode. Tasks can be added in
+            any order but must all be added before the graph is executed.
+
+            @@@param name:string
+                The unique name of the task, used to declare dependencies and identify its output.
+
+            @@@param function:function
+                Called on a worker thread with the outputs of the dependencies, in the order they
+                are listed in dependsOn, followed by args and kwargs.
+
+            @@@param dependsOn:list
+                The names of the tasks that must succeed before this one starts.
+
+            @@@param priority:int
+                The pool priority of the task. Defaults to the priority of the graph.
+        """
+        if name in self._nodes:
+            raise ValueError('Task "%s" already exists in the graph' % name)
+
+        node = RemoteTaskGraphNode(
+            name=name,
+            function=function,
+            dependsOn=dependsOn,
+            args=args,
+            kwargs=kwargs,
+            priority=priority)
+        self._nodes[name] = node
+        return node
+
+#___________________________________________________________________________________________________ getTimingReport
+    def getTimingReport(self):
+        """ Returns a human readable summary of the graph and per-task timing. """
+        nodeTime = sum([n.elapsed for n in self._nodes.values() if n.elapsed is not None])
+        lines    = ['%s %s in %.3fs (task time %.3fs)' % (
+            self.__class__.__name__,
+            self._getGraphStatus(),
+            self.elapsed if self.elapsed is not None else 0.0,
+            nodeTime)]
+
+        for node in self._nodes.values():
+            if node.elapsed is None:
+                lines.append('  %s: %s' % (node.name, node.status))
+                continue
+
+            lines.append('  %s: %s start %.3fs wait %.3fs run %.3fs' % (
+                node.name,
+                node.status,
+                node.startTime - self._startTime,
+                node.waitTime,
+                node.elapsed))
+        return '\n'.join(lines)
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _executeImpl
+    def _executeImpl(self):
+        self._startTime = time.time()
+        if self._token.isCancelled:
+            self._runCancelled()
+            return
+
+        RemoteTaskRegistry.getInstance().markStarted(self)
+        try:
+            ready = self._prepareNodes()
+        except Exception as err:
+            self._error = err
+            self._log.writeError('FAILED: Invalid task graph', err)
+            self._finishGraph()
+            return
+
+        if not ready:
+            self._finishGraph()
+            return
+
+        self._token.addCallback(self._handleCancelled)
+        with self._graphLock:
+            self._runningCount += len(ready)
+        for node in ready:
+            self._submitNode(node)
+
+#___________________________________________________________________________________________________ _prepareNodes
+    def _prepareNodes(self):
+        """ Links each node to its dependants, validates that the graph is acyclic and returns the
+            nodes that have no dependencies. """
+        for node in self._nodes.values():
+            node.waitingCount = len(node.dependencies)
+            for name in node.dependencies:
+                if name not in self._nodes:
+                    raise ValueError('Task "%s" depends on unknown task "%s"' % (node.name, name))
+                self._nodes[name].dependants.append(node)
+
+        ready   = [n for n in self._nodes.values() if not n.waitingCount]
+        counts  = dict([(n.name, n.waitingCount) for n in self._nodes.values()])
+        pending = list(ready)
+        visited = 0
+        while pending:
+            node = pending.pop()
+            visited += 1
+            for dependant in node.dependants:
+                counts[dependant.name] -= 1
+                if not counts[dependant.name]:
+                    pending.append(dependant)
+
+        if visited != len(self._nodes):
+            raise ValueError('The task graph contains a dependency cycle')
+        return ready
+
+#___________________________________________________________________________________________________ _getGraphPool
+    def _getGraphPool(self):
+        """ Nodes always execute on a pool, regardless of USE_EXECUTION_POOL, using the shared
+            pool unless one has been assigned to the graph. """
+        return self._pool if self._pool else RemoteExecutionPool.getInstance()
+
+#___________________________________________________________________________________________________ _getGraphStatus
+    def _getGraphStatus(self):
+        if self._error is not None:
+            return RemoteTaskStatusEnum.FAILED
+        if self._token.isCancelled:
+            return RemoteTaskStatusEnum.CANCELLED
+        return RemoteTaskStatusEnum.SUCCESS
+
+#___________________________________________________________________________________________________ _submitNode
+    def _submitNode(self, node):
+        """ Queues the node on the execution pool. The running count must already include it. """
+        node.queuedTime = time.time()
+        node.poolTask   = self._getGraphPool().submit(
+            function=lambda: self._runNode(node),
+            priority=self._priority if node.priority is None else node.priority,
+            cancellationToken=CancellationToken(parent=self._token),
+            onDiscard=lambda: self._nodeComplete(node, RemoteTaskStatusEnum.CANCELLED))
+
+        if node.poolTask is None:
+            # The pool has been shut down
+            self._nodeComplete(node, RemoteTaskStatusEnum.CANCELLED)
+
+#___________________________________________________________________________________________________ _runNode
+    def _runNode(self, node):
+        """ Executes the node's function on a worker thread. """
+        node.startTime = time.time()
+        if self._token.isCancelled:
+            node.endTime = node.startTime
+            self._nodeComplete(node, RemoteTaskStatusEnum.CANCELLED)
+            return
+
+        args = [self._nodes[name].output for name in node.dependencies] + node.args
+        try:
+            output = node.function(*args, **node.kwargs)
+        except RemoteTaskCancelledError:
+            node.endTime = time.time()
+            self._nodeComplete(node, RemoteTaskStatusEnum.CANCELLED)
+            return
+        except Exception as err:
+            node.endTime = time.time()
+            self._log.writeError('FAILED: Task "%s" raised an exception' % node.name, err)
+            self._nodeComplete(node, RemoteTaskStatusEnum.FAILED, error=err)
+            return
+
+        node.endTime = time.time()
+        self._nodeComplete(node, RemoteTaskStatusEnum.SUCCESS, output=output)
+
+#___________________________________________________________________________________________________ _nodeComplete
+    def _nodeComplete(self, node, status, output =None, error =None):
+        """ Records the result of a node and queues any dependants that have become ready. The
+            graph is finished on the thread that completes its last running node. """
+        with self._graphLock:
+            if node.status is not None:
+                return
+
+            node.status = status
+            node.output = output
+            node.error  = error
+            self._runningCount -= 1
+
+            ready = []
+            if status == RemoteTaskStatusEnum.SUCCESS:
+                if not self._isFailed and not self._token.isCancelled:
+                    for dependant in node.dependants:
+                        dependant.waitingCount -= 1
+                        if not dependant.waitingCount:
+                            ready.append(dependant)
+            elif status == RemoteTaskStatusEnum.FAILED and not self._isFailed:
+                self._isFailed = True
+                self._error    = error
+
+            self._runningCount += len(ready)
+            finished = not self._runningCount
+
+        for dependant in ready:
+            self._submitNode(dependant)
+
+        if finished:
+            self._finishGraph()
+
+#___________________________________________________________________________________________________ _finishGraph
+    def _finishGraph(self):
+        self._endTime = time.time()
+
+        for node in self._nodes.values():
+            if node.status is None:
+                node.status = RemoteTaskStatusEnum.CANCELLED
+
+        self._output = OrderedDict([
+            (n.name, n.output) for n in self._nodes.values()
+            if n.status == RemoteTaskStatusEnum.SUCCESS])
+
+        self._log.write(self.getTimingReport())
+
+        status = self._getGraphStatus()
+        if status == RemoteTaskStatusEnum.CANCELLED:
+            self._runCancelled()
+        else:
+            self._runComplete(0 if status == RemoteTaskStatusEnum.SUCCESS else 1)
+
+#===================================================================================================
+#                                                                                 H A N D L E R S
+
+#___________________________________________________________________________________________________ _handleCancelled
+    def _handleCancelled(self):
+        """ Discards the nodes that are still queued on the pool when the graph is cancelled. """
+        pool = self._getGraphPool()
+        for node in self._nodes.values():
+            if node.poolTask is not None and node.poolTask.isPending:
+                pool.discard(node.poolTask)
@@ -0,0 +1,79 @@
+# RemoteTaskGraphNode.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+#___________________________________________________________________________________________________ RemoteTaskGraphNode
+class RemoteTaskGraphNode(object):
+    """ A single task within a RemoteTaskGraph, along with the names of the tasks it depends upon
+        and, once executed, its result and timing. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, name, function, dependsOn =None, args =None, kwargs =None, priority =None):
+        """ Creates a new instance of RemoteTaskGraphNode.
+
+            @@@param function:function
+                Called with the outputs of the dependencies, in the order they were declared,
+                followed by args and kwargs.
+        """
+        self.name         = name
+        self.function     = function
+        self.dependencies = list(dependsOn) if dependsOn else []
+        self.dependants   = []
+        self.args         = list(args) if args else []
+        self.kwargs       = dict(kwargs) if kwargs else dict()
+        self.priority     = priority
+
+        self.status       = None
+        self.output       = None
+        self.error        = None
+        self.poolTask     = None
+        self.waitingCount = 0
+        self.queuedTime   = None
+        self.startTime    = None
+        self.endTime      = None
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: waitTime
+    @property
+    def waitTime(self):
+        """ The number of seconds the node spent queued on the pool before it started. """
+        if self.queuedTime is None or self.startTime is None:
+            return None
+        return self.startTime - self.queuedTime
+
+#___________________________________________________________________________________________________ GS: elapsed
+    @property
+    def elapsed(self):
+        """ The number of seconds the node's function took to execute. """
+        if self.startTime is None or self.endTime is None:
+            return None
+        return self.endTime - self.startTime
+
+#___________________________________________________________________________________________________ GS: timing
+    @property
+    def timing(self):
+        return dict(
+            name=self.name,
+            status=self.status,
+            wait=self.waitTime,
+            elapsed=self.elapsed,
+            start=self.startTime,
+            end=self.endTime)
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        return self.__str__()
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return '<%s %s status[%s]>' % (self.__class__.__name__, self.name, self.status)
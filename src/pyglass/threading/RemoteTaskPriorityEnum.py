@@ -0,0 +1,23 @@
+# RemoteTaskPriorityEnum.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+#___________________________________________________________________________________________________ RemoteTaskPriorityEnum
+class RemoteTaskPriorityEnum(object):
+    """ Priority levels for tasks queued on a RemoteExecutionPool. Tasks with a higher priority
+        value are started before those with a lower one. Any integer may be used. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    IDLE     = -20
+
+    LOW      = -10
+
+    NORMAL   = 0
+
+    HIGH     = 10
+
+    CRITICAL = 20
@@ -0,0 +1,104 @@
+# RemoteTaskRecord.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+#___________________________________________________________________________________________________ RemoteTaskRecord
+class RemoteTaskRecord(object):
+    """ The lifecycle timing and outcome of a single RemoteExecutionThread, kept by the
+        RemoteTaskRegistry. Times are time.time() values and durations are in seconds. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    __slots__ = (
+        'thread', 'name', 'createdTime', 'submitTime', 'startTime', 'endTime', 'dispatchTime',
+        'worker', 'status', 'returnCode')
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, thread, createdTime):
+        """Creates a new instance of RemoteTaskRecord."""
+        self.thread       = thread
+        self.name         = thread.__class__.__name__
+        self.createdTime  = createdTime
+        self.submitTime   = None
+        self.startTime    = None
+        self.endTime      = None
+        self.dispatchTime = None
+        self.worker       = None
+        self.status       = None
+        self.returnCode   = None
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: isRunning
+    @property
+    def isRunning(self):
+        return self.startTime is not None and self.endTime is None
+
+#___________________________________________________________________________________________________ GS: queueTime
+    @property
+    def queueTime(self):
+        """ The time between the task being submitted and starting to run. """
+        return self._getDuration(self.submitTime, self.startTime)
+
+#___________________________________________________________________________________________________ GS: runTime
+    @property
+    def runTime(self):
+        """ The time the task spent running. """
+        return self._getDuration(self.startTime, self.endTime)
+
+#___________________________________________________________________________________________________ GS: dispatchLatency
+    @property
+    def dispatchLatency(self):
+        """ The time between the task completing and its complete signal being handled on the
+            thread that owns it, normally the GUI thread. """
+        return self._getDuration(self.endTime, self.dispatchTime)
+
+#___________________________________________________________________________________________________ GS: totalTime
+    @property
+    def totalTime(self):
+        """ The time between the task being submitted and its completion being dispatched. """
+        return self._getDuration(self.submitTime, self.dispatchTime)
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ toDict
+    def toDict(self):
+        return dict(
+            name=self.name,
+            worker=self.worker,
+            status=self.status,
+            returnCode=self.returnCode,
+            submitTime=self.submitTime,
+            startTime=self.startTime,
+            endTime=self.endTime,
+            dispatchTime=self.dispatchTime,
+            queueTime=self.queueTime,
+            runTime=self.runTime,
+            dispatchLatency=self.dispatchLatency)
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _getDuration
+    @classmethod
+    def _getDuration(cls, start, end):
+        if start is None or end is None:
+            return None
+        return max(0.0, end - start)
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        return self.__str__()
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return '<%s %s worker[%s] status[%s]>' % (
+            self.__class__.__name__, self.name, self.worker, self.status)
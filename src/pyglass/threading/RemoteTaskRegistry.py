@@ -0,0 +1,248 @@
+# RemoteTaskRegistry.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import time
+import bisect
+import threading
+import traceback
+from collections import deque
+
+from PySide import QtCore
+
+from pyglass.threading.RemoteTaskRecord import RemoteTaskRecord
+
+#___________________________________________________________________________________________________ RemoteTaskRegistry
+class RemoteTaskRegistry(object):
+    """ Tracks every RemoteExecutionThread from creation until completion. Active threads are held
+        here so that they are not garbage collected while running, and each has a RemoteTaskRecord
+        of its submit, start, end and dispatch times, the worker it ran on and its outcome.
+
+        Completed records are kept in a bounded history and summarised into outcome counters and
+        duration histograms. The registry also provides waitAll() and cancelAll(), which the
+        PyGlassApplication uses on exit so that no task is left running during shutdown. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    # The upper bounds, in seconds, of the histogram buckets. A final bucket holds larger values.
+    HISTOGRAM_BOUNDS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0)
+
+    DEFAULT_HISTORY_SIZE = 100
+
+    _instance = None
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, historySize =None):
+        """Creates a new instance of RemoteTaskRegistry."""
+        self._lock      = threading.Lock()
+        self._condition = threading.Condition(self._lock)
+        self._active    = dict()
+        self._history   = deque(
+            maxlen=self.DEFAULT_HISTORY_SIZE if historySize is None else historySize)
+
+        self._registeredCount = 0
+        self._outcomeCounts   = dict()
+        self._histograms      = dict()
+        self._totals          = dict()
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: activeCount
+    @property
+    def activeCount(self):
+        """ The number of threads that have been created but have not yet completed. """
+        return len(self._active)
+
+#___________________________________________________________________________________________________ GS: runningCount
+    @property
+    def runningCount(self):
+        """ The number of threads that are currently running. """
+        with self._lock:
+            return len([r for r in self._active.values() if r.isRunning])
+
+#___________________________________________________________________________________________________ GS: activeRecords
+    @property
+    def activeRecords(self):
+        with self._lock:
+            return list(self._active.values())
+
+#___________________________________________________________________________________________________ GS: history
+    @property
+    def history(self):
+        """ The records of the most recently completed threads, oldest first. """
+        with self._lock:
+            return list(self._history)
+
+#___________________________________________________________________________________________________ GS: stats
+    @property
+    def stats(self):
+        """ A dictionary of the live counters along with, for each measured duration, its
+            histogram counts, aligned with HISTOGRAM_BOUNDS, and its total in seconds. """
+        with self._lock:
+            records  = list(self._active.values())
+            running  = len([r for r in records if r.isRunning])
+            return dict(
+                registered=self._registeredCount,
+                active=len(records),
+                running=running,
+                queued=len([r for r in records if r.submitTime and not r.startTime]),
+                outcomes=dict(self._outcomeCounts),
+                bounds=list(self.HISTOGRAM_BOUNDS),
+                histograms=dict([(k, list(v)) for k, v in self._histograms.items()]),
+                totals=dict(self._totals))
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ getInstance
+    @classmethod
+    def getInstance(cls):
+        """ Returns the shared registry, creating it on first access. """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+#___________________________________________________________________________________________________ register
+    def register(self, thread):
+        """ Adds the thread to the active threads and returns its RemoteTaskRecord. """
+        record = RemoteTaskRecord(thread, time.time())
+        with self._lock:
+            self._active[id(thread)] = record
+            self._registeredCount += 1
+        return record
+
+#___________________________________________________________________________________________________ markSubmitted
+    def markSubmitted(self, thread):
+        record = self._active.get(id(thread))
+        if record is not None and record.submitTime is None:
+            record.submitTime = time.time()
+
+#___________________________________________________________________________________________________ markStarted
+    def markStarted(self, thread, worker =None):
+        """ Records that the thread has started running on the specified worker, which defaults
+            to the name of the calling thread. """
+        record = self._active.get(id(thread))
+        if record is None:
+            return
+
+        record.startTime = time.time()
+        record.worker    = worker if worker else self._getWorkerName()
+
+#___________________________________________________________________________________________________ markEnded
+    def markEnded(self, thread, status, returnCode =None, endTime =None):
+        """ Records the outcome of the thread and removes it from the active threads. """
+        with self._lock:
+            record = self._active.pop(id(thread), None)
+            if record is None:
+                return None
+
+            record.endTime    = endTime if endTime else time.time()
+            record.status     = status
+            record.returnCode = returnCode
+            if record.startTime is None:
+                # Cancelled before it started
+                record.startTime = record.endTime
+
+            self._outcomeCounts[status] = self._outcomeCounts.get(status, 0) + 1
+            self._addSample('queueTime', record.queueTime)
+            self._addSample('runTime', record.runTime)
+
+            # The history keeps the timings only, so that finished threads and their outputs can
+            # be garbage collected
+            record.thread = None
+            self._history.append(record)
+            self._condition.notify_all()
+        return record
+
+#___________________________________________________________________________________________________ markDispatched
+    def markDispatched(self, record):
+        """ Records that the complete signal of the record's thread has been handled. """
+        with self._lock:
+            if record.dispatchTime is not None:
+                return
+            record.dispatchTime = time.time()
+            self._addSample('dispatchLatency', record.dispatchLatency)
+
+#___________________________________________________________________________________________________ cancelAll
+    def cancelAll(self):
+        """ Cancels every active thread. Returns the number of threads cancelled. """
+        threads = [r.thread for r in self.activeRecords]
+        for thread in threads:
+            try:
+                thread.cancel()
+            except Exception:
+                traceback.print_exc()
+        return len(threads)
+
+#___________________________________________________________________________________________________ waitAll
+    def waitAll(self, timeout =None):
+        """ Blocks until every submitted thread has completed or the timeout, in seconds, expires.
+            Threads that were created but never executed are not waited upon. Returns True if no
+            submitted threads remain active. """
+        end = None if timeout is None else time.time() + timeout
+        with self._lock:
+            while self._hasSubmitted():
+                remaining = None if end is None else end - time.time()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            return True
+
+#___________________________________________________________________________________________________ shutdown
+    def shutdown(self, timeout =None):
+        """ Cancels every active thread and waits up to timeout seconds for them to complete.
+            Returns True if they all completed in time. """
+        self.cancelAll()
+        return self.waitAll(timeout)
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _hasSubmitted
+    def _hasSubmitted(self):
+        for record in self._active.values():
+            if record.submitTime is not None:
+                return True
+        return False
+
+#___________________________________________________________________________________________________ _addSample
+    def _addSample(self, name, value):
+        """ Adds a duration to the named histogram. Must be called while holding the lock. """
+        if value is None:
+            return
+
+        counts = self._histograms.get(name)
+        if counts is None:
+            counts = [0]*(len(self.HISTOGRAM_BOUNDS) + 1)
+            self._histograms[name] = counts
+        counts[bisect.bisect_left(self.HISTOGRAM_BOUNDS, value)] += 1
+        self._totals[name] = self._totals.get(name, 0.0) + value
+
+#___________________________________________________________________________________________________ _getWorkerName
+    @classmethod
+    def _getWorkerName(cls):
+        worker = QtCore.QThread.currentThread()
+        name   = getattr(worker, 'name', None)
+        if name:
+            return name
+        try:
+            name = worker.objectName()
+        except Exception:
+            name = None
+        return name if name else threading.current_thread().name
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        return self.__str__()
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return '<%s active[%s] registered[%s]>' % (
+            self.__class__.__name__, len(self._active), self._registeredCount)
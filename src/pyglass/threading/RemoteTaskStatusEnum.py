@@ -0,0 +1,18 @@
+# RemoteTaskStatusEnum.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+#___________________________________________________________________________________________________ RemoteTaskStatusEnum
+class RemoteTaskStatusEnum(object):
+    """ Final statuses reported in the data of a RemoteExecutionThread complete event. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    SUCCESS   = 'success'
+
+    FAILED    = 'failed'
+
+    CANCELLED = 'cancelled'
@@ -0,0 +1,9 @@
+# RemoteTaskTimeoutError.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+#___________________________________________________________________________________________________ RemoteTaskTimeoutError
+class RemoteTaskTimeoutError(Exception):
+    """ Raised or reported when a background task does not complete within its allotted time. """
@@ -5,6 +5,7 @@
 from __future__ import print_function, absolute_import, unicode_literals, division
 
 from pyglass.event.PyGlassSignalEvent import PyGlassSignalEvent
+from pyglass.threading.RemoteTaskStatusEnum import RemoteTaskStatusEnum
 
 #___________________________________________________________________________________________________ RemoteThreadEvent
 class RemoteThreadEvent(PyGlassSignalEvent):
@@ -13,6 +14,8 @@ class RemoteThreadEvent(PyGlassSignalEvent):
 #===================================================================================================
 #                                                                                       C L A S S
 
+    __slots__ = ('_id',)
+
 #___________________________________________________________________________________________________ __init__
     def __init__(self, identifier, target, data =None):
         """Creates a new instance of RemoteThreadEvent."""
@@ -27,6 +30,17 @@ class RemoteThreadEvent(PyGlassSignalEvent):
     def success(self):
         return self.target.success
 
+#___________________________________________________________________________________________________ GS: status
+    @property
+    def status(self):
+        """ The RemoteTaskStatusEnum value for complete events, or None for other events. """
+        return self.get('status')
+
+#___________________________________________________________________________________________________ GS: isCancelled
+    @property
+    def isCancelled(self):
+        return self.status == RemoteTaskStatusEnum.CANCELLED
+
 #___________________________________________________________________________________________________ GS: id
     @property
     def id(self):
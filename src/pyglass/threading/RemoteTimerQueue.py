@@ -0,0 +1,118 @@
+# RemoteTimerQueue.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import time
+import heapq
+import threading
+
+from pyaid.debug.Logger import Logger
+
+#___________________________________________________________________________________________________ RemoteTimerQueue
+class RemoteTimerQueue(object):
+    """ Runs delayed callbacks for worker threads on a single shared timer thread, instead of
+        starting a threading.Timer, and with it a new OS thread, for every delay. Used to flush
+        the chunks, log batches and progress updates held by worker threads once their time
+        window has passed.
+
+        Callbacks run on the timer thread in the order they are due and must return quickly, as
+        a blocked callback delays every other callback in the queue. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    _instance = None
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self):
+        """Creates a new instance of RemoteTimerQueue."""
+        self._log       = Logger(self)
+        self._condition = threading.Condition()
+        self._entries   = []
+        self._sequence  = 0
+        self._thread    = None
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: size
+    @property
+    def size(self):
+        """ The number of callbacks scheduled, including cancelled callbacks not yet removed. """
+        return len(self._entries)
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ getInstance
+    @classmethod
+    def getInstance(cls):
+        """ Returns the shared timer queue, creating it on first access. """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+#___________________________________________________________________________________________________ schedule
+    def schedule(self, delay, function):
+        """ Schedules the function to be called on the timer thread after delay seconds. Returns
+            the entry for the scheduled call, which can be passed to cancel(). Safe to call from
+            any thread. """
+        with self._condition:
+            self._sequence += 1
+            entry = [time.time() + max(0.0, delay), self._sequence, function]
+            heapq.heappush(self._entries, entry)
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='RemoteTimerQueue')
+                self._thread.daemon = True
+                self._thread.start()
+            elif self._entries[0] is entry:
+                self._condition.notify()
+        return entry
+
+#___________________________________________________________________________________________________ cancel
+    def cancel(self, entry):
+        """ Cancels the scheduled call if it has not already been made. The entry is removed from
+            the queue when it comes due. Safe to call from any thread. """
+        if entry is None:
+            return False
+        with self._condition:
+            cancelled = entry[2] is not None
+            entry[2]  = None
+        return cancelled
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _run
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._entries or self._entries[0][0] > time.time():
+                    timeout = self._entries[0][0] - time.time() if self._entries else None
+                    self._condition.wait(timeout)
+
+                entry    = heapq.heappop(self._entries)
+                function = entry[2]
+                entry[2] = None
+
+            if function is None:
+                continue
+
+            try:
+                function()
+            except Exception as err:
+                self._log.writeError('ERROR: Scheduled timer callback failed', err)
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        return self.__str__()
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return '<%s scheduled[%s]>' % (self.__class__.__name__, len(self._entries))
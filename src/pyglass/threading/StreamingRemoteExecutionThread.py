@@ -0,0 +1,233 @@
+# StreamingRemoteExecutionThread.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import time
+import threading
+
+from PySide import QtCore
+
+from pyaid.ArgsUtils import ArgsUtils
+from pyglass.threading.RemoteExecutionThread import RemoteExecutionThread
+from pyglass.threading.RemoteTimerQueue import RemoteTimerQueue
+
+#___________________________________________________________________________________________________ StreamingRemoteExecutionThread
+class StreamingRemoteExecutionThread(RemoteExecutionThread):
+    """ Executes a generator function in the background and delivers the items it yields to the
+        GUI thread in chunks through the chunkSignal, instead of holding the entire result in
+        memory until completion. A chunk is delivered once it holds chunkSize items or once
+        chunkInterval seconds have passed since its first item was yielded, which is checked on
+        the shared RemoteTimerQueue so that the items of a slow generator are delivered on time
+        while it is working on its next item. If the timer finds the producer waiting to send, it
+        checks again one interval later instead of blocking the timer thread.
+
+        At most maxInFlight chunks can be waiting for the GUI thread at any time. When a slow
+        consumer falls behind, the generator is paused until earlier chunks have been handled, so
+        memory use stays bounded. The output of the thread is the total number of items yielded.
+        """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    DEFAULT_CHUNK_SIZE     = 100
+
+    DEFAULT_CHUNK_INTERVAL = 0.1
+
+    DEFAULT_MAX_IN_FLIGHT  = 4
+
+    # The interval, in seconds, at which a paused producer checks for cancellation
+    _POLL_INTERVAL = 0.05
+
+    chunkSignal       = QtCore.Signal(object)
+    _chunkReadySignal = QtCore.Signal(object)
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, parent, function, *args, **kwargs):
+        """Creates a new instance of StreamingRemoteExecutionThread."""
+        super(StreamingRemoteExecutionThread, self).__init__(parent)
+        self._function = function
+        self._args     = args
+        self._kwargs   = kwargs
+
+        self.chunkSize     = self.DEFAULT_CHUNK_SIZE
+        self.chunkInterval = self.DEFAULT_CHUNK_INTERVAL
+        self.maxInFlight   = self.DEFAULT_MAX_IN_FLIGHT
+
+        self._flightCondition = threading.Condition()
+        self._chunkLock       = threading.Lock()
+        self._sendLock        = threading.Lock()
+        self._chunk           = []
+        self._chunkTimer      = None
+        self._inFlightCount   = 0
+        self._chunkCount      = 0
+        self._itemCount       = 0
+        self._pausedTime      = 0.0
+
+        self._chunkReadySignal.connect(self._handleChunkReady)
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: chunkCount
+    @property
+    def chunkCount(self):
+        """ The number of chunks delivered so far. """
+        return self._chunkCount
+
+#___________________________________________________________________________________________________ GS: itemCount
+    @property
+    def itemCount(self):
+        """ The number of items yielded by the generator so far. """
+        return self._itemCount
+
+#___________________________________________________________________________________________________ GS: inFlightCount
+    @property
+    def inFlightCount(self):
+        """ The number of chunks sent that have not yet been handled by the GUI thread. """
+        return self._inFlightCount
+
+#___________________________________________________________________________________________________ GS: pausedTime
+    @property
+    def pausedTime(self):
+        """ The total number of seconds the generator was paused waiting for the consumer. """
+        return self._pausedTime
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _connectSignals
+    def _connectSignals(self, **kwargs):
+        super(StreamingRemoteExecutionThread, self)._connectSignals(**kwargs)
+
+        chunkCallback = ArgsUtils.get('chunkCallback', None, kwargs)
+        if chunkCallback:
+            self.chunkSignal.connect(chunkCallback)
+
+#___________________________________________________________________________________________________ _runImpl
+    def _runImpl(self):
+        try:
+            for item in self._function(*self._args, **self._kwargs):
+                if self._token.isCancelled:
+                    return self.CANCELLED_CODE
+
+                with self._chunkLock:
+                    if not self._chunk:
+                        self._startChunkTimer()
+                    self._chunk.append(item)
+                    self._itemCount += 1
+                    full = len(self._chunk) >= self.chunkSize
+
+                if full and not self._flushChunk():
+                    return self.CANCELLED_CODE
+
+            if not self._flushChunk():
+                return self.CANCELLED_CODE
+        finally:
+            with self._chunkLock:
+                self._stopChunkTimer()
+
+        self._output = self._itemCount
+        return 0
+
+#___________________________________________________________________________________________________ _flushChunk
+    def _flushChunk(self):
+        """ Sends the items yielded since the previous chunk, if any, from the producer. Returns
+            False if cancelled while waiting to send. """
+        with self._sendLock:
+            with self._chunkLock:
+                items = self._chunk
+                self._chunk = []
+                self._stopChunkTimer()
+
+            if not items:
+                return True
+            return self._sendChunk(items)
+
+#___________________________________________________________________________________________________ _startChunkTimer
+    def _startChunkTimer(self):
+        """ Schedules the timer that sends the current chunk once chunkInterval seconds have
+            passed. Must be called while holding the chunk lock. """
+        self._chunkTimer = RemoteTimerQueue.getInstance().schedule(
+            self.chunkInterval, self._handleChunkTimer)
+
+#___________________________________________________________________________________________________ _stopChunkTimer
+    def _stopChunkTimer(self):
+        if self._chunkTimer is not None:
+            RemoteTimerQueue.getInstance().cancel(self._chunkTimer)
+            self._chunkTimer = None
+
+#___________________________________________________________________________________________________ _sendChunk
+    def _sendChunk(self, items, wait =True):
+        """ Sends the chunk to the GUI thread once fewer than maxInFlight chunks are waiting there,
+            blocking the generator until then. Returns False if cancelled while waiting, or if
+            wait is False and the chunk could not be sent immediately. """
+        with self._flightCondition:
+            if not wait and self._inFlightCount >= self.maxInFlight:
+                return False
+            if self._inFlightCount >= self.maxInFlight:
+                start = time.time()
+                while self._inFlightCount >= self.maxInFlight:
+                    if self._token.isCancelled:
+                        self._pausedTime += time.time() - start
+                        return False
+                    self._flightCondition.wait(self._POLL_INTERVAL)
+                self._pausedTime += time.time() - start
+
+            self._inFlightCount += 1
+            index = self._chunkCount
+            self._chunkCount += 1
+
+        self._chunkReadySignal.emit({
+            'items':items,
+            'index':index,
+            'itemCount':self._itemCount })
+        return True
+
+#===================================================================================================
+#                                                                                 H A N D L E R S
+
+#___________________________________________________________________________________________________ _handleChunkTimer
+    def _handleChunkTimer(self):
+        """ Sends the current chunk from the timer thread without waiting. If the producer is
+            sending or the GUI thread has fallen behind, the chunk is checked again one interval
+            later, unless the producer sends it first. """
+        if not self._sendLock.acquire(False):
+            self._rescheduleChunkTimer()
+            return
+
+        try:
+            with self._flightCondition:
+                if self._inFlightCount >= self.maxInFlight:
+                    self._rescheduleChunkTimer()
+                    return
+
+            with self._chunkLock:
+                items = self._chunk
+                self._chunk = []
+                self._chunkTimer = None
+
+            if items:
+                self._sendChunk(items, wait=False)
+        finally:
+            self._sendLock.release()
+
+#___________________________________________________________________________________________________ _rescheduleChunkTimer
+    def _rescheduleChunkTimer(self):
+        with self._chunkLock:
+            if self._chunk and self._status is None and not self._token.isCancelled:
+                self._startChunkTimer()
+            else:
+                self._chunkTimer = None
+
+#___________________________________________________________________________________________________ _handleChunkReady
+    def _handleChunkReady(self, data):
+        """ Dispatches the chunk to the chunkSignal listeners on the GUI thread and then releases
+            its in-flight slot so that the producer can continue. """
+        try:
+            self.dispatchEvent(self.chunkSignal, 'chunk', data)
+        finally:
+            with self._flightCondition:
+                self._inFlightCount -= 1
+                self._flightCondition.notify()
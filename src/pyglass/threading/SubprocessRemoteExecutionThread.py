@@ -0,0 +1,244 @@
+# SubprocessRemoteExecutionThread.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import time
+import threading
+import subprocess
+import multiprocessing
+from collections import deque
+
+from pyaid.ArgsUtils import ArgsUtils
+from pyaid.string.StringUtils import StringUtils
+from pyglass.threading.RemoteExecutionPool import RemoteExecutionPool
+from pyglass.threading.RemoteExecutionThread import RemoteExecutionThread
+from pyglass.threading.RemoteTaskTimeoutError import RemoteTaskTimeoutError
+
+#___________________________________________________________________________________________________ SubprocessRemoteExecutionThread
+class SubprocessRemoteExecutionThread(RemoteExecutionThread):
+    """ Runs an external command in a subprocess. Its stdout and stderr are read line by line on
+        reader threads as they are produced, instead of being collected by communicate() once the
+        process exits, and each line is written to the log so that it is streamed through the
+        batched logSignal. Stdout is only kept in memory when captureOutput is enabled, while the
+        most recent stderr lines are kept for the errorOutput.
+
+        Subprocesses are executed on a dedicated RemoteExecutionPool whose worker count limits how
+        many run concurrently. A process that exceeds its timeout or whose thread is cancelled is
+        killed. The output of the thread is the captured stdout, if any, and its return code is
+        the exit code of the process. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    MAX_CONCURRENT_PROCESSES = max(2, multiprocessing.cpu_count())
+
+    # The number of trailing stderr lines kept for the errorOutput
+    ERROR_LINE_COUNT = 200
+
+    # The interval, in seconds, at which the waiting thread checks for cancellation and timeout
+    _POLL_INTERVAL = 0.05
+
+    # The number of seconds to wait for the output of a killed process, whose children may still
+    # hold its pipes open
+    _KILLED_READ_TIMEOUT = 1.0
+
+    _subprocessPool = None
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, parent, command, **kwargs):
+        """ Creates a new instance of SubprocessRemoteExecutionThread.
+
+            @@@param command:string|list
+                The command to execute, either as a list of arguments or as a string, which is
+                executed through the shell unless shell is set to False.
+
+            @@@param timeout:number
+                The number of seconds after which the process is killed. Unlimited by default.
+
+            @@@param captureOutput:boolean
+                When True stdout is collected and set as the output of the thread. Defaults to
+                False.
+
+            @@@param logOutput:boolean
+                Whether or not stdout lines are written to the log. Defaults to True. Stderr lines
+                are always written to the log.
+        """
+        super(SubprocessRemoteExecutionThread, self).__init__(parent, **kwargs)
+        self._command       = command
+        self._shell         = ArgsUtils.get('shell', StringUtils.isStringType(command), kwargs)
+        self._cwd           = ArgsUtils.get('cwd', None, kwargs)
+        self._env           = ArgsUtils.get('env', None, kwargs)
+        self._timeout       = ArgsUtils.get('timeout', None, kwargs)
+        self._captureOutput = ArgsUtils.get('captureOutput', False, kwargs)
+        self._logOutput     = ArgsUtils.get('logOutput', True, kwargs)
+
+        self._process      = None
+        self._outputLines  = []
+        self._errorLines   = deque(maxlen=self.ERROR_LINE_COUNT)
+        self._isTimedOut   = False
+
+        # Output lines are delivered in time-windowed batches rather than one event per line
+        self.enableLogBuffer()
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: command
+    @property
+    def command(self):
+        return self._command
+
+#___________________________________________________________________________________________________ GS: timeout
+    @property
+    def timeout(self):
+        return self._timeout
+    @timeout.setter
+    def timeout(self, value):
+        self._timeout = value
+
+#___________________________________________________________________________________________________ GS: processId
+    @property
+    def processId(self):
+        """ The process ID of the subprocess once it has been started. """
+        return self._process.pid if self._process else None
+
+#___________________________________________________________________________________________________ GS: isTimedOut
+    @property
+    def isTimedOut(self):
+        return self._isTimedOut
+
+#___________________________________________________________________________________________________ GS: errorOutput
+    @property
+    def errorOutput(self):
+        """ The most recent lines written to stderr by the process. """
+        return ''.join(self._errorLines)
+
+#___________________________________________________________________________________________________ GS: pool
+    @property
+    def pool(self):
+        """ The RemoteExecutionPool on which the subprocess is managed. Defaults to the shared
+            subprocess pool that limits the number of concurrent subprocesses. """
+        if not self.USE_EXECUTION_POOL:
+            return None
+        return self._pool if self._pool else self.getSubprocessPool()
+    @pool.setter
+    def pool(self, value):
+        self._pool = value
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ getSubprocessPool
+    @classmethod
+    def getSubprocessPool(cls):
+        """ Returns the shared pool used to run subprocesses, creating it on first access or
+            after the previous pool has been shut down. """
+        owner = SubprocessRemoteExecutionThread
+        if owner._subprocessPool is None or owner._subprocessPool.isShutdown:
+            owner._subprocessPool = RemoteExecutionPool(
+                maxWorkers=cls.MAX_CONCURRENT_PROCESSES, name='SubprocessPool')
+        return owner._subprocessPool
+
+#___________________________________________________________________________________________________ shutdownSubprocessPool
+    @classmethod
+    def shutdownSubprocessPool(cls, timeout =None):
+        """ Shuts down the shared subprocess pool if it has been created. A new pool is created
+            the next time one is needed. """
+        pool = SubprocessRemoteExecutionThread._subprocessPool
+        if pool is None:
+            return False
+        SubprocessRemoteExecutionThread._subprocessPool = None
+        return pool.shutdown(timeout=timeout)
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _runImpl
+    def _runImpl(self):
+        try:
+            self._process = subprocess.Popen(
+                self._command,
+                shell=self._shell,
+                cwd=self._cwd,
+                env=self._env,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE)
+        except Exception as err:
+            self._error = err
+            self._log.writeError('FAILED: Unable to start subprocess', err)
+            return 1
+
+        self._process.stdin.close()
+        readers = [
+            self._startReader(self._process.stdout, False),
+            self._startReader(self._process.stderr, True) ]
+
+        end    = None if self._timeout is None else time.time() + self._timeout
+        killed = False
+        while self._process.poll() is None:
+            if end is not None and time.time() >= end:
+                self._isTimedOut = True
+                killed = self._killProcess()
+                self._error = RemoteTaskTimeoutError(
+                    'Subprocess timed out after %s seconds' % self._timeout)
+                break
+
+            # Waits on the token so that cancellation interrupts the poll interval immediately
+            if self._token.wait(self._POLL_INTERVAL):
+                killed = self._killProcess()
+                break
+
+        readEnd = time.time() + self._KILLED_READ_TIMEOUT
+        for reader in readers:
+            reader.join(max(0.0, readEnd - time.time()) if killed else None)
+
+        if self._captureOutput:
+            self._output = ''.join(self._outputLines)
+
+        if self._token.isCancelled:
+            return self.CANCELLED_CODE
+
+        if self._isTimedOut:
+            return 1
+
+        code = self._process.returncode
+        if code and self._error is None:
+            self._error = self.errorOutput or 'Subprocess exited with code %s' % code
+        return code
+
+#___________________________________________________________________________________________________ _startReader
+    def _startReader(self, stream, isError):
+        reader = threading.Thread(target=self._readStream, args=(stream, isError))
+        reader.daemon = True
+        reader.start()
+        return reader
+
+#___________________________________________________________________________________________________ _readStream
+    def _readStream(self, stream, isError):
+        """ Reads the stream line by line until it closes. Executes on a reader thread. """
+        try:
+            for line in iter(stream.readline, b''):
+                line = StringUtils.toUnicode(line)
+                if isError:
+                    self._errorLines.append(line)
+                    self._log.write(line.rstrip('\r\n'))
+                    continue
+
+                if self._captureOutput:
+                    self._outputLines.append(line)
+                if self._logOutput:
+                    self._log.write(line.rstrip('\r\n'))
+        finally:
+            stream.close()
+
+#___________________________________________________________________________________________________ _killProcess
+    def _killProcess(self):
+        try:
+            self._process.kill()
+        except Exception:
+            # The process may have exited in the meantime
+            pass
+        return True
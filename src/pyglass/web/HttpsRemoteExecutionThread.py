@@ -4,23 +4,110 @@
 
 from __future__ import print_function, absolute_import, unicode_literals, division
 
-import requests
+import time
 
 from PySide import QtNetwork
+from requests import exceptions
 
-from pyglass.app.PyGlassEnvironment import PyGlassEnvironment
+from pyglass.threading.RemoteExecutionPool import RemoteExecutionPool
 from pyglass.threading.RemoteExecutionThread import RemoteExecutionThread
+from pyglass.web.request.RequestSessionPool import RequestSessionPool
+from pyglass.web.request.RequestUtils import RequestUtils
+from pyglass.web.request.RequestWatchdog import RequestWatchdog
 
 #___________________________________________________________________________________________________ HttpsRemoteExecutionThread
 class HttpsRemoteExecutionThread(RemoteExecutionThread):
+    """ Executes an HTTPS request through the shared RequestSessionPool. When created with
+        stream=True the response body is not held in memory. Instead a 'headers' event is
+        dispatched through the eventSignal once the response headers arrive, followed by a
+        'chunk' event for each block of the body as it is received.
+
+        The deadline, in seconds, covers the whole request including a streamed body, which is
+        checked between chunks. It defaults to RequestUtils.DEFAULT_DEADLINE except for streamed
+        requests and downloads, which have no deadline unless one is specified. A thread with a
+        deadline is watched by the RequestWatchdog, from when it starts running, and is released
+        if it is still running past its deadline.
+
+        Streamed requests occupy their worker for as long as the body takes to arrive, so they
+        run on a separate stream pool of at most MAX_CONCURRENT_STREAMS workers instead of the
+        shared RemoteExecutionPool, which they would otherwise starve of workers. """
 
 #===================================================================================================
 #                                                                                       C L A S S
 
+    # The maximum size, in bytes, of the body chunks dispatched by streamed requests
+    STREAM_CHUNK_SIZE = 16384
+
+    # The maximum number of streamed requests executed at the same time
+    MAX_CONCURRENT_STREAMS = 6
+
+    _streamPool = None
+
 #___________________________________________________________________________________________________ __init__
     def __init__(self, parent, **kwargs):
         RemoteExecutionThread.__init__(self, parent, **kwargs)
-        self._kwargs = kwargs
+        self._kwargs   = kwargs
+        self._response = None
+        self._deadline = kwargs.get('deadline', None)
+        if self._deadline is None and not kwargs.get('stream', False) \
+                and not kwargs.get('downloadPath', None):
+            self._deadline = RequestUtils.DEFAULT_DEADLINE
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: url
+    @property
+    def url(self):
+        return self._kwargs.get('url', None)
+
+#___________________________________________________________________________________________________ GS: pool
+    @property
+    def pool(self):
+        """ The RemoteExecutionPool on which the request executes. Defaults to the shared stream
+            pool for streamed requests. """
+        if not self.USE_EXECUTION_POOL:
+            return None
+        if self._pool:
+            return self._pool
+        if self._kwargs.get('stream', False):
+            return self.getStreamPool()
+        return RemoteExecutionPool.getInstance()
+    @pool.setter
+    def pool(self, value):
+        self._pool = value
+
+#___________________________________________________________________________________________________ GS: startTime
+    @property
+    def startTime(self):
+        """ The time at which the thread started running, from which the RequestWatchdog measures
+            its deadline, or None if it is still queued. """
+        return self._record.startTime if self._record is not None else None
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ getStreamPool
+    @classmethod
+    def getStreamPool(cls):
+        """ Returns the shared pool used to run streamed requests, creating it on first access or
+            after the previous pool has been shut down. """
+        owner = HttpsRemoteExecutionThread
+        if owner._streamPool is None or owner._streamPool.isShutdown:
+            owner._streamPool = RemoteExecutionPool(
+                maxWorkers=cls.MAX_CONCURRENT_STREAMS, name='HttpsStreamPool')
+        return owner._streamPool
+
+#___________________________________________________________________________________________________ shutdownStreamPool
+    @classmethod
+    def shutdownStreamPool(cls, timeout =None):
+        """ Shuts down the shared stream pool if it has been created. A new pool is created the
+            next time one is needed. """
+        pool = HttpsRemoteExecutionThread._streamPool
+        if pool is None:
+            return False
+        HttpsRemoteExecutionThread._streamPool = None
+        return pool.shutdown(timeout=timeout)
 
 #===================================================================================================
 #                                                                               P R O T E C T E D
@@ -31,20 +118,98 @@ class HttpsRemoteExecutionThread(RemoteExecutionThread):
         headers   = self._kwargs.get('headers', None)
         data      = self._kwargs.get('data', None)
         url       = self._kwargs.get('url', None)
+        path      = self._kwargs.get('downloadPath', None)
+        timeout   = RequestUtils.getTimeouts(self._kwargs.get('timeout', None))
+        stream    = self._kwargs.get('stream', False)
+        deadline  = self._deadline
+
+        if path and operation != QtNetwork.QNetworkAccessManager.PostOperation:
+            # Stream the response body to the file instead of holding it in memory
+            self._output = RequestUtils.executeDownload(
+                url=url,
+                path=path,
+                logger=self._log,
+                headers=headers,
+                hashAlgorithm=self._kwargs.get('hashAlgorithm', None),
+                expectedHash=self._kwargs.get('expectedHash', None),
+                progressCallback=self.dispatchProgress,
+                cancellationToken=self._token,
+                timeout=timeout,
+                deadline=deadline)
+
+            if isinstance(self._output, RequestUtils.REQUEST_FAILURE_NT):
+                return self.CANCELLED_CODE \
+                    if self._output.ident == RequestUtils.CANCELLED else 1
+            return 0
+
+        # The timeouts are capped by the deadline, which streamed bodies also check between chunks
+        expires = None
+        if deadline is not None:
+            expires = time.time() + deadline
+            timeout = tuple([min(t, deadline) for t in timeout])
 
+        sessions = RequestSessionPool.getInstance()
         if operation == QtNetwork.QNetworkAccessManager.PostOperation:
-            result = requests.post(
-                url,
-                data=data,
-                verify=PyGlassEnvironment.requestsCABundle,
-                headers=headers
-            )
+            result = sessions.post(
+                url, data=data, headers=headers, timeout=timeout, stream=stream)
         else:
-            result = requests.get(
-                url.toString(),
-                verify=PyGlassEnvironment.requestsCABundle,
-                headers=headers
-            )
+            result = sessions.get(url, headers=headers, timeout=timeout, stream=stream)
 
         self._output = result
+        if stream:
+            self._response = result
+            return self._streamResponse(result, expires)
         return 0
+
+#___________________________________________________________________________________________________ _executeImpl
+    def _executeImpl(self):
+        if self._deadline is not None:
+            RequestWatchdog.getInstance().watch(self, self._deadline)
+        RemoteExecutionThread._executeImpl(self)
+
+#___________________________________________________________________________________________________ _streamResponse
+    def _streamResponse(self, response, expires =None):
+        """ Dispatches the headers and then each chunk of the body of the streamed response as it
+            is received, stopping if the thread is cancelled or raising a Timeout once the
+            expires time has passed. """
+        try:
+            self.dispatchEvent(self.eventSignal, 'headers', {
+                'status':response.status_code,
+                'reason':response.reason,
+                'headers':response.headers })
+
+            for chunk in response.iter_content(self.STREAM_CHUNK_SIZE):
+                self._token.raiseIfCancelled()
+                if expires is not None and time.time() >= expires:
+                    raise exceptions.Timeout('Deadline of %s seconds exceeded for %s' % (
+                        self._deadline, response.url))
+                if chunk:
+                    self.dispatchEvent(self.eventSignal, 'chunk', {'chunk':chunk})
+        finally:
+            self._response = None
+            response.close()
+        return 0
+
+#===================================================================================================
+#                                                                                 H A N D L E R S
+
+#___________________________________________________________________________________________________ _handleDeadlineExceeded
+    def _handleDeadlineExceeded(self):
+        """ Called by the RequestWatchdog when the thread is still running past its deadline.
+            Completes it with a Timeout error so that its callbacks are not left waiting, then
+            cancels it and closes the response it is streaming so that a blocked read ends. """
+        self._error = exceptions.Timeout('Deadline of %s seconds exceeded' % self._deadline)
+        self._runComplete(1)
+
+        self.cancel()
+        response = self._response
+        if response is not None:
+            try:
+                response.close()
+            except Exception:
+                pass
+
+#___________________________________________________________________________________________________ _handleCompleteDispatched
+    def _handleCompleteDispatched(self, event):
+        RequestWatchdog.getInstance().unwatch(self)
+        RemoteExecutionThread._handleCompleteDispatched(self, event)
@@ -5,9 +5,10 @@
 from __future__ import print_function, absolute_import, unicode_literals, division
 
 from PySide import QtCore
-from pyaid.json.JSON import JSON
 from pyaid.string.StringUtils import StringUtils
 
+from pyglass.data.JSONCodec import JSONCodec
+
 #___________________________________________________________________________________________________ PyGlassCommunicator
 class PyGlassCommunicator(QtCore.QObject):
     """A class for..."""
@@ -59,8 +60,8 @@ class PyGlassCommunicator(QtCore.QObject):
     def callJavascript(self, function, data =None):
         frame = self._webView.page().mainFrame()
         frame.addToJavaScriptWindowObject(self.javaScriptID, self)
-        frame.evaluateJavaScript(
-            'try{ window.%s(%s); } catch (e) {}' % (function, JSON.asString(data) if data else ''))
+        frame.evaluateJavaScript('try{ window.%s(%s); } catch (e) {}' % (
+            function, JSONCodec.asString(data) if data else ''))
 
 #===================================================================================================
 #                                                                               P R O T E C T E D
@@ -71,13 +72,13 @@ class PyGlassCommunicator(QtCore.QObject):
             return None
 
         try:
-            return JSON.fromString(data)
+            return JSONCodec.fromString(data)
         except Exception as err:
             return data
 
 #___________________________________________________________________________________________________ _createSuccessResult
     def _createSuccessResult(self, payload):
-        return JSON.asString(dict(
+        return JSONCodec.asString(dict(
             success=True,
             error=False,
             payload=payload ))
@@ -96,7 +97,7 @@ class PyGlassCommunicator(QtCore.QObject):
             self._errors.pop(0)
         self._errors.append(out)
 
-        return JSON.asString(out)
+        return JSONCodec.asString(out)
 
 #===================================================================================================
 #                                                                               I N T R I N S I C
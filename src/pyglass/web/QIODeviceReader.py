@@ -0,0 +1,139 @@
+# QIODeviceReader.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import threading
+from collections import deque
+
+from PySide import QtCore
+
+from pyglass.threading.CancellationToken import CancellationToken
+
+#___________________________________________________________________________________________________ QIODeviceReader
+class QIODeviceReader(QtCore.QObject):
+    """ An iterable view of a QIODevice, such as the outgoing data of a network request, that can
+        be passed to requests as a request body. The body is then sent in blocks instead of being
+        read into memory with readAll() first. Its length is the number of bytes remaining in the
+        device when the reader is created, so that a Content-Length header is sent instead of a
+        chunked body.
+
+        QIODevices are not thread-safe, so the device is only read on the thread that created the
+        reader, which must be the thread that owns the device. Blocks are read ahead into a queue
+        holding at most MAX_BLOCKS blocks, from which the thread sending the body iterates them.
+        Each block it takes signals the owning thread to read the next one. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    # The maximum size, in bytes, of the blocks read from the device
+    BLOCK_SIZE = 65536
+
+    # The maximum number of blocks read ahead of the thread sending the body
+    MAX_BLOCKS = 4
+
+    # The interval, in seconds, at which a waiting sender checks for cancellation
+    _POLL_INTERVAL = 0.05
+
+    _readSignal = QtCore.Signal()
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, device):
+        """Creates a new instance of QIODeviceReader."""
+        QtCore.QObject.__init__(self)
+        self._device    = device
+        self._condition = threading.Condition()
+        self._blocks    = deque()
+        self._isEnded   = False
+
+        if device.isSequential():
+            self._length = int(device.bytesAvailable())
+            device.readyRead.connect(self._handleRead)
+        else:
+            self._length = max(0, int(device.size() - device.pos()))
+        self._remaining = self._length
+
+        self._readSignal.connect(self._handleRead)
+        self._handleRead()
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: device
+    @property
+    def device(self):
+        return self._device
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _readBlocks
+    def _readBlocks(self):
+        """ Reads blocks from the device until the queue is full or every byte has been read.
+            Called on the thread that owns the device. """
+        while self._remaining > 0:
+            with self._condition:
+                if len(self._blocks) >= self.MAX_BLOCKS:
+                    return
+
+            data  = self._device.read(min(self.BLOCK_SIZE, self._remaining))
+            block = data.data() if hasattr(data, 'data') else bytes(data)
+            if not block:
+                if self._device.isSequential():
+                    # Reading continues when the device emits readyRead
+                    return
+                self._remaining = 0
+                break
+
+            self._remaining -= len(block)
+            with self._condition:
+                self._blocks.append(block)
+                self._condition.notify()
+
+        with self._condition:
+            self._isEnded = True
+            self._condition.notify()
+
+#===================================================================================================
+#                                                                                 H A N D L E R S
+
+#___________________________________________________________________________________________________ _handleRead
+    def _handleRead(self):
+        if not self._isEnded:
+            self._readBlocks()
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __iter__
+    def __iter__(self):
+        """ Yields the blocks of the body as they are read by the thread that owns the device.
+            Called on the thread sending the body, which stops waiting for blocks if the task it
+            is executing is cancelled. """
+        token = CancellationToken.current()
+        while True:
+            with self._condition:
+                while not self._blocks and not self._isEnded:
+                    if token is not None:
+                        token.raiseIfCancelled()
+                    self._condition.wait(self._POLL_INTERVAL)
+
+                if not self._blocks:
+                    return
+                block = self._blocks.popleft()
+
+            self._readSignal.emit()
+            yield block
+
+#___________________________________________________________________________________________________ __len__
+    def __len__(self):
+        return self._length
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        return self.__str__()
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return '<%s device[%s]>' % (self.__class__.__name__, self._device)
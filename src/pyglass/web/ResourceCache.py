@@ -0,0 +1,255 @@
+# ResourceCache.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import os
+import threading
+from collections import OrderedDict
+
+#___________________________________________________________________________________________________ ResourceCache
+class ResourceCache(object):
+    """ Caches the local files served to PyGlassWebView pages by ResourceCustomNetworkReply for
+        the page, web, app, shared and sharedweb schemes. The path and MIME type that each url
+        resolves to are remembered so that the url is only resolved once. The content of files
+        is held in a memory LRU bounded by bytes. A cached file is only checked with a stat of
+        its modification time and size, and it is read from disk again once it has changed.
+        Files larger than maxFileBytes are always read from disk. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    DEFAULT_MAX_BYTES      = 33554432
+
+    DEFAULT_MAX_FILE_BYTES = 4194304
+
+    DEFAULT_MAX_PATHS      = 2048
+
+    _instance = None
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, maxBytes =None, maxFileBytes =None, maxPaths =None):
+        """Creates a new instance of ResourceCache."""
+        self._lock         = threading.Lock()
+        self._paths        = OrderedDict()
+        self._entries      = OrderedDict()
+        self._byteSize     = 0
+        self._maxBytes     = maxBytes if maxBytes else self.DEFAULT_MAX_BYTES
+        self._maxFileBytes = maxFileBytes if maxFileBytes else self.DEFAULT_MAX_FILE_BYTES
+        self._maxPaths     = maxPaths if maxPaths else self.DEFAULT_MAX_PATHS
+        self._enabled      = True
+
+        self._pathHits    = 0
+        self._pathMisses  = 0
+        self._hits        = 0
+        self._misses      = 0
+        self._invalidated = 0
+        self._evictions   = 0
+        self._bytesServed = 0
+        self._bytesRead   = 0
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: enabled
+    @property
+    def enabled(self):
+        """ Specifies whether or not resolved paths and file content are cached. When disabled
+            every lookup resolves the url and reads the file from disk. """
+        return self._enabled
+    @enabled.setter
+    def enabled(self, value):
+        self._enabled = bool(value)
+        if not self._enabled:
+            self.clear()
+
+#___________________________________________________________________________________________________ GS: maxBytes
+    @property
+    def maxBytes(self):
+        return self._maxBytes
+    @maxBytes.setter
+    def maxBytes(self, value):
+        with self._lock:
+            self._maxBytes = value
+            self._evict()
+
+#___________________________________________________________________________________________________ GS: maxFileBytes
+    @property
+    def maxFileBytes(self):
+        """ The size, in bytes, of the largest file whose content is held in memory. """
+        return self._maxFileBytes
+    @maxFileBytes.setter
+    def maxFileBytes(self, value):
+        self._maxFileBytes = value
+
+#___________________________________________________________________________________________________ GS: size
+    @property
+    def size(self):
+        """ The number of files whose content is held in memory. """
+        return len(self._entries)
+
+#___________________________________________________________________________________________________ GS: byteSize
+    @property
+    def byteSize(self):
+        return self._byteSize
+
+#___________________________________________________________________________________________________ GS: pathHitRatio
+    @property
+    def pathHitRatio(self):
+        """ The fraction of url lookups served by a previously resolved path. """
+        total = self._pathHits + self._pathMisses
+        return float(self._pathHits)/total if total else 0.0
+
+#___________________________________________________________________________________________________ GS: hitRatio
+    @property
+    def hitRatio(self):
+        """ The fraction of file reads served from memory. """
+        total = self._hits + self._misses
+        return float(self._hits)/total if total else 0.0
+
+#___________________________________________________________________________________________________ GS: bytesServed
+    @property
+    def bytesServed(self):
+        """ The number of bytes served from memory instead of being read from disk. """
+        return self._bytesServed
+
+#___________________________________________________________________________________________________ GS: stats
+    @property
+    def stats(self):
+        with self._lock:
+            return dict(
+                paths=len(self._paths),
+                entries=len(self._entries),
+                bytes=self._byteSize,
+                pathHits=self._pathHits,
+                pathMisses=self._pathMisses,
+                pathHitRatio=self.pathHitRatio,
+                hits=self._hits,
+                misses=self._misses,
+                hitRatio=self.hitRatio,
+                invalidated=self._invalidated,
+                evictions=self._evictions,
+                bytesServed=self._bytesServed,
+                bytesRead=self._bytesRead)
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ getInstance
+    @classmethod
+    def getInstance(cls):
+        """ Returns the shared resource cache, creating it on first access. """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+#___________________________________________________________________________________________________ resolve
+    def resolve(self, key, resolver):
+        """ Returns the (path, mimeType) tuple that the key, usually the url, resolves to. On the
+            first lookup of a key the tuple is created by calling resolver and remembered. """
+        if self._enabled:
+            with self._lock:
+                result = self._paths.pop(key, None)
+                if result is not None:
+                    self._paths[key] = result
+                    self._pathHits  += 1
+                    return result
+                self._pathMisses += 1
+
+        result = resolver()
+        if not self._enabled:
+            return result
+
+        with self._lock:
+            self._paths[key] = result
+            while len(self._paths) > self._maxPaths:
+                self._paths.popitem(last=False)
+        return result
+
+#___________________________________________________________________________________________________ read
+    def read(self, path):
+        """ Returns the content of the file at path as bytes, or None if the file does not exist.
+            The content is served from memory unless the file has been modified since it was
+            cached. """
+        try:
+            stat = os.stat(path)
+        except (OSError, IOError):
+            self.invalidate(path)
+            return None
+
+        signature = (stat.st_mtime, stat.st_size)
+        if self._enabled:
+            with self._lock:
+                entry = self._entries.pop(path, None)
+                if entry is not None and entry[0] == signature:
+                    self._entries[path] = entry
+                    self._hits        += 1
+                    self._bytesServed += len(entry[1])
+                    return entry[1]
+
+                if entry is not None:
+                    self._byteSize    -= len(entry[1])
+                    self._invalidated += 1
+                self._misses += 1
+
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+        except (OSError, IOError):
+            return None
+
+        with self._lock:
+            self._bytesRead += len(content)
+            if self._enabled and len(content) <= self._maxFileBytes:
+                # Another caller may have read and cached the file at the same time
+                previous = self._entries.pop(path, None)
+                if previous is not None:
+                    self._byteSize -= len(previous[1])
+
+                self._entries[path] = (signature, content)
+                self._byteSize     += len(content)
+                self._evict()
+        return content
+
+#___________________________________________________________________________________________________ invalidate
+    def invalidate(self, path):
+        """ Removes the cached content of the file at path, if any. """
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if entry is None:
+                return False
+            self._byteSize -= len(entry[1])
+            return True
+
+#___________________________________________________________________________________________________ clear
+    def clear(self):
+        """ Removes all resolved paths and cached content. """
+        with self._lock:
+            self._paths.clear()
+            self._entries.clear()
+            self._byteSize = 0
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _evict
+    def _evict(self):
+        """ Removes the least recently used content until the cache is within its byte limit.
+            Must be called while holding the lock. """
+        while self._entries and self._byteSize > self._maxBytes:
+            path, entry = self._entries.popitem(last=False)
+            self._byteSize  -= len(entry[1])
+            self._evictions += 1
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        return self.__str__()
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return '<%s entries[%s] bytes[%s]>' % (
+            self.__class__.__name__, len(self._entries), self._byteSize)
@@ -8,26 +8,37 @@ import os
 
 from PySide import QtCore
 from PySide import QtNetwork
-from pyaid.dict.DictUtils import DictUtils
 from pyaid.enum.MimeTypeEnum import MIME_TYPES
 from pyaid.file.FileUtils import FileUtils
 from pyaid.string.StringUtils import StringUtils
 
 from pyglass.web.HttpsRemoteExecutionThread import HttpsRemoteExecutionThread
+from pyglass.web.QIODeviceReader import QIODeviceReader
+from pyglass.web.ResourceCache import ResourceCache
 
 #___________________________________________________________________________________________________ ResourceCustomNetworkReply
 class ResourceCustomNetworkReply(QtNetwork.QNetworkReply):
+    """ Serves requests for the custom resource schemes of PyGlassWebView pages from local files
+        and proxies https requests through an HttpsRemoteExecutionThread. Proxied response bodies
+        are streamed into the reply, which emits readyRead as each chunk arrives. """
 
 #===================================================================================================
 #                                                                                       C L A S S
 
+    # Response headers that no longer apply to the decoded body delivered by the reply
+    _SKIPPED_HEADERS = ['content-length', 'connection', 'content-encoding', 'transfer-encoding']
+
 #___________________________________________________________________________________________________ __init__
     def __init__(self, parent, request, operation, data, page):
         QtNetwork.QNetworkReply.__init__(self, parent)
-        mainWindow  = page.mainWindow
         url         = request.url()
         scheme      = url.scheme()
-        self.offset = 0
+
+        self._buffer   = bytearray()
+        self._thread   = None
+        self._received = 0
+        self._total    = -1
+        self._complete = False
 
         self.setRequest(request)
         self.setOperation(operation)
@@ -37,6 +48,88 @@ class ResourceCustomNetworkReply(QtNetwork.QNetworkReply):
             self._buildHttpsReply(parent, request, url, operation, data, page)
             return
 
+        # Page urls resolve relative to the page, other urls resolve the same for every page
+        cache = ResourceCache.getInstance()
+        path, contentType = cache.resolve(
+            (url.toString(), page.webViewUrl.toString() if scheme in ('page', 'http') else None),
+            lambda: self._resolveResource(url, scheme, page))
+
+        self.setHeader(QtNetwork.QNetworkRequest.ContentTypeHeader, contentType + '; charset=UTF8')
+
+        content = cache.read(path)
+        if content is None:
+            print('WARNING: Resource URL does not exist ->', path)
+        else:
+            self._buffer.extend(content)
+
+        self._finalize()
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: isComplete
+    @property
+    def isComplete(self):
+        """ Specifies whether or not the entire body has been received, although it may not have
+            been read yet. """
+        return self._complete
+
+#___________________________________________________________________________________________________ GS: receivedBytes
+    @property
+    def receivedBytes(self):
+        return self._received
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ abort
+    def abort(self, *args, **kwargs):
+        """ Cancels a proxied request that is still being received and finishes the reply with
+            an OperationCanceledError. """
+        if self._complete:
+            return
+
+        if self._thread is not None:
+            self._thread.cancel()
+        self._complete = True
+        self.setError(QtNetwork.QNetworkReply.OperationCanceledError, 'Operation canceled')
+        self.finished.emit()
+
+#___________________________________________________________________________________________________ bytesAvailable
+    def bytesAvailable(self):
+        return len(self._buffer) + QtNetwork.QNetworkReply.bytesAvailable(self)
+
+#___________________________________________________________________________________________________ isSequential
+    def isSequential(self):
+        return True
+
+#___________________________________________________________________________________________________ readData
+    def readData(self, maxSize):
+        """ Returns up to maxSize bytes of the body received so far, or None once the body has
+            been received and read completely. """
+        if not self._buffer:
+            return None if self._complete else b''
+
+        data = bytes(self._buffer[:maxSize])
+        del self._buffer[:maxSize]
+        return data
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _finalize
+    def _finalize(self):
+        self._complete = True
+        self._received = len(self._buffer)
+        self.setHeader(QtNetwork.QNetworkRequest.ContentLengthHeader, len(self._buffer))
+        self.setError(QtNetwork.QNetworkReply.NoError, '')
+        self.open(self.ReadOnly | self.Unbuffered)
+        QtCore.QTimer.singleShot(0, self._handleReadyToRead)
+
+#___________________________________________________________________________________________________ _resolveResource
+    @classmethod
+    def _resolveResource(cls, url, scheme, page):
+        """ Returns the (path, mimeType) tuple of the local file requested by the url. """
         if scheme == 'http':
             host = url.host()
             scheme = host.split('.', 1)[0]
@@ -65,8 +158,6 @@ class ResourceCustomNetworkReply(QtNetwork.QNetworkReply):
         else:
             contentType = MIME_TYPES.HTML
 
-        self.setHeader(QtNetwork.QNetworkRequest.ContentTypeHeader, contentType + '; charset=UTF8')
-
         if scheme == 'page':
             pagePath = page.webViewUrl.host() + '/' + page.webViewUrl.path()
             pagePath = pagePath.split('://', 1)[-1].rsplit(os.sep, 1)[0]
@@ -78,88 +169,89 @@ class ResourceCustomNetworkReply(QtNetwork.QNetworkReply):
         elif scheme == 'sharedweb':
             path = ['shared', 'web'] + path
         elif scheme == 'shared':
-            path = path.insert(0, 'shared')
+            path.insert(0, 'shared')
         elif scheme == 'app':
-            path = mainWindow.getAppResourcePath(*path, isFile=True)
+            path = page.mainWindow.getAppResourcePath(*path, isFile=True)
 
         if isinstance(path, list):
-            path = mainWindow.getRootResourcePath(*path, isFile=True)
-
-        if os.path.exists(path):
-            if contentType in [MIME_TYPES.JPEG_IMAGE, MIME_TYPES.PNG_IMAGE, MIME_TYPES.SWF]:
-                f = open(path, 'rb+')
-            else:
-                f = open(path, 'r+')
-            self.content = f.read()
-            f.close()
-        else:
-            print('WARNING: Resource URL does not exist ->', path)
-            self.content = ''
-
-        self._finalize()
-
-#___________________________________________________________________________________________________ abort
-    def abort(self, *args, **kwargs):
-        pass
-
-#___________________________________________________________________________________________________ bytesAvailable
-    def bytesAvailable(self):
-        return len(self.content) - self.offset + QtNetwork.QNetworkReply.bytesAvailable(self)
-
-#___________________________________________________________________________________________________ isSequential
-    def isSequential(self):
-        return True
-
-#___________________________________________________________________________________________________ readData
-    def readData(self, maxSize):
-        if self.offset < len(self.content):
-            end = min(self.offset + maxSize, len(self.content))
-            data = self.content[self.offset:end]
-            self.offset = end
-            return data
+            path = page.mainWindow.getRootResourcePath(*path, isFile=True)
+        return path, contentType
 
-#===================================================================================================
-#                                                                               P R O T E C T E D
-
-#___________________________________________________________________________________________________ _finalize
-    def _finalize(self):
-        self.setHeader(QtNetwork.QNetworkRequest.ContentLengthHeader, len(self.content))
-        self.setError(QtNetwork.QNetworkReply.NoError, '')
-        self.open(self.ReadOnly | self.Unbuffered)
-        QtCore.QTimer.singleShot(0, self._handleReadyToRead)
-
-#___________________________________________________________________________________________________
+#___________________________________________________________________________________________________ _buildHttpsReply
     def _buildHttpsReply(self, parent, request, url, operation, data, page):
         headers = dict()
         for header in request.rawHeaderList():
             headers[StringUtils.toUnicode(header)] = StringUtils.toUnicode(request.rawHeader(header))
+
+        # The request body is read from the outgoing device in blocks on this thread, which owns
+        # the device, and handed to the request thread as it is sent
         if data:
-            data = data.readAll()
+            data = QIODeviceReader(data)
 
-        thread = HttpsRemoteExecutionThread(
+        self._thread = HttpsRemoteExecutionThread(
             parent=self,
             operation=operation,
             data=data,
             headers=headers,
-            url=url.toString())
-        thread.completeSignal.signal.connect(self._handleHttpsResult)
-        thread.start()
+            url=url.toString(),
+            stream=True)
+        self._thread.execute(
+            callback=self._handleHttpsResult,
+            eventCallback=self._handleHttpsEvent)
+
+#___________________________________________________________________________________________________ _openHttpsReply
+    def _openHttpsReply(self, status, reason, headers):
+        """ Applies the status and headers of the proxied response and opens the reply so that
+            the body can be read as it arrives. """
+        self.setAttribute(QtNetwork.QNetworkRequest.HttpStatusCodeAttribute, status)
+        self.setAttribute(QtNetwork.QNetworkRequest.HttpReasonPhraseAttribute, reason)
+
+        for headerName, headerValue in headers.items():
+            if headerName.lower() in self._SKIPPED_HEADERS:
+                continue
+            self.setRawHeader(headerName, headerValue)
+
+        length = headers.get('content-length')
+        if length and length.isdigit() and not headers.get('content-encoding'):
+            self._total = int(length)
+            self.setHeader(QtNetwork.QNetworkRequest.ContentLengthHeader, self._total)
+
+        self.setError(QtNetwork.QNetworkReply.NoError, '')
+        self.open(self.ReadOnly | self.Unbuffered)
+        self.metaDataChanged.emit()
 
 #===================================================================================================
 #                                                                                 H A N D L E R S
 
+#___________________________________________________________________________________________________ _handleHttpsEvent
+    def _handleHttpsEvent(self, event):
+        if self._complete:
+            return
+
+        if event.id == 'headers':
+            self._openHttpsReply(event['status'], event['reason'], event['headers'])
+        elif event.id == 'chunk':
+            chunk = event['chunk']
+            self._buffer.extend(chunk)
+            self._received += len(chunk)
+            self.downloadProgress.emit(self._received, self._total)
+            self.readyRead.emit()
+
 #___________________________________________________________________________________________________ _handleHttpsResult
     def _handleHttpsResult(self, threadResult):
-        result = threadResult['output']
+        self._thread = None
+        if self._complete:
+            return
 
-        self.content = result.content
-        for headerName, headerValue in DictUtils.iter(result.headers):
-            if headerName in ['content-length', 'connection', 'content-encoding']:
-                continue
-            self.setRawHeader(headerName, headerValue)
+        self._complete = True
+        if threadResult['output'] is None or not threadResult.success:
+            if not self.isOpen():
+                self.open(self.ReadOnly | self.Unbuffered)
+            self.setError(
+                QtNetwork.QNetworkReply.UnknownNetworkError,
+                StringUtils.toUnicode(threadResult['error'] or 'Proxied request failed'))
 
-        self._finalize()
-        return
+        self.finished.emit()
 
 #___________________________________________________________________________________________________ _handleReadyToRead
     def _handleReadyToRead(self):
@@ -0,0 +1,544 @@
+# AsyncRequestBackend.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import ssl
+import time
+import functools
+import threading
+
+import requests
+from requests import exceptions
+from requests.structures import CaseInsensitiveDict
+
+from pyglass.app.PyGlassEnvironment import PyGlassEnvironment
+from pyglass.threading.AsyncRemoteExecution import AsyncRemoteExecution
+from pyglass.threading.RemoteExecutionFuture import RemoteExecutionFuture
+from pyglass.threading.RemoteTaskCancelledError import RemoteTaskCancelledError
+from pyglass.threading.RemoteTaskStatusEnum import RemoteTaskStatusEnum
+from pyglass.web.request.RequestCircuitBreaker import RequestCircuitBreaker
+from pyglass.web.request.RequestCoalescer import RequestCoalescer
+from pyglass.web.request.RequestRateLimiter import RequestRateLimiter
+from pyglass.web.request.RequestResponseCache import RequestResponseCache
+from pyglass.web.request.RequestRetryPolicy import RequestRetryPolicy
+from pyglass.web.request.RequestSessionPool import RequestSessionPool
+from pyglass.web.request.RequestUtils import RequestUtils
+from pyglass.web.request.RequestWatchdog import RequestWatchdog
+
+try:
+    import asyncio
+except Exception as err:
+    asyncio = None
+
+try:
+    import aiohttp
+except Exception as err:
+    aiohttp = None
+
+#___________________________________________________________________________________________________ AsyncRequestBackend
+class AsyncRequestBackend(object):
+    """ Executes requests with a non-blocking aiohttp client on the single event loop thread of
+        the shared AsyncRemoteExecution, so that any number of requests can be in flight without
+        a thread for each of them. Requests are chained through callbacks on the loop thread and
+        their results are delivered to the GUI thread through RemoteExecutionFutures.
+
+        Results are the same requests.Response objects, or REQUEST_FAILURE_NT errors, returned by
+        RequestUtils.executeRequest. The RequestResponseCache, RequestRetryPolicy and
+        RequestCircuitBreaker apply as they do there. Fresh cached responses are served without a
+        network request. Stale responses are fetched again, unless allowStale is specified, in
+        which case they are served and revalidated in the background as by
+        RequestUtils.executeRequest. The cache is read and written on the executor threads of the
+        loop, as it may access the disk, so neither the calling thread nor the loop is blocked.
+        Identical GET requests in flight at the same time, with the same options, share a single
+        network request as they do with the RequestCoalescer, and the RequestRateLimiter delays
+        requests with timers on the loop instead of blocking it. Requires asyncio and the
+        optional aiohttp library. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    # The maximum number of simultaneous connections of the client session
+    DEFAULT_MAX_CONNECTIONS = 100
+
+    _instance = None
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, maxConnections =None, maxHostConnections =None):
+        """Creates a new instance of AsyncRequestBackend."""
+        self._lock        = threading.Lock()
+        self._session     = None
+        self._sessionLoop = None
+        self._inFlight    = dict()
+        self._activeCount = 0
+        self._count       = 0
+        self._failedCount = 0
+
+        self._maxConnections     = maxConnections if maxConnections else \
+            self.DEFAULT_MAX_CONNECTIONS
+        self._maxHostConnections = maxHostConnections if maxHostConnections else \
+            RequestSessionPool.getInstance().poolMaxSize
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: executor
+    @property
+    def executor(self):
+        """ The AsyncRemoteExecution whose loop thread executes the requests. """
+        return AsyncRemoteExecution.getInstance()
+
+#___________________________________________________________________________________________________ GS: maxConnections
+    @property
+    def maxConnections(self):
+        return self._maxConnections
+
+#___________________________________________________________________________________________________ GS: maxHostConnections
+    @property
+    def maxHostConnections(self):
+        return self._maxHostConnections
+
+#___________________________________________________________________________________________________ GS: activeCount
+    @property
+    def activeCount(self):
+        """ The number of requests that have been sent and not yet completed. """
+        return self._activeCount
+
+#___________________________________________________________________________________________________ GS: stats
+    @property
+    def stats(self):
+        with self._lock:
+            return dict(
+                active=self._activeCount,
+                requests=self._count,
+                failed=self._failedCount)
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ isAvailable
+    @classmethod
+    def isAvailable(cls):
+        """ Specifies whether or not asyncio and aiohttp are available. """
+        return aiohttp is not None and AsyncRemoteExecution.isAvailable()
+
+#___________________________________________________________________________________________________ getInstance
+    @classmethod
+    def getInstance(cls):
+        """ Returns the shared backend, creating it on first access. """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+#___________________________________________________________________________________________________ shutdownInstance
+    @classmethod
+    def shutdownInstance(cls, timeout =None):
+        """ Closes the client session of the shared backend, if it has been created. Must be called
+            before the AsyncRemoteExecution is shut down. """
+        if cls._instance is None:
+            return False
+        return cls._instance.close(timeout=timeout)
+
+#___________________________________________________________________________________________________ send
+    def send(
+            self, url, args =None, parent =None, cache =True, allowStale =False, retryPolicy =None,
+            requestStats =None, timeout =None, deadline =None, logger =None
+    ):
+        """ Sends a GET request, or a POST request of the args if specified, and returns a
+            RemoteExecutionFuture owned by the calling thread that succeeds with the result of the
+            request. Requests never fail the future. Failures are reported as REQUEST_FAILURE_NT
+            outputs, as they are by RequestUtils.executeRequest, including the TIMEOUT failures of
+            requests that exceed their timeout or deadline, which are specified and default as
+            they do for RequestUtils.executeRequest.
+
+            @@@param allowStale:bool
+                When True, a stale cached response is returned without waiting for the network
+                and revalidated in the background, as by RequestUtils.executeRequest.
+
+            @@@param logger:Logger
+                When specified, failures are written to it as by RequestUtils.executeRequest.
+
+            @@@param requestStats:dict
+                When specified, updated as by RequestUtils.executeRequest before the future
+                resolves.
+        """
+        deadline = RequestUtils.DEFAULT_DEADLINE if deadline is None else deadline
+        future   = RemoteExecutionFuture(parent=parent)
+        stats    = requestStats if requestStats is not None else dict()
+        stats.update(queueTime=0.0, coalesced=False, attempts=0, start=time.time())
+        cache    = cache and args is None
+        policy   = retryPolicy if retryPolicy else RequestRetryPolicy.getInstance()
+        timeouts = RequestUtils.getTimeouts(timeout)
+
+        # Waiters are the (future, stats, expires) of each request sharing the network request
+        self._start(dict(
+            url=url,
+            args=args,
+            method='GET' if args is None else 'POST',
+            key=RequestCoalescer.createKey(
+                url, options=(cache, allowStale, retryPolicy, timeouts, deadline)),
+            cache=cache,
+            allowStale=allowStale,
+            policy=policy,
+            attempt=0,
+            trial=False,
+            failed=False,
+            timeouts=timeouts,
+            expires=stats['start'] + deadline,
+            waiters=[(future, stats, stats['start'] + deadline)],
+            requestData={
+                'url':url, 'args':args, 'logger':logger, 'attempts':0, 'deadline':deadline}))
+        return future
+
+#___________________________________________________________________________________________________ close
+    def close(self, timeout =None):
+        """ Closes the client session and its connections. A new session is created by the next
+            request. """
+        session = self._session
+        self._session     = None
+        self._sessionLoop = None
+        if session is None or not self.executor.isRunning:
+            return False
+
+        try:
+            self.executor.runCoroutine(session.close()).result(timeout)
+        except Exception:
+            return False
+        return True
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _getSession
+    def _getSession(self):
+        """ Returns the client session, creating it if necessary. Must be called on the loop
+            thread. """
+        loop = asyncio.get_event_loop()
+        if self._session is None or self._sessionLoop is not loop:
+            context = ssl.create_default_context(cafile=PyGlassEnvironment.requestsCABundle)
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(
+                limit=self._maxConnections,
+                limit_per_host=self._maxHostConnections,
+                ssl=context))
+            self._sessionLoop = loop
+        return self._session
+
+#___________________________________________________________________________________________________ _start
+    def _start(self, state):
+        """ Sends the request of the state unless it is served from the cache, which is looked up
+            on an executor thread of the loop, or an identical request is already in flight, in
+            which case it waits for and shares that request's result until its own deadline. """
+        loop = self.executor.start()
+        if state['cache']:
+            loop.call_soon_threadsafe(self._lookupCache, state)
+            return
+        self._startRequest(state)
+
+#___________________________________________________________________________________________________ _lookupCache
+    def _lookupCache(self, state):
+        """ Looks up the cached response of the request on an executor thread. Called on the loop
+            thread. """
+        lookup = asyncio.get_event_loop().run_in_executor(None, functools.partial(
+            RequestResponseCache.getInstance().getFresh,
+            state['url'], allowStale=state['allowStale']))
+        lookup.add_done_callback(lambda t: self._handleCacheLookup(state, t))
+
+#___________________________________________________________________________________________________ _startRequest
+    def _startRequest(self, state):
+        """ Sends the request of the state, or adds it to the waiters of an identical request
+            that is already in flight. """
+        waiter = state['waiters'][0]
+        loop   = self.executor.start()
+        with self._lock:
+            if state['args'] is None:
+                inFlight = self._inFlight.get(state['key'])
+                if inFlight is not None:
+                    waiter[1]['coalesced'] = True
+                    inFlight['waiters'].append(waiter)
+                    loop.call_soon_threadsafe(
+                        loop.call_later, max(0.0, waiter[2] - time.time()),
+                        self._handleWaiterExpired, inFlight, waiter)
+                    return
+                self._inFlight[state['key']] = state
+
+            self._activeCount += 1
+            self._count       += 1
+
+        loop.call_soon_threadsafe(self._sendAttempt, state)
+
+#___________________________________________________________________________________________________ _sendAttempt
+    def _sendAttempt(self, state):
+        """ Starts an attempt of the request. Called on the loop thread. """
+        breaker     = RequestCircuitBreaker.getInstance()
+        host        = breaker.getHost(state['url'])
+        requestData = state['requestData']
+
+        allowed = breaker.allowRequest(host)
+        if not allowed:
+            requestData['circuitState'] = breaker.getState(host)
+            requestData['retryTime']    = breaker.getRetryTime(host)
+            self._complete(state, RequestUtils._createError(
+                ident=RequestUtils.CIRCUIT_OPEN,
+                error=None,
+                response=None,
+                requestData=requestData,
+                message='Requests to %s are suspended for %.1f seconds after repeated '
+                        'failures.' % (host, requestData['retryTime'])))
+            return
+        state['trial'] = allowed == RequestCircuitBreaker.HALF_OPEN
+
+        if time.time() >= state['expires']:
+            self._endBreakerRequest(state)
+            self._completeFailure(state, exceptions.Timeout(
+                'Deadline of %s seconds exceeded' % requestData['deadline']))
+            return
+
+        delay = RequestRateLimiter.getInstance().reserve(host)
+        if delay > 0:
+            state['waiters'][0][1]['queueTime'] += delay
+            asyncio.get_event_loop().call_later(delay, self._sendReservedAttempt, state)
+            return
+        self._sendReservedAttempt(state)
+
+#___________________________________________________________________________________________________ _sendReservedAttempt
+    def _sendReservedAttempt(self, state):
+        """ Sends an attempt once its rate limiter token is available. Called on the loop
+            thread. """
+        requestData = state['requestData']
+
+        # The deadline may have passed while waiting for the rate limiter, in which case the
+        # attempt is not sent, as aiohttp would treat a total timeout of 0 as no timeout at all
+        remaining = state['expires'] - time.time()
+        if remaining <= 0:
+            self._endBreakerRequest(state)
+            self._completeFailure(state, exceptions.Timeout(
+                'Deadline of %s seconds exceeded' % requestData['deadline']))
+            return
+
+        requestData['attempts'] = state['attempt'] + 1
+
+        # The timeouts of the attempt are capped by what remains of the deadline
+        connectTimeout, readTimeout = state['timeouts']
+        try:
+            task = asyncio.ensure_future(self._getSession().request(
+                state['method'], state['url'], data=state['args'],
+                timeout=aiohttp.ClientTimeout(
+                    total=remaining,
+                    sock_connect=min(connectTimeout, remaining),
+                    sock_read=min(readTimeout, remaining))))
+        except Exception as err:
+            self._handleAttemptEnd(state, None, err)
+            return
+        task.add_done_callback(lambda t: self._handleResponse(state, t))
+
+#___________________________________________________________________________________________________ _handleAttemptEnd
+    def _handleAttemptEnd(self, state, response, error):
+        """ Records the outcome of an attempt and either schedules a retry or completes the
+            request. Called on the loop thread. """
+        error   = self._convertError(error)
+        breaker = RequestCircuitBreaker.getInstance()
+        host    = breaker.getHost(state['url'])
+
+        if isinstance(error, exceptions.ConnectTimeout):
+            RequestWatchdog.getInstance().recordTimeout(state['url'], RequestWatchdog.CONNECT)
+        elif isinstance(error, exceptions.ReadTimeout):
+            RequestWatchdog.getInstance().recordTimeout(state['url'], RequestWatchdog.READ)
+
+        if isinstance(error, RequestUtils._FINAL_ERRORS):
+            state['failed'] = False
+            self._endBreakerRequest(state)
+            self._completeFailure(state, error)
+            return
+
+        state['failed'] = error is not None or response.status_code >= 500
+        if not state['failed']:
+            breaker.recordSuccess(host)
+            state['trial'] = False
+
+        policy  = state['policy']
+        attempt = state['attempt']
+        delay   = policy.getDelay(attempt, response)
+        if not isinstance(error, exceptions.SSLError) and policy.isRetryable(
+            state['method'], attempt, response=response, error=error
+        ) and time.time() + delay < state['expires']:
+            # The failure of a retried attempt is not recorded, so a trial is handed back while
+            # waiting and the retry becomes a new trial if the circuit is still half open
+            if state['trial']:
+                breaker.releaseTrial(host)
+                state['trial'] = False
+            state['attempt'] += 1
+            asyncio.get_event_loop().call_later(delay, self._sendAttempt, state)
+            return
+
+        self._endBreakerRequest(state)
+
+        if error is not None:
+            self._completeFailure(state, error)
+            return
+
+        if state['cache']:
+            asyncio.get_event_loop().run_in_executor(None, functools.partial(
+                RequestResponseCache.getInstance().storeResponse, response, url=state['url']))
+        self._complete(state, response)
+
+#___________________________________________________________________________________________________ _endBreakerRequest
+    def _endBreakerRequest(self, state):
+        """ Records the failure of the request with the circuit breaker if its last attempt
+            failed, which counts a request once however many attempts it made, or otherwise
+            releases the half open trial it holds. """
+        breaker = RequestCircuitBreaker.getInstance()
+        host    = breaker.getHost(state['url'])
+        if state['failed']:
+            breaker.recordFailure(host)
+        elif state['trial']:
+            breaker.releaseTrial(host)
+        state['failed'] = False
+        state['trial']  = False
+
+#___________________________________________________________________________________________________ _complete
+    def _complete(self, state, result):
+        """ Resolves every request waiting on the state with the result, except that requests
+            sharing a cancelled request are sent again. """
+        with self._lock:
+            if self._inFlight.get(state['key']) is state:
+                del self._inFlight[state['key']]
+            self._activeCount -= 1
+            if isinstance(result, RequestUtils.REQUEST_FAILURE_NT):
+                self._failedCount += 1
+            waiters = list(state['waiters'])
+            state['waiters'] = []
+
+        cancelled = isinstance(result, RequestUtils.REQUEST_FAILURE_NT) and \
+            result.ident == RequestUtils.CANCELLED
+        for index, waiter in enumerate(waiters):
+            future, stats, expires = waiter
+            if cancelled and index > 0:
+                stats['coalesced'] = False
+                self._start(dict(
+                    state,
+                    attempt=0,
+                    trial=False,
+                    failed=False,
+                    expires=expires,
+                    waiters=[waiter],
+                    requestData=dict(
+                        state['requestData'], attempts=0, deadline=expires - stats['start'])))
+                continue
+
+            stats['attempts'] = state['requestData']['attempts']
+            self._resolve(future, stats, result)
+
+#___________________________________________________________________________________________________ _completeFailure
+    def _completeFailure(self, state, error):
+        """ Completes the request with the failure for the error of its final attempt. """
+        if isinstance(error, exceptions.Timeout) and time.time() >= state['expires']:
+            RequestWatchdog.getInstance().recordTimeout(state['url'], RequestWatchdog.DEADLINE)
+        self._complete(state, RequestUtils._createFailure(error, state['requestData']))
+
+#___________________________________________________________________________________________________ _resolve
+    @classmethod
+    def _resolve(cls, future, stats, result):
+        stats['elapsed'] = time.time() - stats.pop('start')
+        future._resolve(output=result, status=RemoteTaskStatusEnum.SUCCESS)
+
+#___________________________________________________________________________________________________ _createResponse
+    @classmethod
+    def _createResponse(cls, clientResponse, content):
+        """ Creates a requests.Response from the aiohttp response and its content. """
+        response = requests.Response()
+        response.url         = str(clientResponse.url)
+        response.status_code = clientResponse.status
+        response.reason      = clientResponse.reason
+        response.headers     = CaseInsensitiveDict(clientResponse.headers)
+        response._content    = content
+        response.encoding    = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+
+#___________________________________________________________________________________________________ _convertError
+    @classmethod
+    def _convertError(cls, error):
+        """ Converts aiohttp and asyncio errors to the requests exceptions that RequestUtils
+            reports, so that failures are identified in the same way by either backend. """
+        if error is None or aiohttp is None:
+            return error
+
+        if isinstance(error, aiohttp.ClientSSLError):
+            return exceptions.SSLError(error)
+        if isinstance(error, getattr(aiohttp, 'ConnectionTimeoutError', ())):
+            return exceptions.ConnectTimeout(error)
+        if isinstance(error, asyncio.TimeoutError):
+            # Includes the read timeouts of aiohttp, which raises ServerTimeoutError
+            return exceptions.ReadTimeout(error)
+        if isinstance(error, aiohttp.ClientConnectionError):
+            return exceptions.ConnectionError(error)
+        return error
+
+#===================================================================================================
+#                                                                                 H A N D L E R S
+
+#___________________________________________________________________________________________________ _handleCacheLookup
+    def _handleCacheLookup(self, state, task):
+        response = None if task.cancelled() or task.exception() is not None else task.result()
+        if response is None:
+            self._startRequest(state)
+            return
+
+        waiter = state['waiters'][0]
+        self._resolve(waiter[0], waiter[1], response)
+
+#___________________________________________________________________________________________________ _handleWaiterExpired
+    def _handleWaiterExpired(self, state, waiter):
+        """ Completes a request sharing the request of the state with a TIMEOUT failure once its
+            own deadline has passed, if it is still waiting. Called on the loop thread. """
+        with self._lock:
+            if waiter not in state['waiters']:
+                return
+            state['waiters'].remove(waiter)
+
+        future, stats, expires = waiter
+        deadline = expires - stats['start']
+        RequestWatchdog.getInstance().recordTimeout(state['url'], RequestWatchdog.DEADLINE)
+        self._resolve(future, stats, RequestUtils._createFailure(
+            exceptions.Timeout('Deadline of %s seconds exceeded' % deadline),
+            dict(state['requestData'], attempts=0, deadline=deadline)))
+
+#___________________________________________________________________________________________________ _handleResponse
+    def _handleResponse(self, state, task):
+        if task.cancelled():
+            self._handleAttemptEnd(state, None, RemoteTaskCancelledError('Request was cancelled'))
+            return
+
+        error = task.exception()
+        if error is not None:
+            self._handleAttemptEnd(state, None, error)
+            return
+
+        clientResponse = task.result()
+        read = asyncio.ensure_future(clientResponse.read())
+        read.add_done_callback(lambda t: self._handleContent(state, clientResponse, t))
+
+#___________________________________________________________________________________________________ _handleContent
+    def _handleContent(self, state, clientResponse, task):
+        clientResponse.release()
+        if task.cancelled():
+            self._handleAttemptEnd(state, None, RemoteTaskCancelledError('Request was cancelled'))
+            return
+
+        error = task.exception()
+        if error is not None:
+            self._handleAttemptEnd(state, None, error)
+            return
+
+        self._handleAttemptEnd(state, self._createResponse(clientResponse, task.result()), None)
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        return self.__str__()
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return '<%s active[%s]>' % (self.__class__.__name__, self._activeCount)
@@ -4,6 +4,8 @@
 
 from __future__ import print_function, absolute_import, unicode_literals, division
 
+import time
+
 from PySide import QtCore
 
 from pyaid.ArgsUtils import ArgsUtils
@@ -11,8 +13,12 @@ from pyaid.debug.Logger import Logger
 from pyaid.decorators.ClassInstanceMethod import ClassInstanceMethod
 from pyaid.string.StringUtils import StringUtils
 
+from pyglass.data.JSONCodec import JSONCodec
+from pyglass.web.request.AsyncRequestBackend import AsyncRequestBackend
+from pyglass.web.request.RequestBatchThread import RequestBatchThread
 from pyglass.web.request.RequestThread import RequestThread
 from pyglass.web.request.RequestUtils import RequestUtils
+from pyglass.web.request.RequestWatchdog import RequestWatchdog
 
 #___________________________________________________________________________________________________ Request
 class Request(QtCore.QObject):
@@ -21,13 +27,35 @@ class Request(QtCore.QObject):
 #===================================================================================================
 #                                                                                       C L A S S
 
+    # When True, asynchronous requests are executed by the AsyncRequestBackend on a single event
+    # loop thread instead of a RequestThread each, if aiohttp is available. Streamed requests
+    # always use a RequestThread.
+    USE_EVENT_LOOP = False
+
     _activeRequests = []
 
 #___________________________________________________________________________________________________ __init__
     def __init__(self, parent, url, args =None, **kwargs):
         """Creates a new instance of Request."""
-        self._localData = ArgsUtils.extract('localData', None, kwargs)
-        self._dead      = ArgsUtils.extract('dead', False, kwargs)
+        self._localData   = ArgsUtils.extract('localData', None, kwargs)
+        self._dead        = ArgsUtils.extract('dead', False, kwargs)
+        self._cache       = ArgsUtils.extract('cache', True, kwargs)
+        self._allowStale  = ArgsUtils.extract('allowStale', False, kwargs)
+        self._retryPolicy = ArgsUtils.extract('retryPolicy', None, kwargs)
+
+        # Timeouts are a number or (connect, read) tuple, the deadline covers the whole request
+        self._timeout  = ArgsUtils.extract('timeout', None, kwargs)
+        self._deadline = ArgsUtils.extract('deadline', None, kwargs)
+
+        # Streamed requests write the response body to the download path instead of memory
+        self._stream           = ArgsUtils.extract('stream', False, kwargs)
+        self._downloadPath     = ArgsUtils.extract('downloadPath', None, kwargs)
+        self._hashAlgorithm    = ArgsUtils.extract('hashAlgorithm', None, kwargs)
+        self._expectedHash     = ArgsUtils.extract('expectedHash', None, kwargs)
+        self._progressCallback = ArgsUtils.extract('progressCallback', None, kwargs)
+        if self._stream and not self._downloadPath:
+            raise ValueError('Streamed requests require a downloadPath')
+
         super(Request, self).__init__(parent, **kwargs)
         self._url       = url
         self._owner     = parent
@@ -38,6 +66,10 @@ class Request(QtCore.QObject):
         self._result    = None
         self._sent      = False
         self._async     = False
+        self._elapsed   = None
+        self._sendTime  = None
+        self._stats     = dict()
+        self._jsonCache = None
 
 #===================================================================================================
 #                                                                                   G E T / S E T
@@ -84,13 +116,73 @@ class Request(QtCore.QObject):
         """The raw content returned by the requests."""
         return self._result.content if self._result else None
 
+#___________________________________________________________________________________________________ GS: fromCache
+    @property
+    def fromCache(self):
+        """ Specifies whether or not the response was served by the RequestResponseCache without
+            a network request. """
+        return bool(getattr(self._result, 'fromCache', False))
+
+#___________________________________________________________________________________________________ GS: elapsed
+    @property
+    def elapsed(self):
+        """ The number of seconds taken to execute the request, or None if it has not been
+            executed synchronously or as part of a batch. """
+        return self._elapsed
+
+#___________________________________________________________________________________________________ GS: queueTime
+    @property
+    def queueTime(self):
+        """ The number of seconds the request was queued by the RequestRateLimiter before it was
+            sent, or None if it has not completed. """
+        return self._stats.get('queueTime')
+
+#___________________________________________________________________________________________________ GS: isCoalesced
+    @property
+    def isCoalesced(self):
+        """ Specifies whether or not the result was shared from an identical GET request that
+            was already in flight instead of being requested separately. """
+        return bool(self._stats.get('coalesced'))
+
+#___________________________________________________________________________________________________ GS: isStreamed
+    @property
+    def isStreamed(self):
+        """ Specifies whether or not the response body is streamed to the download path. The
+            content of streamed requests is not held in memory and is always None. """
+        return self._stream
+
+#___________________________________________________________________________________________________ GS: downloadPath
+    @property
+    def downloadPath(self):
+        return self._downloadPath
+
+#___________________________________________________________________________________________________ GS: digest
+    @property
+    def digest(self):
+        """ The hex digest of the streamed content if a hash algorithm or expected hash was
+            specified. """
+        return getattr(self._result, 'digest', None)
+
 #___________________________________________________________________________________________________ GS: json
     @property
     def json(self):
+        """ The parsed JSON body of the response, or None if it is not valid JSON. The body is
+            parsed once with the JSONCodec and the result is cached until the response changes,
+            so the returned value is shared by every access. """
+        if self._jsonCache is not None and self._jsonCache[0] is self._result:
+            return self._jsonCache[1]
+
         try:
-            return self._result.json()
-        except Exception as err:
-            return None
+            value = JSONCodec.fromString(self._result.content)
+        except Exception:
+            try:
+                # Falls back to requests for bodies in encodings other than UTF-8
+                value = self._result.json()
+            except Exception:
+                value = None
+
+        self._jsonCache = (self._result, value)
+        return value
 
 #___________________________________________________________________________________________________ GS: error
     @property
@@ -114,6 +206,34 @@ class Request(QtCore.QObject):
             RequestUtils.CONNECTION_FAILURE, RequestUtils.ATTEMPT_FAILURE
         ]
 
+#___________________________________________________________________________________________________ GS: isCircuitOpen
+    @property
+    def isCircuitOpen(self):
+        """ Specifies whether or not the request was rejected without being sent because the
+            circuit breaker for its host is open. """
+        return isinstance(self._result, RequestUtils.REQUEST_FAILURE_NT) and \
+            self._result.ident == RequestUtils.CIRCUIT_OPEN
+
+#___________________________________________________________________________________________________ GS: startTime
+    @property
+    def startTime(self):
+        """ The time at which the asynchronous request began executing, which is when its thread
+            started running rather than when it was queued, or None if it has not started. The
+            RequestWatchdog measures its deadline from this time. """
+        request = self._request
+        if isinstance(request, RequestThread):
+            record = request.taskRecord
+            return record.startTime if record is not None else self._sendTime
+        return self._sendTime
+
+#___________________________________________________________________________________________________ GS: isTimeout
+    @property
+    def isTimeout(self):
+        """ Specifies whether or not the request failed because the server did not respond
+            within its timeouts or the request was not complete by its deadline. """
+        return isinstance(self._result, RequestUtils.REQUEST_FAILURE_NT) and \
+            self._result.ident == RequestUtils.TIMEOUT
+
 #___________________________________________________________________________________________________ GS: isInvalidResponse
     @property
     def isInvalidResponse(self):
@@ -148,6 +268,63 @@ class Request(QtCore.QObject):
             return self._sendRequest(callback=callback, **kwargs)
         return cls._createAndSend(callback=callback, **kwargs)
 
+#___________________________________________________________________________________________________ sendBatch
+    @classmethod
+    def sendBatch(
+            cls, requests, maxConcurrency =None, callback =None, itemCallback =None, parent =None
+    ):
+        """ Sends the unsent requests concurrently through a single RequestBatchThread instead of
+            one thread per request and returns the batch. Requests that have already been sent,
+            or are dead, are skipped. The requests of the batch keep their input order.
+
+            @@@param maxConcurrency:int
+                The maximum number of requests in flight at once.
+
+            @@@param callback:function
+                Called once with the RequestBatchThread after every request has completed, from
+                which the requests, wallTime and summed requestTime can be read. When omitted the
+                batch is executed synchronously on the calling thread.
+
+            @@@param itemCallback:function
+                Called with each request once it completes. For asynchronous batches this is
+                called on the GUI thread as requests complete. Otherwise it is called for each
+                request, in order, after the batch completes.
+        """
+        requests = [r for r in requests if not (r._sent or r._dead)]
+        if parent is None and requests:
+            parent = requests[0]._owner
+
+        for request in requests:
+            request._sent  = True
+            request._async = callback is not None
+
+        batch = RequestBatchThread(parent, requests, maxConcurrency=maxConcurrency)
+        if callback is None:
+            batch.runBatch()
+            if itemCallback is not None:
+                for request in requests:
+                    itemCallback(request)
+            return batch
+
+        Request._activeRequests.extend(requests)
+
+        def onItem(event):
+            request = event['request']
+            if request in Request._activeRequests:
+                Request._activeRequests.remove(request)
+            if itemCallback is not None:
+                itemCallback(request)
+
+        def onComplete(event):
+            for request in requests:
+                if request in Request._activeRequests:
+                    Request._activeRequests.remove(request)
+            callback(batch)
+
+        batch.itemSignal.connect(onItem)
+        batch.execute(callback=onComplete)
+        return batch
+
 #===================================================================================================
 #                                                                               P R O T E C T E D
 
@@ -160,12 +337,44 @@ class Request(QtCore.QObject):
         if callback:
             return self._sendAsync(callback)
 
-        self._result = RequestUtils.executeRequest(url=self._url, args=self._args, logger=self._log)
+        self._result = self._execute(progressCallback=self._progressCallback)
         if self._callback is not None:
             self._callback(self)
         self._callback = None
         return self
 
+#___________________________________________________________________________________________________ _execute
+    def _execute(self, progressCallback =None):
+        """ Executes the request on the calling thread and returns its result, recording the
+            time it took in the elapsed property. """
+        start = time.time()
+        try:
+            if self._stream:
+                return RequestUtils.executeDownload(
+                    url=self._url,
+                    path=self._downloadPath,
+                    logger=self._log,
+                    hashAlgorithm=self._hashAlgorithm,
+                    expectedHash=self._expectedHash,
+                    progressCallback=progressCallback,
+                    retryPolicy=self._retryPolicy,
+                    requestStats=self._stats,
+                    timeout=self._timeout,
+                    deadline=self._deadline)
+
+            return RequestUtils.executeRequest(
+                url=self._url,
+                args=self._args,
+                logger=self._log,
+                cache=self._cache,
+                allowStale=self._allowStale,
+                retryPolicy=self._retryPolicy,
+                requestStats=self._stats,
+                timeout=self._timeout,
+                deadline=self._deadline)
+        finally:
+            self._elapsed = time.time() - start
+
 #___________________________________________________________________________________________________ _createAndSend
     @classmethod
     def _createAndSend(cls, parent, url, callback =None, args =None, **kwargs):
@@ -180,13 +389,48 @@ class Request(QtCore.QObject):
         """Doc..."""
         self._async    = True
         self._callback = callback
+        self._sendTime = time.time()
         Request._activeRequests.append(self)
 
-        thread = RequestThread(self._owner, url=self._url, args=self._args)
+        # Streamed downloads have no deadline unless one is specified
+        deadline = self._deadline
+        if deadline is None and not self._stream:
+            deadline = RequestUtils.DEFAULT_DEADLINE
+        if deadline is not None:
+            RequestWatchdog.getInstance().watch(self, deadline)
+
+        if self.USE_EVENT_LOOP and not self._stream and AsyncRequestBackend.isAvailable():
+            future = AsyncRequestBackend.getInstance().send(
+                url=self._url,
+                args=self._args,
+                cache=self._cache,
+                allowStale=self._allowStale,
+                retryPolicy=self._retryPolicy,
+                requestStats=self._stats,
+                timeout=self._timeout,
+                deadline=deadline,
+                logger=self._log)
+            self._request = future
+            future.addDoneCallback(self._handleBackendComplete)
+            return self
+
+        thread = RequestThread(
+            self._owner,
+            url=self._url,
+            args=self._args,
+            cache=self._cache,
+            allowStale=self._allowStale,
+            retryPolicy=self._retryPolicy,
+            downloadPath=self._downloadPath if self._stream else None,
+            hashAlgorithm=self._hashAlgorithm,
+            expectedHash=self._expectedHash,
+            timeout=self._timeout,
+            deadline=self._deadline)
         self._request = thread
-        thread.logSignal.signal.connect(self._handleUpdateResults)
-        thread.completeSignal.signal.connect(self._handleRemoteThreadComplete)
-        thread.start()
+        thread.execute(
+            callback=self._handleRemoteThreadComplete,
+            logCallback=self._handleUpdateResults,
+            progressCallback=self._progressCallback)
 
         return self
 
@@ -199,7 +443,45 @@ class Request(QtCore.QObject):
 
 #___________________________________________________________________________________________________ _handleRemoteThreadComplete
     def _handleRemoteThreadComplete(self, value):
-        self._result  = value['output']
+        if value['thread'] is not self._request:
+            # Completed after the request was released by the watchdog
+            return
+
+        self._stats   = value['thread'].requestStats
+        self._elapsed = self._stats.get('elapsed')
+        self._handleResult(value['output'])
+
+#___________________________________________________________________________________________________ _handleBackendComplete
+    def _handleBackendComplete(self, future):
+        if future is not self._request:
+            return
+        self._handleResult(future.output)
+
+#___________________________________________________________________________________________________ _handleDeadlineExceeded
+    def _handleDeadlineExceeded(self):
+        """ Called by the RequestWatchdog when the request is still outstanding past its
+            deadline. Cancels the thread or future executing it and completes the request with a
+            TIMEOUT error. """
+        request = self._request
+        if request is None:
+            return
+
+        # The request is completed before it is cancelled, because cancelling can complete the
+        # thread or future synchronously, whose result is then ignored as it is no longer the
+        # active request
+        self._handleResult(RequestUtils._createError(
+            ident=RequestUtils.TIMEOUT,
+            error=None,
+            response=None,
+            requestData={
+                'url':self._url, 'args':self._args, 'logger':self._log, 'released':True},
+            message='The request was released after it did not complete by its deadline.'))
+        request.cancel()
+
+#___________________________________________________________________________________________________ _handleResult
+    def _handleResult(self, result):
+        RequestWatchdog.getInstance().unwatch(self)
+        self._result  = result
         self._request = None
         if self._callback is not None:
             self._callback(self)
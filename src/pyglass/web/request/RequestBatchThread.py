@@ -0,0 +1,181 @@
+# RequestBatchThread.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import time
+import threading
+
+from PySide import QtCore
+
+from pyaid.ArgsUtils import ArgsUtils
+
+from pyglass.threading.CancellationToken import CancellationToken
+from pyglass.threading.RemoteExecutionThread import RemoteExecutionThread
+from pyglass.web.request.RequestSessionPool import RequestSessionPool
+
+#___________________________________________________________________________________________________ RequestBatchThread
+class RequestBatchThread(RemoteExecutionThread):
+    """ Executes a list of Request objects concurrently, with at most maxConcurrency requests in
+        flight, over the pooled HTTP sessions. Each request is delivered through the itemSignal
+        once it completes, and the thread completes once every request has completed. Results
+        remain in the order of the input list regardless of the order in which they complete.
+
+        The wallTime of the batch can be compared with its requestTime, the summed time of the
+        individual requests, to see how much the concurrency saved. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    itemSignal = QtCore.Signal(object)
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, parent, requests, **kwargs):
+        """ Creates a new instance of RequestBatchThread.
+
+            @@@param requests:list
+                The unsent Request objects to execute.
+
+            @@@param maxConcurrency:int
+                The maximum number of requests executed at once. Defaults to the maximum number of
+                kept-alive connections per host of the RequestSessionPool so that every request
+                can reuse a pooled connection.
+        """
+        self._maxConcurrency = ArgsUtils.extract('maxConcurrency', None, kwargs)
+        RemoteExecutionThread.__init__(self, parent, **kwargs)
+        self._requests       = list(requests)
+        self._lock           = threading.Lock()
+        self._nextIndex      = 0
+        self._completedCount = 0
+        self._wallTime       = None
+        self._requestTime    = 0.0
+
+        if not self._maxConcurrency:
+            self._maxConcurrency = RequestSessionPool.getInstance().poolMaxSize
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: requests
+    @property
+    def requests(self):
+        """ The requests of the batch in their input order. """
+        return self._requests
+
+#___________________________________________________________________________________________________ GS: maxConcurrency
+    @property
+    def maxConcurrency(self):
+        return self._maxConcurrency
+
+#___________________________________________________________________________________________________ GS: completedCount
+    @property
+    def completedCount(self):
+        return self._completedCount
+
+#___________________________________________________________________________________________________ GS: successCount
+    @property
+    def successCount(self):
+        return len([r for r in self._requests if r.success])
+
+#___________________________________________________________________________________________________ GS: wallTime
+    @property
+    def wallTime(self):
+        """ The number of seconds from the start of the batch until its last request completed,
+            or None if the batch has not finished. """
+        return self._wallTime
+
+#___________________________________________________________________________________________________ GS: requestTime
+    @property
+    def requestTime(self):
+        """ The summed number of seconds taken by the individual requests of the batch. """
+        return self._requestTime
+
+#___________________________________________________________________________________________________ GS: speedup
+    @property
+    def speedup(self):
+        """ The ratio of the summed request time to the wall time of the batch. """
+        if not self._wallTime:
+            return None
+        return self._requestTime/self._wallTime
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ runBatch
+    def runBatch(self, itemCallback =None):
+        """ Executes the batch on the calling thread, blocking until every request has
+            completed, and returns the list of requests. The itemCallback, if specified, is called
+            with each request on the worker thread that executed it. """
+        start = time.time()
+        count = min(self._maxConcurrency, len(self._requests))
+
+        workers = []
+        for index in range(max(0, count - 1)):
+            worker = threading.Thread(target=self._runCancellableWorker, args=(itemCallback,))
+            worker.daemon = True
+            worker.start()
+            workers.append(worker)
+
+        # The calling thread executes requests as well instead of waiting idle
+        self._runCancellableWorker(itemCallback)
+        for worker in workers:
+            worker.join()
+
+        self._wallTime = time.time() - start
+        self._output   = self._requests
+
+        self._log.write('Request batch of %s completed in %.3fs (%.3fs summed, %.1fx)' % (
+            len(self._requests), self._wallTime, self._requestTime, self.speedup or 0.0))
+        return self._requests
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _runImpl
+    def _runImpl(self):
+        self.runBatch(itemCallback=self._dispatchItem)
+        return self.CANCELLED_CODE if self._token.isCancelled else 0
+
+#___________________________________________________________________________________________________ _runCancellableWorker
+    def _runCancellableWorker(self, itemCallback):
+        """ Runs a worker with the cancellation token of the batch as the current token of the
+            calling thread, so that the retry, rate limiter and coalescer waits of its requests
+            end when the batch is cancelled. """
+        previous = CancellationToken._setCurrent(self._token)
+        try:
+            self._runWorker(itemCallback)
+        finally:
+            CancellationToken._setCurrent(previous)
+
+#___________________________________________________________________________________________________ _runWorker
+    def _runWorker(self, itemCallback):
+        """ Executes the next unclaimed request until every request in the batch has been claimed
+            or the batch is cancelled. """
+        while not self._token.isCancelled:
+            with self._lock:
+                index = self._nextIndex
+                if index >= len(self._requests):
+                    return
+                self._nextIndex += 1
+
+            request = self._requests[index]
+            try:
+                request._result = request._execute()
+            except Exception as err:
+                self._log.writeError('FAILED: Batch request %s' % request.url, err)
+
+            with self._lock:
+                self._completedCount += 1
+                self._requestTime    += request.elapsed or 0.0
+
+            if itemCallback is not None:
+                itemCallback(index, request)
+
+#___________________________________________________________________________________________________ _dispatchItem
+    def _dispatchItem(self, index, request):
+        self.dispatchEvent(self.itemSignal, 'item', {
+            'index':index,
+            'request':request,
+            'completed':self._completedCount,
+            'total':len(self._requests) })
@@ -0,0 +1,259 @@
+# RequestCacheEntry.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import time
+from email.utils import parsedate_tz
+from email.utils import mktime_tz
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+#___________________________________________________________________________________________________ RequestCacheEntry
+class RequestCacheEntry(object):
+    """ A cached HTTP response along with the freshness information derived from its
+        Cache-Control, Expires, ETag and Last-Modified headers. Only explicit freshness
+        information is honored. A response without a max-age or Expires header is stale as soon
+        as it is stored and must be revalidated before it is used again. """
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, url, statusCode, headers, content, storedTime =None, reason =None):
+        """Creates a new instance of RequestCacheEntry."""
+        self.url        = url
+        self.statusCode = statusCode
+        self.headers    = CaseInsensitiveDict(headers)
+        self.content    = content
+        self.reason     = reason
+        self.storedTime = time.time() if storedTime is None else storedTime
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: size
+    @property
+    def size(self):
+        return len(self.content) if self.content else 0
+
+#___________________________________________________________________________________________________ GS: etag
+    @property
+    def etag(self):
+        return self.headers.get('ETag')
+
+#___________________________________________________________________________________________________ GS: lastModified
+    @property
+    def lastModified(self):
+        return self.headers.get('Last-Modified')
+
+#___________________________________________________________________________________________________ GS: cacheControl
+    @property
+    def cacheControl(self):
+        """ A dictionary of the Cache-Control directives of the response. Directives without a
+            value map to True. """
+        return self.parseCacheControl(self.headers.get('Cache-Control'))
+
+#___________________________________________________________________________________________________ GS: freshnessLifetime
+    @property
+    def freshnessLifetime(self):
+        """ The number of seconds after it was stored that the response remains fresh. """
+        directives = self.cacheControl
+        if 'no-cache' in directives:
+            return 0
+
+        maxAge = self._toInt(directives.get('max-age'))
+        if maxAge is not None:
+            return max(0, maxAge - (self._toInt(self.headers.get('Age')) or 0))
+
+        expires = self.headers.get('Expires')
+        if expires is not None:
+            date    = self._parseDate(self.headers.get('Date')) or self.storedTime
+            expires = self._parseDate(expires)
+            return max(0, expires - date) if expires else 0
+        return 0
+
+#___________________________________________________________________________________________________ GS: age
+    @property
+    def age(self):
+        return max(0.0, time.time() - self.storedTime)
+
+#___________________________________________________________________________________________________ GS: isFresh
+    @property
+    def isFresh(self):
+        return self.age < self.freshnessLifetime
+
+#___________________________________________________________________________________________________ GS: staleWhileRevalidate
+    @property
+    def staleWhileRevalidate(self):
+        """ The number of seconds after becoming stale that the response may still be served
+            while it is revalidated in the background, as allowed by the response itself. """
+        return self._toInt(self.cacheControl.get('stale-while-revalidate')) or 0
+
+#___________________________________________________________________________________________________ GS: mustRevalidate
+    @property
+    def mustRevalidate(self):
+        """ Specifies whether or not the response must be revalidated once stale instead of being
+            served stale, which includes no-cache responses that are stale as soon as stored. """
+        directives = self.cacheControl
+        return 'must-revalidate' in directives or 'proxy-revalidate' in directives \
+            or 'no-cache' in directives
+
+#___________________________________________________________________________________________________ GS: varyNames
+    @property
+    def varyNames(self):
+        """ The lower case names of the request headers listed by the Vary header of the
+            response, which select between the cached variants of the url. """
+        return self.parseVary(self.headers.get('Vary'))
+
+#___________________________________________________________________________________________________ GS: isRevalidatable
+    @property
+    def isRevalidatable(self):
+        """ Specifies whether or not the response can be revalidated with a conditional GET. """
+        return bool(self.etag or self.lastModified)
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ isCacheable
+    @classmethod
+    def isCacheable(cls, response):
+        """ Specifies whether or not the requests.Response may be stored in the cache. """
+        if response.status_code != 200:
+            return False
+
+        directives = cls.parseCacheControl(response.headers.get('Cache-Control'))
+        if 'no-store' in directives:
+            return False
+
+        if response.headers.get('Vary', '').strip() == '*':
+            return False
+
+        if 'max-age' in directives or response.headers.get('Expires') is not None:
+            return True
+        return bool(response.headers.get('ETag') or response.headers.get('Last-Modified'))
+
+#___________________________________________________________________________________________________ fromResponse
+    @classmethod
+    def fromResponse(cls, response):
+        """ Creates an entry for the response. Its content has already been decoded, so the
+            Content-Encoding header, and the Content-Length of the encoded content, are not
+            kept. """
+        headers = CaseInsensitiveDict(response.headers)
+        if headers.pop('Content-Encoding', None) is not None:
+            headers.pop('Content-Length', None)
+
+        return cls(
+            url=response.url,
+            statusCode=response.status_code,
+            headers=headers,
+            content=response.content,
+            reason=response.reason)
+
+#___________________________________________________________________________________________________ parseCacheControl
+    @classmethod
+    def parseCacheControl(cls, value):
+        out = dict()
+        if not value:
+            return out
+
+        for directive in value.split(','):
+            parts = directive.strip().split('=', 1)
+            name  = parts[0].strip().lower()
+            if name:
+                out[name] = parts[1].strip().strip('"') if len(parts) > 1 else True
+        return out
+
+#___________________________________________________________________________________________________ parseVary
+    @classmethod
+    def parseVary(cls, value):
+        if not value:
+            return tuple()
+        return tuple(sorted(set([n.strip().lower() for n in value.split(',') if n.strip()])))
+
+#___________________________________________________________________________________________________ refresh
+    def refresh(self, response):
+        """ Updates the entry from a 304 Not Modified response to a conditional request, which
+            carries the new freshness headers but no content. """
+        for name in ('Cache-Control', 'Date', 'Expires', 'ETag', 'Last-Modified', 'Age', 'Vary'):
+            value = response.headers.get(name)
+            if value is not None:
+                self.headers[name] = value
+        self.storedTime = time.time()
+
+#___________________________________________________________________________________________________ getConditionalHeaders
+    def getConditionalHeaders(self):
+        headers = dict()
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.lastModified:
+            headers['If-Modified-Since'] = self.lastModified
+        return headers
+
+#___________________________________________________________________________________________________ toResponse
+    def toResponse(self):
+        """ Creates a requests.Response for the cached response. Its fromCache attribute is set
+            to True. """
+        response = requests.Response()
+        response.url         = self.url
+        response.status_code = self.statusCode
+        response.reason      = self.reason
+        response.headers     = CaseInsensitiveDict(self.headers)
+        response._content    = self.content
+        response.encoding    = requests.utils.get_encoding_from_headers(response.headers)
+        response.fromCache   = True
+        return response
+
+#___________________________________________________________________________________________________ toDict
+    def toDict(self):
+        """ The metadata of the entry, without its content, for storage on disk. """
+        return dict(
+            url=self.url,
+            statusCode=self.statusCode,
+            reason=self.reason,
+            headers=dict(self.headers.items()),
+            storedTime=self.storedTime)
+
+#___________________________________________________________________________________________________ fromDict
+    @classmethod
+    def fromDict(cls, data, content):
+        return cls(
+            url=data['url'],
+            statusCode=data['statusCode'],
+            headers=data['headers'],
+            content=content,
+            storedTime=data['storedTime'],
+            reason=data.get('reason'))
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _parseDate
+    @classmethod
+    def _parseDate(cls, value):
+        """ Returns the HTTP date as a timestamp, or None if it cannot be parsed. """
+        if not value:
+            return None
+        try:
+            parsed = parsedate_tz(value)
+            return mktime_tz(parsed) if parsed else None
+        except Exception:
+            return None
+
+#___________________________________________________________________________________________________ _toInt
+    @classmethod
+    def _toInt(cls, value):
+        try:
+            return int(value)
+        except Exception:
+            return None
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        return self.__str__()
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return '<%s %s fresh[%s]>' % (self.__class__.__name__, self.url, self.isFresh)
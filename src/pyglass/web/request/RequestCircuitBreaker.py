@@ -0,0 +1,184 @@
+# RequestCircuitBreaker.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import time
+import threading
+
+try:
+    from urllib.parse import urlsplit
+except Exception as err:
+    from urlparse import urlsplit
+
+#___________________________________________________________________________________________________ RequestCircuitBreaker
+class RequestCircuitBreaker(object):
+    """ Tracks consecutive request failures for each host so that requests to a host that is
+        down fail fast instead of waiting on connections that will not succeed. After
+        failureThreshold consecutive failed requests the circuit for the host opens and requests
+        are rejected for resetTimeout seconds. A request counts as a single failure however many
+        attempts it retried. A single trial request is then allowed through while the circuit is
+        half open. Its success closes the circuit and its failure opens it again. A trial that
+        ends without either, such as a cancelled request, must be released with releaseTrial()
+        so that another trial can be made. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    CLOSED    = 'closed'
+
+    OPEN      = 'open'
+
+    HALF_OPEN = 'half_open'
+
+    DEFAULT_FAILURE_THRESHOLD = 5
+
+    DEFAULT_RESET_TIMEOUT     = 30.0
+
+    _instance = None
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, failureThreshold =None, resetTimeout =None):
+        """Creates a new instance of RequestCircuitBreaker."""
+        self._lock   = threading.Lock()
+        self._hosts  = dict()
+        self.enabled = True
+
+        self.failureThreshold = failureThreshold if failureThreshold else \
+            self.DEFAULT_FAILURE_THRESHOLD
+        self.resetTimeout     = self.DEFAULT_RESET_TIMEOUT if resetTimeout is None \
+            else resetTimeout
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: stats
+    @property
+    def stats(self):
+        """ The circuit state, consecutive failure count and number of rejected requests of each
+            tracked host. """
+        with self._lock:
+            return dict([(host, dict(
+                state=self._getState(data),
+                failures=data['failures'],
+                rejected=data['rejected'])) for host, data in self._hosts.items()])
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ getInstance
+    @classmethod
+    def getInstance(cls):
+        """ Returns the shared circuit breaker, creating it on first access. """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+#___________________________________________________________________________________________________ getHost
+    @classmethod
+    def getHost(cls, url):
+        return urlsplit(url).netloc.lower()
+
+#___________________________________________________________________________________________________ getState
+    def getState(self, host):
+        with self._lock:
+            data = self._hosts.get(host)
+            return self._getState(data) if data else self.CLOSED
+
+#___________________________________________________________________________________________________ getRetryTime
+    def getRetryTime(self, host):
+        """ The number of seconds until a request to the host will next be allowed through. """
+        with self._lock:
+            data = self._hosts.get(host)
+            if not data or data['openedTime'] is None:
+                return 0.0
+            return max(0.0, data['openedTime'] + self.resetTimeout - time.time())
+
+#___________________________________________________________________________________________________ allowRequest
+    def allowRequest(self, host):
+        """ Specifies whether or not a request to the host may be made. Rejected requests are
+            counted in the stats of the host. A request allowed through as the trial of a half
+            open circuit returns HALF_OPEN instead of True and must end with recordSuccess(),
+            recordFailure() or releaseTrial(). """
+        if not self.enabled:
+            return True
+
+        with self._lock:
+            data = self._hosts.get(host)
+            if data is None:
+                return True
+
+            state = self._getState(data)
+            if state == self.CLOSED:
+                return True
+
+            if state == self.HALF_OPEN and not data['trialActive']:
+                data['trialActive'] = True
+                return self.HALF_OPEN
+
+            data['rejected'] += 1
+            return False
+
+#___________________________________________________________________________________________________ recordSuccess
+    def recordSuccess(self, host):
+        with self._lock:
+            data = self._hosts.get(host)
+            if data is not None:
+                data.update(failures=0, openedTime=None, trialActive=False)
+
+#___________________________________________________________________________________________________ recordFailure
+    def recordFailure(self, host):
+        """ Records a failed request to the host, opening its circuit if the failure threshold
+            has been reached or the failure was the trial request of a half open circuit. """
+        with self._lock:
+            data = self._hosts.get(host)
+            if data is None:
+                data = dict(failures=0, rejected=0, openedTime=None, trialActive=False)
+                self._hosts[host] = data
+
+            data['failures'] += 1
+            if data['trialActive'] or data['failures'] >= self.failureThreshold:
+                data['openedTime']  = time.time()
+                data['trialActive'] = False
+
+#___________________________________________________________________________________________________ releaseTrial
+    def releaseTrial(self, host):
+        """ Ends the trial request of the half open circuit of the host without recording its
+            outcome, leaving the circuit half open so that the next request becomes the trial. """
+        with self._lock:
+            data = self._hosts.get(host)
+            if data is not None:
+                data['trialActive'] = False
+
+#___________________________________________________________________________________________________ reset
+    def reset(self, host =None):
+        """ Closes the circuit of the host, or of every host if none is specified. """
+        with self._lock:
+            if host is None:
+                self._hosts.clear()
+            else:
+                self._hosts.pop(host, None)
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _getState
+    def _getState(self, data):
+        """ Returns the state of the host data. Must be called while holding the lock. """
+        if data['openedTime'] is None:
+            return self.CLOSED
+        if time.time() - data['openedTime'] < self.resetTimeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        return self.__str__()
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return '<%s hosts[%s]>' % (self.__class__.__name__, len(self._hosts))
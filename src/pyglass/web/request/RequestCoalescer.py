@@ -0,0 +1,145 @@
+# RequestCoalescer.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import time
+import threading
+
+from requests import exceptions
+
+#___________________________________________________________________________________________________ RequestCoalescer
+class RequestCoalescer(object):
+    """ Collapses identical requests that are in flight at the same time into a single call. The
+        first caller for a key executes the request while later callers for the same key block
+        until it completes and then share its result. Only requests without side effects, such
+        as GETs, should be coalesced, and only with requests whose options would produce the same
+        result, which are included in the key. A caller sharing a call stops waiting for it once
+        its own timeout passes or its cancellation token is cancelled. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    # The interval, in seconds, at which a waiting caller checks its cancellation token
+    _POLL_INTERVAL = 0.05
+
+    _instance = None
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self):
+        """Creates a new instance of RequestCoalescer."""
+        self._lock           = threading.Lock()
+        self._inFlight       = dict()
+        self._executedCount  = 0
+        self._coalescedCount = 0
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: inFlightCount
+    @property
+    def inFlightCount(self):
+        return len(self._inFlight)
+
+#___________________________________________________________________________________________________ GS: stats
+    @property
+    def stats(self):
+        with self._lock:
+            return dict(
+                inFlight=len(self._inFlight),
+                executed=self._executedCount,
+                coalesced=self._coalescedCount)
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ getInstance
+    @classmethod
+    def getInstance(cls):
+        """ Returns the shared coalescer, creating it on first access. """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+#___________________________________________________________________________________________________ createKey
+    @classmethod
+    def createKey(cls, url, headers =None, options =None):
+        """ Returns the key identifying a GET request to the url with the specified headers and
+            options, a tuple of the hashable request options that affect its result. """
+        options = tuple(options) if options else ()
+        if not headers:
+            return url, (), options
+        return url, tuple(sorted([(n.lower(), v) for n, v in headers.items()])), options
+
+#___________________________________________________________________________________________________ execute
+    def execute(self, key, function, timeout =None, token =None):
+        """ Returns the result of calling function, or of the call already in flight for the key,
+            along with a boolean that is True if the result was shared from another caller's
+            call. If the call raises, every caller waiting on it raises the same exception.
+
+            @@@param timeout:number
+                The seconds a caller sharing another caller's call waits for it before raising a
+                requests Timeout. Waits indefinitely if None.
+
+            @@@param token:CancellationToken
+                When cancelled, a caller sharing another caller's call stops waiting for it and
+                raises a RemoteTaskCancelledError.
+        """
+        with self._lock:
+            call = self._inFlight.get(key)
+            isLeader = call is None
+            if isLeader:
+                call = dict(done=threading.Event(), result=None, error=None)
+                self._inFlight[key] = call
+                self._executedCount += 1
+            else:
+                self._coalescedCount += 1
+
+        if not isLeader:
+            self._wait(call['done'], timeout, token)
+            if call['error'] is not None:
+                raise call['error']
+            return call['result'], True
+
+        try:
+            call['result'] = function()
+            return call['result'], False
+        except Exception as err:
+            call['error'] = err
+            raise
+        finally:
+            with self._lock:
+                self._inFlight.pop(key, None)
+            call['done'].set()
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _wait
+    def _wait(self, event, timeout, token):
+        """ Blocks until the event is set, raising if the timeout passes or the token is cancelled
+            first. """
+        expires = None if timeout is None else time.time() + timeout
+        while not event.is_set():
+            if token is not None:
+                token.raiseIfCancelled()
+
+            wait = self._POLL_INTERVAL
+            if expires is not None:
+                remaining = expires - time.time()
+                if remaining <= 0:
+                    raise exceptions.Timeout('Timed out waiting for a coalesced request')
+                wait = min(wait, remaining)
+            event.wait(wait)
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        return self.__str__()
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return '<%s inFlight[%s]>' % (self.__class__.__name__, len(self._inFlight))
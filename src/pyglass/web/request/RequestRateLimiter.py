@@ -0,0 +1,141 @@
+# RequestRateLimiter.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import time
+import threading
+
+from pyglass.threading.CancellationToken import CancellationToken
+from pyglass.threading.RemoteTaskCancelledError import RemoteTaskCancelledError
+
+#___________________________________________________________________________________________________ RequestRateLimiter
+class RequestRateLimiter(object):
+    """ A token bucket for each host that limits the rate at which requests are sent to it.
+        Each bucket refills at rate tokens per second up to burst tokens. Requests that arrive
+        while a bucket is empty reserve the next token and are queued until it becomes available
+        rather than being sent and rejected by the server, so queued requests are sent in the
+        order in which they arrived.
+
+        Hosts without a limit of their own use the default rate, which is unlimited unless set. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    _instance = None
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, defaultRate =None, defaultBurst =None):
+        """ Creates a new instance of RequestRateLimiter.
+
+            @@@param defaultRate:float
+                The number of requests per second allowed to hosts without a limit of their own.
+                None allows an unlimited rate.
+
+            @@@param defaultBurst:int
+                The number of requests that can be sent at once after a host has been idle.
+                Defaults to the rate rounded up.
+        """
+        self._lock        = threading.Lock()
+        self._local       = threading.local()
+        self._limits      = dict()
+        self._buckets     = dict()
+        self._waitCounts  = dict()
+        self._waitTimes   = dict()
+        self.defaultRate  = defaultRate
+        self.defaultBurst = defaultBurst
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: stats
+    @property
+    def stats(self):
+        """ The number of queued requests and the total seconds they waited, by host. """
+        with self._lock:
+            return dict([(host, dict(
+                queued=count,
+                waitTime=self._waitTimes.get(host, 0.0))) for host, count in
+                self._waitCounts.items()])
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ getInstance
+    @classmethod
+    def getInstance(cls):
+        """ Returns the shared rate limiter, creating it on first access. """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+#___________________________________________________________________________________________________ setHostLimit
+    def setHostLimit(self, host, rate, burst =None):
+        """ Limits requests to the host, specified as a lower case host[:port] string, to rate
+            requests per second. A rate of None removes the host's own limit. """
+        with self._lock:
+            self._buckets.pop(host, None)
+            if rate is None:
+                self._limits.pop(host, None)
+            else:
+                self._limits[host] = (rate, burst)
+
+#___________________________________________________________________________________________________ reserve
+    def reserve(self, host):
+        """ Reserves the next token of the host's bucket and returns the number of seconds until
+            it becomes available, without waiting. The request must not be sent before then. """
+        with self._lock:
+            rate, burst = self._limits.get(host, (self.defaultRate, self.defaultBurst))
+            if not rate:
+                return 0.0
+
+            burst  = float(burst if burst else max(1, int(rate + 0.999)))
+            now    = time.time()
+            tokens, updated = self._buckets.get(host, (burst, now))
+            tokens = min(burst, tokens + (now - updated)*rate) - 1.0
+            self._buckets[host] = (tokens, now)
+
+            if tokens >= 0:
+                return 0.0
+
+            delay = -tokens/rate
+            self._waitCounts[host] = self._waitCounts.get(host, 0) + 1
+            self._waitTimes[host]  = self._waitTimes.get(host, 0.0) + delay
+            return delay
+
+#___________________________________________________________________________________________________ acquire
+    def acquire(self, host):
+        """ Blocks until a token of the host's bucket is available and returns the number of
+            seconds waited. When called within a cancellable task the wait ends early if the task
+            is cancelled, raising a RemoteTaskCancelledError so that the request is not sent. """
+        delay = self.reserve(host)
+        if delay <= 0:
+            return 0.0
+
+        self._local.waitTime = getattr(self._local, 'waitTime', 0.0) + delay
+        token = CancellationToken.current()
+        if token is None:
+            time.sleep(delay)
+        elif token.wait(delay):
+            raise RemoteTaskCancelledError('Task was cancelled while waiting for the rate limit')
+        return delay
+
+#___________________________________________________________________________________________________ popWaitTime
+    def popWaitTime(self):
+        """ Returns the number of seconds the calling thread has waited in acquire() since the
+            previous call and resets it. Used to attribute queue time to individual requests. """
+        out = getattr(self._local, 'waitTime', 0.0)
+        self._local.waitTime = 0.0
+        return out
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        return self.__str__()
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return '<%s hosts[%s]>' % (self.__class__.__name__, len(self._limits))
@@ -0,0 +1,490 @@
+# RequestResponseCache.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from pyglass.app.PyGlassEnvironment import PyGlassEnvironment
+from pyglass.data.JSONCodec import JSONCodec
+from pyglass.threading.RemoteExecutionPool import RemoteExecutionPool
+from pyglass.threading.RemoteTaskPriorityEnum import RemoteTaskPriorityEnum
+from pyglass.web.request.RequestCacheEntry import RequestCacheEntry
+from pyglass.web.request.RequestSessionPool import RequestSessionPool
+
+#___________________________________________________________________________________________________ RequestResponseCache
+class RequestResponseCache(object):
+    """ An HTTP cache for GET requests made through RequestUtils.executeRequest. Responses are
+        held in a memory LRU bounded by entry count and bytes and, once the PyGlassEnvironment has
+        been initialized, persisted to disk within the local resources path so that they survive
+        application restarts.
+
+        Freshness follows the explicit Cache-Control and Expires headers of each response, and
+        responses with neither are only cached when they can be revalidated. Stale responses
+        carrying an ETag or Last-Modified header are revalidated with a conditional GET, and a
+        304 Not Modified response refreshes the cached entry without transferring the content
+        again. When a request allows it, or the response specifies stale-while-revalidate, a stale
+        response is returned immediately and revalidated in the background, unless the response
+        is no-cache or must-revalidate.
+
+        A response with a Vary header is cached as a variant of its url keyed by the values of
+        the listed request headers, so that requests with different headers never share it. Each
+        entry is stored on disk as a single file, metadata and content together, that is written
+        to a temporary file and renamed into place. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    DEFAULT_MAX_ENTRIES = 256
+
+    DEFAULT_MAX_BYTES   = 16777216
+
+    _instance = None
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, maxEntries =None, maxBytes =None, path =None):
+        """Creates a new instance of RequestResponseCache."""
+        self._lock         = threading.Lock()
+        self._entries      = OrderedDict()
+        self._byteSize     = 0
+        self._maxEntries   = maxEntries if maxEntries else self.DEFAULT_MAX_ENTRIES
+        self._maxBytes     = maxBytes if maxBytes else self.DEFAULT_MAX_BYTES
+        self._path         = path
+        self._diskEnabled  = True
+        self._revalidating = set()
+        self._varyNames    = dict()
+
+        self._hits                  = 0
+        self._staleHits             = 0
+        self._diskHits              = 0
+        self._misses                = 0
+        self._revalidated           = 0
+        self._backgroundRevalidated = 0
+        self._stores                = 0
+        self._evictions             = 0
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: maxEntries
+    @property
+    def maxEntries(self):
+        return self._maxEntries
+    @maxEntries.setter
+    def maxEntries(self, value):
+        with self._lock:
+            self._maxEntries = value
+            self._evict()
+
+#___________________________________________________________________________________________________ GS: maxBytes
+    @property
+    def maxBytes(self):
+        """ The maximum number of content bytes held in memory. Responses larger than this are
+            only cached on disk. """
+        return self._maxBytes
+    @maxBytes.setter
+    def maxBytes(self, value):
+        with self._lock:
+            self._maxBytes = value
+            self._evict()
+
+#___________________________________________________________________________________________________ GS: diskEnabled
+    @property
+    def diskEnabled(self):
+        return self._diskEnabled
+    @diskEnabled.setter
+    def diskEnabled(self, value):
+        self._diskEnabled = bool(value)
+
+#___________________________________________________________________________________________________ GS: path
+    @property
+    def path(self):
+        """ The directory in which cached responses are stored on disk, or None if the disk cache
+            is unavailable because the PyGlassEnvironment has not been initialized. """
+        if not self._diskEnabled:
+            return None
+
+        if self._path:
+            return self._path
+
+        if not PyGlassEnvironment.isInitialized:
+            return None
+        return PyGlassEnvironment.getRootLocalResourcePath('cache', 'requests', isDir=True)
+
+#___________________________________________________________________________________________________ GS: size
+    @property
+    def size(self):
+        """ The number of responses held in memory. """
+        return len(self._entries)
+
+#___________________________________________________________________________________________________ GS: byteSize
+    @property
+    def byteSize(self):
+        return self._byteSize
+
+#___________________________________________________________________________________________________ GS: hitRatio
+    @property
+    def hitRatio(self):
+        """ The fraction of lookups served from the cache without a network request, including
+            stale responses served while revalidating. The background revalidations of those
+            responses are not lookups and are not counted. """
+        served = self._hits + self._staleHits
+        total  = served + self._misses + self._revalidated - self._backgroundRevalidated
+        return float(served)/total if total else 0.0
+
+#___________________________________________________________________________________________________ GS: stats
+    @property
+    def stats(self):
+        with self._lock:
+            return dict(
+                entries=len(self._entries),
+                bytes=self._byteSize,
+                hits=self._hits,
+                staleHits=self._staleHits,
+                diskHits=self._diskHits,
+                misses=self._misses,
+                revalidated=self._revalidated,
+                backgroundRevalidated=self._backgroundRevalidated,
+                stores=self._stores,
+                evictions=self._evictions,
+                hitRatio=self.hitRatio)
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ getInstance
+    @classmethod
+    def getInstance(cls):
+        """ Returns the shared response cache, creating it on first access. """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+#___________________________________________________________________________________________________ get
+    def get(self, url, allowStale =False, **kwargs):
+        """ Returns the requests.Response for a GET request to the url, served from the cache
+            where possible. Keyword arguments are passed to RequestSessionPool.get when a network
+            request is required.
+
+            @@@param allowStale:bool
+                When True, a stale cached response is returned immediately and revalidated in the
+                background even if the response did not specify stale-while-revalidate. Responses
+                that must be revalidated are never served stale.
+        """
+        key   = self._getKey(url, kwargs.get('headers'))
+        entry = self._lookup(key)
+
+        if entry is not None:
+            if entry.isFresh:
+                with self._lock:
+                    self._hits += 1
+                return entry.toResponse()
+
+            staleTime = entry.age - entry.freshnessLifetime
+            if not entry.mustRevalidate and entry.isRevalidatable and (
+                allowStale or staleTime < entry.staleWhileRevalidate
+            ):
+                with self._lock:
+                    self._staleHits += 1
+                self._revalidateInBackground(url, key, kwargs)
+                return entry.toResponse()
+
+        return self._fetch(url, key, entry, kwargs)
+
+#___________________________________________________________________________________________________ getFresh
+    def getFresh(self, url, headers =None, allowStale =False):
+        """ Returns the cached response for a GET request to the url with the specified request
+            headers if it is still fresh, or None otherwise, without making a network request.
+            Used by request backends that perform their own network requests and store the
+            results with storeResponse().
+
+            @@@param allowStale:bool
+                When True, a stale cached response is also returned, as by get(), and revalidated
+                in the background through the RemoteExecutionPool. Responses that must be
+                revalidated are never returned stale.
+        """
+        key   = self._getKey(url, headers)
+        entry = self._lookup(key)
+        if entry is not None and entry.isFresh:
+            with self._lock:
+                self._hits += 1
+            return entry.toResponse()
+
+        if allowStale and entry is not None and not entry.mustRevalidate \
+                and entry.isRevalidatable:
+            with self._lock:
+                self._staleHits += 1
+            self._revalidateInBackground(url, key, dict(headers=headers) if headers else dict())
+            return entry.toResponse()
+
+        with self._lock:
+            self._misses += 1
+        return None
+
+#___________________________________________________________________________________________________ storeResponse
+    def storeResponse(self, response, url =None, headers =None):
+        """ Stores the requests.Response for a GET request to the url, which defaults to the url
+            of the response, made with the specified request headers, if it is cacheable. Returns
+            True if the response was stored. """
+        if not RequestCacheEntry.isCacheable(response):
+            return False
+        self._store(
+            url if url else response.url, headers, RequestCacheEntry.fromResponse(response))
+        return True
+
+#___________________________________________________________________________________________________ invalidate
+    def invalidate(self, url):
+        """ Removes every cached variant of the url from memory and disk. """
+        prefix = url + '\n'
+        with self._lock:
+            keys = [k for k in self._entries if k == url or k.startswith(prefix)]
+            for key in keys:
+                self._byteSize -= self._entries.pop(key).size
+            self._varyNames.pop(url, None)
+
+        path = self.path
+        if path:
+            for key in set(keys + [url]):
+                try:
+                    os.remove(os.path.join(path, self._getFilename(key)))
+                except Exception:
+                    pass
+        return len(keys) > 0
+
+#___________________________________________________________________________________________________ clear
+    def clear(self, disk =True):
+        """ Removes every cached response from memory and, unless disk is False, from disk. """
+        with self._lock:
+            self._entries.clear()
+            self._varyNames.clear()
+            self._byteSize = 0
+
+        path = self.path
+        if not disk or not path or not os.path.exists(path):
+            return
+
+        for filename in os.listdir(path):
+            try:
+                os.remove(os.path.join(path, filename))
+            except Exception:
+                pass
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _fetch
+    def _fetch(self, url, key, entry, kwargs, background =False):
+        """ Executes the GET request, conditionally if a revalidatable entry exists, and updates
+            the cache with the result. Background fetches, which revalidate an entry that was
+            already served stale, are counted as revalidations rather than misses. """
+        if entry is not None and entry.isRevalidatable:
+            headers = dict(kwargs.get('headers') or dict())
+            headers.update(entry.getConditionalHeaders())
+            kwargs = dict(kwargs, headers=headers)
+        else:
+            entry = None
+
+        response = RequestSessionPool.getInstance().get(url, **kwargs)
+
+        if entry is not None and response.status_code == 304:
+            entry.refresh(response)
+            with self._lock:
+                self._revalidated += 1
+                if background:
+                    self._backgroundRevalidated += 1
+            self._store(url, kwargs.get('headers'), entry)
+            return entry.toResponse()
+
+        with self._lock:
+            if background:
+                self._revalidated += 1
+                self._backgroundRevalidated += 1
+            else:
+                self._misses += 1
+
+        if RequestCacheEntry.isCacheable(response):
+            self._store(url, kwargs.get('headers'), RequestCacheEntry.fromResponse(response))
+        elif response.status_code == 200:
+            self.invalidate(url)
+        return response
+
+#___________________________________________________________________________________________________ _revalidateInBackground
+    def _revalidateInBackground(self, url, key, kwargs):
+        with self._lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+
+        def revalidate():
+            try:
+                self._fetch(url, key, self._lookup(key), kwargs, background=True)
+            except Exception:
+                pass
+            finally:
+                self._revalidating.discard(key)
+
+        task = RemoteExecutionPool.getInstance().submit(
+            revalidate,
+            priority=RemoteTaskPriorityEnum.LOW,
+            onDiscard=lambda: self._revalidating.discard(key))
+        if task is None:
+            self._revalidating.discard(key)
+
+#___________________________________________________________________________________________________ _getKey
+    def _getKey(self, url, headers, varyNames =None):
+        """ Returns the cache key for a GET request to the url with the specified request headers,
+            which is the url itself unless responses from the url vary by request header. In that
+            case the values of the headers named by varyNames, or by the most recent response from
+            the url if not specified, are appended to it. """
+        if varyNames is None:
+            with self._lock:
+                varyNames = self._varyNames.get(url)
+        if not varyNames:
+            return url
+
+        requestHeaders = requests.utils.default_headers()
+        requestHeaders.update(CaseInsensitiveDict(headers or dict()))
+        return url + ''.join(['\n%s:%s' % (n, requestHeaders.get(n, '')) for n in varyNames])
+
+#___________________________________________________________________________________________________ _lookup
+    def _lookup(self, key):
+        """ Returns the cached entry for the key from memory, or from disk if it is not held in
+            memory, or None if it is not cached. """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.pop(key)
+                self._entries[key] = entry
+                return entry
+
+        entry = self._readEntry(key)
+        if entry is None:
+            return None
+
+        with self._lock:
+            self._diskHits += 1
+            self._add(key, entry)
+        return entry
+
+#___________________________________________________________________________________________________ _store
+    def _store(self, url, headers, entry):
+        """ Stores the entry for a GET request to the url with the specified request headers,
+            keyed by the request headers that its Vary header lists. """
+        varyNames = entry.varyNames
+        key       = self._getKey(url, headers, varyNames)
+        with self._lock:
+            if varyNames:
+                self._varyNames[url] = varyNames
+            else:
+                self._varyNames.pop(url, None)
+            self._stores += 1
+            self._add(key, entry)
+        self._writeEntry(key, entry)
+
+#___________________________________________________________________________________________________ _add
+    def _add(self, key, entry):
+        """ Adds the entry to the memory cache. Must be called while holding the lock. """
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._byteSize -= previous.size
+
+        if entry.size > self._maxBytes:
+            return
+
+        self._entries[key] = entry
+        self._byteSize    += entry.size
+        self._evict()
+
+#___________________________________________________________________________________________________ _evict
+    def _evict(self):
+        """ Removes the least recently used entries from memory until the cache is within its
+            limits. Must be called while holding the lock. """
+        while self._entries and (
+            len(self._entries) > self._maxEntries or self._byteSize > self._maxBytes
+        ):
+            key, entry = self._entries.popitem(last=False)
+            self._byteSize  -= entry.size
+            self._evictions += 1
+
+#___________________________________________________________________________________________________ _readEntry
+    def _readEntry(self, key):
+        """ Reads the entry for the key from its disk file, which holds a line of JSON metadata
+            followed by the content. """
+        path = self.path
+        if not path:
+            return None
+
+        entryPath = os.path.join(path, self._getFilename(key))
+        if not os.path.exists(entryPath):
+            return None
+
+        try:
+            with open(entryPath, 'rb') as f:
+                data = f.read()
+            index = data.index(b'\n')
+            meta  = JSONCodec.fromString(data[:index].decode('utf-8'))
+            if meta.get('key') != key:
+                return None
+            return RequestCacheEntry.fromDict(meta, data[index + 1:])
+        except Exception:
+            return None
+
+#___________________________________________________________________________________________________ _writeEntry
+    def _writeEntry(self, key, entry):
+        """ Writes the entry to disk as a single file holding its metadata and content, which is
+            written to a temporary file and renamed into place, so that readers never see a
+            partially written entry or the metadata of one response with the content of
+            another. """
+        path = self.path
+        if not path:
+            return False
+
+        meta = dict(entry.toDict(), key=key)
+        try:
+            if not os.path.exists(path):
+                os.makedirs(path)
+            self._writeFile(
+                os.path.join(path, self._getFilename(key)),
+                JSONCodec.asString(meta).encode('utf-8') + b'\n' + (entry.content or b''))
+            return True
+        except Exception:
+            return False
+
+#___________________________________________________________________________________________________ _writeFile
+    @classmethod
+    def _writeFile(cls, path, data):
+        tempPath = '%s.%s.tmp' % (path, threading.current_thread().ident)
+        with open(tempPath, 'wb') as f:
+            f.write(data)
+
+        if hasattr(os, 'replace'):
+            os.replace(tempPath, path)
+            return
+
+        if os.path.exists(path):
+            os.remove(path)
+        os.rename(tempPath, path)
+
+#___________________________________________________________________________________________________ _getFilename
+    @classmethod
+    def _getFilename(cls, key):
+        return hashlib.sha1(key.encode('utf-8')).hexdigest() + '.entry'
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        return self.__str__()
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return '<%s entries[%s] bytes[%s]>' % (
+            self.__class__.__name__, len(self._entries), self._byteSize)
@@ -0,0 +1,129 @@
+# RequestRetryPolicy.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import time
+import random
+
+from pyglass.threading.CancellationToken import CancellationToken
+
+#___________________________________________________________________________________________________ RequestRetryPolicy
+class RequestRetryPolicy(object):
+    """ Determines whether a failed request is retried and how long to wait before each retry.
+        Only idempotent methods are retried, after connection errors or responses with one of the
+        retryable status codes. Delays grow exponentially from backoffFactor and are randomized
+        with full jitter, so that clients recovering from the same outage do not retry in
+        lockstep, while honouring any Retry-After header sent by the server. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    DEFAULT_MAX_RETRIES    = 3
+
+    DEFAULT_BACKOFF_FACTOR = 0.5
+
+    DEFAULT_MAX_BACKOFF    = 30.0
+
+    IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE', 'TRACE'])
+
+    RETRY_STATUS_CODES = frozenset([408, 429, 500, 502, 503, 504])
+
+    _instance = None
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(
+            self, maxRetries =None, backoffFactor =None, maxBackoff =None, methods =None,
+            statusCodes =None, jitter =True
+    ):
+        """ Creates a new instance of RequestRetryPolicy.
+
+            @@@param maxRetries:int
+                The number of retries after the initial attempt. Zero disables retrying.
+
+            @@@param backoffFactor:float
+                The delay, in seconds, before the first retry. Each subsequent retry doubles the
+                delay up to maxBackoff.
+
+            @@@param jitter:bool
+                When True each delay is chosen at random between zero and the exponential delay.
+        """
+        self.maxRetries    = self.DEFAULT_MAX_RETRIES if maxRetries is None else maxRetries
+        self.backoffFactor = self.DEFAULT_BACKOFF_FACTOR if backoffFactor is None \
+            else backoffFactor
+        self.maxBackoff    = self.DEFAULT_MAX_BACKOFF if maxBackoff is None else maxBackoff
+        self.methods       = frozenset(
+            [m.upper() for m in methods] if methods else self.IDEMPOTENT_METHODS)
+        self.statusCodes   = frozenset(statusCodes if statusCodes else self.RETRY_STATUS_CODES)
+        self.jitter        = jitter
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ getInstance
+    @classmethod
+    def getInstance(cls):
+        """ Returns the default policy used by RequestUtils.executeRequest when none is
+            specified. """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+#___________________________________________________________________________________________________ isRetryable
+    def isRetryable(self, method, attempt, response =None, error =None):
+        """ Specifies whether or not the request should be retried after the specified attempt,
+            counted from zero, which ended with either the response or the error. """
+        if attempt >= self.maxRetries or method.upper() not in self.methods:
+            return False
+
+        if error is not None:
+            return True
+        return response is not None and response.status_code in self.statusCodes
+
+#___________________________________________________________________________________________________ getDelay
+    def getDelay(self, attempt, response =None):
+        """ Returns the number of seconds to wait before retrying after the specified attempt,
+            counted from zero. """
+        retryAfter = self._getRetryAfter(response)
+        if retryAfter is not None:
+            return min(self.maxBackoff, retryAfter)
+
+        delay = min(self.maxBackoff, self.backoffFactor*(2 ** attempt))
+        return random.uniform(0, delay) if self.jitter else delay
+
+#___________________________________________________________________________________________________ wait
+    @classmethod
+    def wait(cls, delay):
+        """ Sleeps for the delay in seconds. When called within a cancellable task the wait ends
+            early if the task is cancelled. Returns True if it was cancelled. """
+        token = CancellationToken.current()
+        if token is None:
+            time.sleep(delay)
+            return False
+        return token.wait(delay)
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _getRetryAfter
+    @classmethod
+    def _getRetryAfter(cls, response):
+        if response is None:
+            return None
+        try:
+            return max(0.0, float(response.headers.get('Retry-After')))
+        except Exception:
+            return None
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        return self.__str__()
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return '<%s retries[%s] backoff[%s]>' % (
+            self.__class__.__name__, self.maxRetries, self.backoffFactor)
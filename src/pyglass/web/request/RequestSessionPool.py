@@ -0,0 +1,216 @@
+# RequestSessionPool.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from pyaid.string.StringUtils import StringUtils
+
+from pyglass.app.PyGlassEnvironment import PyGlassEnvironment
+from pyglass.web.request.RequestRateLimiter import RequestRateLimiter
+
+try:
+    from urllib.parse import urlsplit
+except Exception as err:
+    from urlparse import urlsplit
+
+try:
+    from http.cookiejar import DefaultCookiePolicy
+except Exception as err:
+    from cookielib import DefaultCookiePolicy
+
+#___________________________________________________________________________________________________ RequestSessionPool
+class RequestSessionPool(object):
+    """ Maintains one requests.Session for each host and session configuration so that HTTP
+        requests reuse kept-alive connections, and their TLS sessions, instead of paying for a new
+        TCP and TLS handshake on every call as the module-level requests functions do.
+
+        Sessions are shared by every thread. The connection pools of their adapters are thread
+        safe, and requests made through the pool pass their per-request options as arguments
+        rather than modifying the shared session. Secure sessions verify against the CA bundle
+        resolved once by PyGlassEnvironment.requestsCABundle.
+
+        Sessions are stateless, like the module-level functions. Their cookie jars neither store
+        nor send cookies, so that cookies set by the response to one caller are never sent with
+        the requests of another. Cookies passed to a request are still sent with it. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    # The number of host connection pools cached by each session adapter
+    DEFAULT_POOL_CONNECTIONS = 10
+
+    # The maximum number of kept-alive connections to a host
+    DEFAULT_POOL_MAX_SIZE    = 10
+
+    _instance = None
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self, poolConnections =None, poolMaxSize =None):
+        """Creates a new instance of RequestSessionPool."""
+        self._lock            = threading.Lock()
+        self._sessions        = dict()
+        self._requestCounts   = dict()
+        self._poolConnections = poolConnections if poolConnections else \
+            self.DEFAULT_POOL_CONNECTIONS
+        self._poolMaxSize     = poolMaxSize if poolMaxSize else self.DEFAULT_POOL_MAX_SIZE
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: poolConnections
+    @property
+    def poolConnections(self):
+        """ The number of host connection pools cached by the adapter of each session. Applies to
+            sessions created after the change. """
+        return self._poolConnections
+    @poolConnections.setter
+    def poolConnections(self, value):
+        self._poolConnections = value
+
+#___________________________________________________________________________________________________ GS: poolMaxSize
+    @property
+    def poolMaxSize(self):
+        """ The maximum number of kept-alive connections per host, which should be at least the
+            number of threads making concurrent requests to that host. Applies to sessions
+            created after the change. """
+        return self._poolMaxSize
+    @poolMaxSize.setter
+    def poolMaxSize(self, value):
+        self._poolMaxSize = value
+
+#___________________________________________________________________________________________________ GS: sessionCount
+    @property
+    def sessionCount(self):
+        return len(self._sessions)
+
+#___________________________________________________________________________________________________ GS: stats
+    @property
+    def stats(self):
+        """ The number of requests made through the pool, by host. """
+        with self._lock:
+            return dict(
+                sessions=len(self._sessions),
+                requests=dict(self._requestCounts))
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ getInstance
+    @classmethod
+    def getInstance(cls):
+        """ Returns the shared session pool, creating it on first access. """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+#___________________________________________________________________________________________________ getSession
+    def getSession(self, url, config =None):
+        """ Returns the shared session for the host of the url, creating it if necessary.
+
+            @@@param config:dict
+                Session attributes, such as headers, auth, proxies or verify, applied when the
+                session is created. Requests with different configurations use separate sessions.
+        """
+        key = self._createKey(url, config)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._createSession(url, config)
+                self._sessions[key] = session
+            return session
+
+#___________________________________________________________________________________________________ request
+    def request(self, method, url, config =None, **kwargs):
+        """ Executes the request through the shared session for its host and returns the
+            requests.Response. Keyword arguments are passed to requests.Session.request. The
+            request is queued first if it would exceed the host's RequestRateLimiter limit, and
+            the seconds it waited are stored in the queueTime attribute of the response. If the
+            calling task is cancelled while queued, a RemoteTaskCancelledError is raised and the
+            request is not sent. """
+        session = self.getSession(url, config)
+
+        host = self._getHost(url)
+        with self._lock:
+            self._requestCounts[host] = self._requestCounts.get(host, 0) + 1
+
+        queueTime = RequestRateLimiter.getInstance().acquire(host)
+        response  = session.request(method, url, **kwargs)
+        response.queueTime = queueTime
+        return response
+
+#___________________________________________________________________________________________________ get
+    def get(self, url, config =None, **kwargs):
+        return self.request('GET', url, config=config, **kwargs)
+
+#___________________________________________________________________________________________________ post
+    def post(self, url, data =None, config =None, **kwargs):
+        return self.request('POST', url, config=config, data=data, **kwargs)
+
+#___________________________________________________________________________________________________ close
+    def close(self):
+        """ Closes every session and their kept-alive connections. Sessions are created again
+            as needed by later requests. """
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions = dict()
+
+        for session in sessions:
+            session.close()
+        return len(sessions)
+
+#===================================================================================================
+#                                                                               P R O T E C T E D
+
+#___________________________________________________________________________________________________ _createSession
+    def _createSession(self, url, config):
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self._poolConnections,
+            pool_maxsize=self._poolMaxSize)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+        # Blocks every domain so that the shared session never stores or sends cookies
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+        if url.startswith('https:'):
+            # Make the requests securely with verification using the CA bundle file contained
+            # within the requests python site library. See PyGlassEnvironment.requestsCABundle.
+            session.verify = PyGlassEnvironment.requestsCABundle
+
+        if config:
+            for name, value in config.items():
+                setattr(session, name, value)
+        return session
+
+#___________________________________________________________________________________________________ _createKey
+    @classmethod
+    def _createKey(cls, url, config):
+        parts = urlsplit(url)
+        key   = (parts.scheme.lower(), parts.netloc.lower())
+        if not config:
+            return key
+        return key + tuple(sorted(
+            [(n, StringUtils.toUnicode(repr(v))) for n, v in config.items()]))
+
+#___________________________________________________________________________________________________ _getHost
+    @classmethod
+    def _getHost(cls, url):
+        return urlsplit(url).netloc.lower()
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        return self.__str__()
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return '<%s sessions[%s]>' % (self.__class__.__name__, len(self._sessions))
@@ -4,6 +4,8 @@
 
 from __future__ import print_function, absolute_import, unicode_literals, division
 
+from pyaid.ArgsUtils import ArgsUtils
+
 from pyglass.web.request.RequestUtils import RequestUtils
 from pyglass.threading.RemoteExecutionThread import RemoteExecutionThread
 
@@ -16,20 +18,52 @@ class RequestThread(RemoteExecutionThread):
 
 #___________________________________________________________________________________________________ __init__
     def __init__(self, parent, url, args =None, **kwargs):
+        self._cache       = ArgsUtils.extract('cache', True, kwargs)
+        self._allowStale  = ArgsUtils.extract('allowStale', False, kwargs)
+        self._retryPolicy = ArgsUtils.extract('retryPolicy', None, kwargs)
+        self._timeout     = ArgsUtils.extract('timeout', None, kwargs)
+        self._deadline    = ArgsUtils.extract('deadline', None, kwargs)
+
+        # When a download path is specified the response body is streamed to that file
+        self._downloadPath  = ArgsUtils.extract('downloadPath', None, kwargs)
+        self._hashAlgorithm = ArgsUtils.extract('hashAlgorithm', None, kwargs)
+        self._expectedHash  = ArgsUtils.extract('expectedHash', None, kwargs)
+        self._resume        = ArgsUtils.extract('resume', True, kwargs)
+
         RemoteExecutionThread.__init__(self, parent, **kwargs)
-        self._url  = url
-        self._args = args
+        self._url          = url
+        self._args         = args
+        self._requestStats = dict()
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: requestStats
+    @property
+    def requestStats(self):
+        """ The queue time, coalescing, attempts and elapsed time of the request once it has
+            been executed. See RequestUtils.executeRequest. """
+        return self._requestStats
 
 #===================================================================================================
 #                                                                               P R O T E C T E D
 
 #___________________________________________________________________________________________________ _runImpl
     def _runImpl(self):
+        if self._downloadPath:
+            return self._runDownload()
+
         try:
             self._output = RequestUtils.executeRequest(
                 url=self._url,
                 args=self._args,
-                logger=self._log
+                logger=self._log,
+                cache=self._cache,
+                allowStale=self._allowStale,
+                retryPolicy=self._retryPolicy,
+                requestStats=self._requestStats,
+                timeout=self._timeout,
+                deadline=self._deadline
             )
         except Exception as err:
             self._log.writeError('FAILED: Request attempt.', err)
@@ -38,3 +72,32 @@ class RequestThread(RemoteExecutionThread):
         if self._output is None:
             return 1
         return 0
+
+#___________________________________________________________________________________________________ _runDownload
+    def _runDownload(self):
+        """ Streams the response to the download path, reporting the bytes received through the
+            rate limited progressSignal. """
+        try:
+            self._output = RequestUtils.executeDownload(
+                url=self._url,
+                path=self._downloadPath,
+                logger=self._log,
+                resume=self._resume,
+                hashAlgorithm=self._hashAlgorithm,
+                expectedHash=self._expectedHash,
+                progressCallback=self.dispatchProgress,
+                cancellationToken=self._token,
+                retryPolicy=self._retryPolicy,
+                requestStats=self._requestStats,
+                timeout=self._timeout,
+                deadline=self._deadline
+            )
+        except Exception as err:
+            self._log.writeError('FAILED: Download attempt.', err)
+            return 1
+
+        if isinstance(self._output, RequestUtils.REQUEST_FAILURE_NT):
+            if self._output.ident == RequestUtils.CANCELLED:
+                return self.CANCELLED_CODE
+            return 1
+        return 0
@@ -4,6 +4,9 @@
 
 from __future__ import print_function, absolute_import, unicode_literals, division
 
+import os
+import time
+import hashlib
 from collections import namedtuple
 from pyaid.string.StringUtils import StringUtils
 
@@ -12,7 +15,16 @@ from requests import exceptions
 from requests import utils as requestUtils
 from PySide import QtCore
 
-from pyglass.app.PyGlassEnvironment import PyGlassEnvironment
+from pyglass.threading.CancellationToken import CancellationToken
+from pyglass.threading.RemoteTaskCancelledError import RemoteTaskCancelledError
+from pyglass.web.request.RequestCircuitBreaker import RequestCircuitBreaker
+from pyglass.web.request.RequestCoalescer import RequestCoalescer
+from pyglass.web.request.RequestRateLimiter import RequestRateLimiter
+from pyglass.web.request.RequestResponseCache import RequestResponseCache
+from pyglass.web.request.RequestRetryPolicy import RequestRetryPolicy
+from pyglass.web.request.RequestSessionPool import RequestSessionPool
+from pyglass.web.request.RequestVerificationError import RequestVerificationError
+from pyglass.web.request.RequestWatchdog import RequestWatchdog
 
 #=================================================================================================== RequestUtils
 class RequestUtils(QtCore.QObject):
@@ -23,70 +35,214 @@ class RequestUtils(QtCore.QObject):
 
     CONNECTION_FAILURE    = 'connection_failure'
     ATTEMPT_FAILURE       = 'attempt_failure'
+    CIRCUIT_OPEN          = 'circuit_open'
+    VERIFICATION_FAILURE  = 'verification_failure'
+    CANCELLED             = 'cancelled'
+    TIMEOUT               = 'timeout'
+
+    # The seconds allowed to establish a connection and between bytes received from the server
+    DEFAULT_CONNECT_TIMEOUT = 10.0
+    DEFAULT_READ_TIMEOUT    = 30.0
+
+    # The seconds allowed for a request, including its retries, before it fails with a TIMEOUT
+    DEFAULT_DEADLINE = 60.0
+
+    # The size, in bytes, of the chunks written by executeDownload
+    DOWNLOAD_CHUNK_SIZE = 65536
 
     REQUEST_FAILURE_NT = namedtuple(
         'REQUEST_FAILURE_NT', ['ident', 'message', 'error', 'response', 'requestData']
     )
 
+    # Errors that end a request immediately without counting against the circuit breaker
+    _FINAL_ERRORS = (RemoteTaskCancelledError, RequestVerificationError)
+
 #===================================================================================================
 #                                                                                     P U B L I C
 
 #___________________________________________________________________________________________________ executeRequest
     @classmethod
-    def executeRequest(cls, url, args =None, logger =None):
-        """ Executes the request specified. """
-        reqData  = {'url':url, 'args':args, 'logger':logger}
-        response = None
+    def executeRequest(
+            cls, url, args =None, logger =None, cache =True, allowStale =False, retryPolicy =None,
+            coalesce =True, requestStats =None, timeout =None, deadline =None
+    ):
+        """ Executes the request specified. Requests without arguments are GET requests, which
+            are served through the shared RequestResponseCache unless cache is False. When
+            allowStale is True a stale cached response is returned immediately while it is
+            revalidated in the background.
 
-        try:
-            #---------------------------------------------------------------------------------------
-            # EXECUTE REQUEST
-            #       Make the request securely with verification using the CA bundle file contained
-            #       within the requests python site library. The location of this file varies
-            #       depending on where the Python installation is located.
-            #       See PyGlassEnvironment.requestsCABundle getter for more details.
-            if url.startswith('https:'):
-                bundle= PyGlassEnvironment.requestsCABundle
-                if args is None:
-                    return requests.get(url, verify=bundle)
-                else:
-                    return requests.post(url, data=args, verify=bundle)
-            else:
-                if args is None:
-                    return requests.get(url)
-                else:
-                    return requests.post(url, data=args)
+            Failed attempts are retried according to the retryPolicy, or the default
+            RequestRetryPolicy if none is specified. Requests to a host whose circuit has been
+            opened by the shared RequestCircuitBreaker fail immediately with a CIRCUIT_OPEN
+            error. The number of attempts made is stored in the requestData of any error.
 
-        except exceptions.SSLError as err:
-            logger.writeError([
-                'SSL Request Error:',
-                'Default CA Bundle Path: ' + StringUtils.toUnicode(requestUtils.DEFAULT_CA_BUNDLE_PATH)
-            ], err)
+            Unless coalesce is False, a GET request made while an identical GET, with the same
+            cache, allowStale, retryPolicy, timeout and deadline, is in flight on another thread
+            waits for and shares the result of that request instead of being sent again. The wait
+            ends with a TIMEOUT error once the deadline passes, or a CANCELLED error if the
+            calling task is cancelled. If the shared request was cancelled it is sent again
+            instead. Network requests are queued by the shared RequestRateLimiter.
 
-            return cls._createError(
-                ident=RequestUtils.CONNECTION_FAILURE,
-                error=err,
-                response=response,
-                requestData=reqData,
-                message='Unable to establish secure connection.'
-            )
+            @@@param timeout:number|tuple
+                The connect and read timeouts of each attempt, in seconds, as a single number or a
+                (connect, read) tuple. Defaults to DEFAULT_CONNECT_TIMEOUT and
+                DEFAULT_READ_TIMEOUT.
 
-        except requests.ConnectionError as err:
-            return cls._createError(
-                ident=RequestUtils.CONNECTION_FAILURE,
-                error=err,
-                response=response,
-                requestData=reqData,
-                message='Unable to create connection. No available internet connection was found.'
-            )
-        except Exception as err:
-            return cls._createError(
-                ident=RequestUtils.ATTEMPT_FAILURE,
-                error=err,
-                response=response,
+            @@@param deadline:number
+                The seconds allowed for the request, including its retries and backoff, after
+                which it fails with a TIMEOUT error. Defaults to DEFAULT_DEADLINE.
+
+            @@@param requestStats:dict
+                When specified, updated with the seconds the request was queued by the rate
+                limiter (queueTime), whether its result was shared from another request in flight
+                (coalesced), its number of attempts, which for a shared result are the attempts
+                of the shared request, and its elapsed time.
+        """
+        start    = time.time()
+        deadline = cls.DEFAULT_DEADLINE if deadline is None else deadline
+        reqData  = {'url':url, 'args':args, 'logger':logger, 'attempts':0, 'deadline':deadline}
+        token    = CancellationToken.current()
+        limiter  = RequestRateLimiter.getInstance()
+        limiter.popWaitTime()
+
+        def execute():
+            result = cls._executeWithRetries(
+                send=lambda t: cls._sendRequest(url, args, cache, allowStale, t),
+                method='GET' if args is None else 'POST',
                 requestData=reqData,
-                message='Unable to connect to remote server at this time.'
-            )
+                retryPolicy=retryPolicy,
+                timeout=timeout,
+                deadline=deadline)
+            cancelled = (token is not None and token.isCancelled) or (
+                isinstance(result, cls.REQUEST_FAILURE_NT) and result.ident == cls.CANCELLED)
+            return result, reqData['attempts'], cancelled
+
+        if args is None and coalesce:
+            coalescer = RequestCoalescer.getInstance()
+            key       = RequestCoalescer.createKey(url, options=(
+                cache, allowStale, retryPolicy, cls.getTimeouts(timeout), deadline))
+            while True:
+                try:
+                    (result, attempts, cancelled), coalesced = coalescer.execute(
+                        key, execute, timeout=start + deadline - time.time(), token=token)
+                except (exceptions.Timeout, RemoteTaskCancelledError) as err:
+                    if isinstance(err, exceptions.Timeout):
+                        RequestWatchdog.getInstance().recordTimeout(url, RequestWatchdog.DEADLINE)
+                    result, attempts, coalesced = cls._createFailure(err, reqData), 0, True
+                    break
+
+                # The result of a cancelled request is only shared with the caller that
+                # cancelled it, so a caller that shared it sends the request again
+                if not coalesced or not cancelled:
+                    break
+            reqData['attempts'] = attempts
+        else:
+            result, coalesced = execute()[0], False
+
+        reqData['queueTime'] = limiter.popWaitTime()
+        if requestStats is not None:
+            requestStats.update(
+                queueTime=reqData['queueTime'],
+                coalesced=coalesced,
+                attempts=reqData['attempts'],
+                elapsed=time.time() - start)
+        return result
+
+#___________________________________________________________________________________________________ executeDownload
+    @classmethod
+    def executeDownload(
+            cls, url, path, logger =None, headers =None, resume =True, hashAlgorithm =None,
+            expectedHash =None, chunkSize =None, progressCallback =None, cancellationToken =None,
+            retryPolicy =None, requestStats =None, timeout =None, deadline =None
+    ):
+        """ Streams the response body of a GET request to the file at path without holding it in
+            memory. The content is written to a path + '.part' file that is renamed into place
+            once the download completes, so the target file is never partially written. Returns
+            the requests.Response, whose content has been consumed, or a REQUEST_FAILURE_NT.
+
+            Retries and the circuit breaker apply as in executeRequest. A partial file left by a
+            failed or cancelled download is resumed with a Range request, by later attempts and
+            later calls, unless resume is False or the server does not support ranges. The strong
+            ETag or Last-Modified date of the response is kept in a path + '.part.validator' file
+            and sent as If-Range, so that a resource that has changed since is downloaded again in
+            full, and the content is requested without compression so that range offsets match
+            the partial file.
+
+            @@@param hashAlgorithm:string
+                The hashlib algorithm name used to hash the content as it arrives. The hex digest
+                is stored as the digest attribute of the returned response.
+
+            @@@param expectedHash:string
+                The expected hex digest of the content. On a mismatch the file is discarded and a
+                VERIFICATION_FAILURE error is returned. Defaults the algorithm to sha256.
+
+            @@@param progressCallback:function
+                Called with a dictionary of the bytes received, total bytes, if known, and
+                fraction complete after each chunk is written.
+
+            @@@param cancellationToken:CancellationToken
+                Polled between chunks. Defaults to the token of the calling task, if any.
+
+            @@@param timeout:number|tuple
+                The connect and read timeouts of each attempt as in executeRequest.
+
+            @@@param deadline:number
+                The seconds allowed for the whole download, checked between chunks. Downloads
+                have no overall deadline by default.
+
+            @@@param requestStats:dict
+                When specified, updated as by executeRequest.
+        """
+        if expectedHash and not hashAlgorithm:
+            hashAlgorithm = 'sha256'
+
+        reqData = {
+            'url':url, 'args':None, 'logger':logger, 'attempts':0, 'path':path,
+            'deadline':deadline}
+        token   = cancellationToken if cancellationToken else CancellationToken.current()
+        start   = time.time()
+        expires = None if deadline is None else start + deadline
+        limiter = RequestRateLimiter.getInstance()
+        limiter.popWaitTime()
+
+        result = cls._executeWithRetries(
+            send=lambda t: cls._sendDownload(
+                url=url,
+                path=path,
+                headers=headers,
+                resume=resume,
+                hashAlgorithm=hashAlgorithm,
+                expectedHash=expectedHash,
+                chunkSize=chunkSize if chunkSize else cls.DOWNLOAD_CHUNK_SIZE,
+                progressCallback=progressCallback,
+                token=token,
+                timeout=t,
+                expires=expires),
+            method='GET',
+            requestData=reqData,
+            retryPolicy=retryPolicy,
+            timeout=timeout,
+            deadline=deadline)
+
+        reqData['queueTime'] = limiter.popWaitTime()
+        if requestStats is not None:
+            requestStats.update(
+                queueTime=reqData['queueTime'],
+                coalesced=False,
+                attempts=reqData['attempts'],
+                elapsed=time.time() - start)
+        return result
+
+#___________________________________________________________________________________________________ getTimeouts
+    @classmethod
+    def getTimeouts(cls, timeout =None):
+        """ Returns the (connect, read) timeouts tuple for a timeout specified as None, for the
+            defaults, a single number used for both, or a (connect, read) tuple. """
+        if timeout is None:
+            return cls.DEFAULT_CONNECT_TIMEOUT, cls.DEFAULT_READ_TIMEOUT
+        if isinstance(timeout, (tuple, list)):
+            return tuple(timeout)
+        return timeout, timeout
 
 #___________________________________________________________________________________________________ logError
     @classmethod
@@ -123,6 +279,336 @@ class RequestUtils(QtCore.QObject):
 #===================================================================================================
 #                                                                               P R O T E C T E D
 
+#___________________________________________________________________________________________________ _executeWithRetries
+    @classmethod
+    def _executeWithRetries(
+            cls, send, method, requestData, retryPolicy, timeout =None, deadline =None
+    ):
+        """ Calls send with the (connect, read) timeouts of each attempt until it returns a
+            response that does not need to be retried, retrying according to the retry policy
+            and rejecting attempts while the circuit breaker for the host is open. The timeouts
+            of each attempt are capped by what remains of the deadline and no retry is made once
+            its backoff would pass the deadline. The request is recorded by the circuit breaker
+            once, by the outcome of its final attempt. Returns the final response or a
+            REQUEST_FAILURE_NT. """
+        url      = requestData['url']
+        policy   = retryPolicy if retryPolicy else RequestRetryPolicy.getInstance()
+        breaker  = RequestCircuitBreaker.getInstance()
+        watchdog = RequestWatchdog.getInstance()
+        host     = breaker.getHost(url)
+        timeouts = cls.getTimeouts(timeout)
+        expires  = None if deadline is None else time.time() + deadline
+        attempt  = 0
+        trial    = False
+        failed   = False
+
+        try:
+            while True:
+                allowed = breaker.allowRequest(host)
+                if not allowed:
+                    requestData['circuitState'] = breaker.getState(host)
+                    requestData['retryTime']    = breaker.getRetryTime(host)
+                    return cls._createError(
+                        ident=RequestUtils.CIRCUIT_OPEN,
+                        error=None,
+                        response=None,
+                        requestData=requestData,
+                        message='Requests to %s are suspended for %.1f seconds after repeated '
+                                'failures.' % (host, requestData['retryTime']))
+                trial = allowed == RequestCircuitBreaker.HALF_OPEN
+
+                response = None
+                error    = None
+
+                attemptTimeouts = timeouts
+                if expires is not None:
+                    remaining = expires - time.time()
+                    if remaining <= 0:
+                        error = exceptions.Timeout('Deadline of %s seconds exceeded' % deadline)
+                        break
+                    attemptTimeouts = tuple([min(t, remaining) for t in timeouts])
+
+                requestData['attempts'] = attempt + 1
+                try:
+                    response = send(attemptTimeouts)
+                except Exception as err:
+                    error = err
+
+                if isinstance(error, exceptions.ConnectTimeout):
+                    watchdog.recordTimeout(url, RequestWatchdog.CONNECT)
+                elif isinstance(error, exceptions.ReadTimeout):
+                    watchdog.recordTimeout(url, RequestWatchdog.READ)
+
+                if isinstance(error, cls._FINAL_ERRORS):
+                    failed = False
+                    break
+
+                failed = error is not None or response.status_code >= 500
+                if not failed:
+                    breaker.recordSuccess(host)
+                    trial = False
+
+                if isinstance(error, exceptions.SSLError) or \
+                        not policy.isRetryable(method, attempt, response=response, error=error):
+                    break
+
+                delay = policy.getDelay(attempt, response)
+                if expires is not None and time.time() + delay >= expires:
+                    break
+
+                # The failure of a retried attempt is not recorded, so a trial is handed back
+                # while waiting and the retry becomes a new trial if the circuit is still half open
+                if trial:
+                    breaker.releaseTrial(host)
+                    trial = False
+                if policy.wait(delay):
+                    break
+                attempt += 1
+
+            if failed:
+                breaker.recordFailure(host)
+                trial = False
+        finally:
+            if trial:
+                breaker.releaseTrial(host)
+
+        if error is None:
+            return response
+
+        if isinstance(error, exceptions.Timeout) and expires is not None \
+                and time.time() >= expires:
+            watchdog.recordTimeout(url, RequestWatchdog.DEADLINE)
+        return cls._createFailure(error, requestData)
+
+#___________________________________________________________________________________________________ _sendRequest
+    @classmethod
+    def _sendRequest(cls, url, args, cache, allowStale, timeout):
+        #-------------------------------------------------------------------------------------------
+        # EXECUTE REQUEST
+        #       Make the request through the pooled session for the host so that kept-alive
+        #       connections are reused. Secure sessions verify using the CA bundle file
+        #       contained within the requests python site library. The location of this file
+        #       varies depending on where the Python installation is located.
+        #       See PyGlassEnvironment.requestsCABundle getter for more details.
+        sessions = RequestSessionPool.getInstance()
+        if args is None:
+            if cache:
+                return RequestResponseCache.getInstance().get(
+                    url, allowStale=allowStale, timeout=timeout)
+            return sessions.get(url, timeout=timeout)
+        else:
+            return sessions.post(url, data=args, timeout=timeout)
+
+#___________________________________________________________________________________________________ _sendDownload
+    @classmethod
+    def _sendDownload(
+            cls, url, path, headers, resume, hashAlgorithm, expectedHash, chunkSize,
+            progressCallback, token, timeout, expires
+    ):
+        partPath      = path + '.part'
+        validatorPath = partPath + '.validator'
+        offset        = os.path.getsize(partPath) if resume and os.path.exists(partPath) else 0
+
+        # A partial file is only resumed if the validator of the response it came from is known,
+        # so that it is never completed with the content of a different version of the resource
+        validator = cls._readFile(validatorPath) if offset else None
+        if not validator:
+            offset = 0
+
+        # Range offsets are offsets into the encoded content, so the content must not be
+        # compressed for the offset of the decoded partial file to be valid
+        requestHeaders = dict(headers) if headers else dict()
+        requestHeaders['Accept-Encoding'] = 'identity'
+        if offset:
+            requestHeaders['Range']    = 'bytes=%s-' % offset
+            requestHeaders['If-Range'] = validator
+
+        response = RequestSessionPool.getInstance().get(
+            url, headers=requestHeaders, stream=True, timeout=timeout)
+        try:
+            if offset and response.status_code == 416:
+                # The range is not satisfiable so the partial file cannot be resumed
+                os.remove(partPath)
+                cls._removeFile(validatorPath)
+                response.close()
+                return cls._sendDownload(
+                    url, path, headers, False, hashAlgorithm, expectedHash, chunkSize,
+                    progressCallback, token, timeout, expires)
+
+            if response.status_code not in (200, 206):
+                return response
+
+            if response.status_code == 200 or not response.headers.get(
+                'Content-Range', ''
+            ).startswith('bytes %s-' % offset):
+                # The server ignored the range request, or the resource changed, so the content
+                # is downloaded in full
+                offset = 0
+
+            if not offset:
+                validator = cls._getDownloadValidator(response)
+                if validator:
+                    cls._writeFile(validatorPath, validator)
+                else:
+                    cls._removeFile(validatorPath)
+
+            digest = hashlib.new(hashAlgorithm) if hashAlgorithm else None
+            if offset and digest:
+                with open(partPath, 'rb') as f:
+                    for chunk in iter(lambda: f.read(chunkSize), b''):
+                        digest.update(chunk)
+
+            length   = response.headers.get('Content-Length')
+            total    = offset + int(length) if length and length.isdigit() else None
+            received = offset
+
+            with open(partPath, 'ab' if offset else 'wb') as f:
+                for chunk in response.iter_content(chunkSize):
+                    if token is not None:
+                        token.raiseIfCancelled()
+                    if expires is not None and time.time() >= expires:
+                        raise exceptions.Timeout('Download deadline exceeded for %s' % url)
+                    if not chunk:
+                        continue
+
+                    f.write(chunk)
+                    received += len(chunk)
+                    if digest:
+                        digest.update(chunk)
+
+                    if progressCallback:
+                        progressCallback(dict(
+                            bytes=received,
+                            total=total,
+                            fraction=float(received)/total if total else None))
+
+            response.digest = digest.hexdigest() if digest else None
+            cls._removeFile(validatorPath)
+            if expectedHash and response.digest.lower() != expectedHash.lower():
+                os.remove(partPath)
+                raise RequestVerificationError(
+                    '%s hash mismatch for %s: expected %s but received %s' % (
+                        hashAlgorithm, url, expectedHash, response.digest))
+
+            if hasattr(os, 'replace'):
+                os.replace(partPath, path)
+            else:
+                if os.path.exists(path):
+                    os.remove(path)
+                os.rename(partPath, path)
+
+            response.downloadPath      = path
+            response.downloadedBytes   = received
+            response._content          = None
+            response._content_consumed = True
+            return response
+        finally:
+            response.close()
+
+#___________________________________________________________________________________________________ _getDownloadValidator
+    @classmethod
+    def _getDownloadValidator(cls, response):
+        """ Returns the If-Range validator with which a download of the response can be resumed,
+            which is its strong ETag or else its Last-Modified date, or None if the download
+            cannot be resumed safely. """
+        if response.headers.get('Content-Encoding', 'identity').lower() != 'identity':
+            return None
+
+        etag = response.headers.get('ETag')
+        if etag and not etag.startswith('W/'):
+            return etag
+        return response.headers.get('Last-Modified')
+
+#___________________________________________________________________________________________________ _readFile
+    @classmethod
+    def _readFile(cls, path):
+        try:
+            with open(path, 'rb') as f:
+                return f.read().decode('utf-8').strip()
+        except Exception:
+            return None
+
+#___________________________________________________________________________________________________ _writeFile
+    @classmethod
+    def _writeFile(cls, path, value):
+        with open(path, 'wb') as f:
+            f.write(value.encode('utf-8'))
+
+#___________________________________________________________________________________________________ _removeFile
+    @classmethod
+    def _removeFile(cls, path):
+        try:
+            os.remove(path)
+        except Exception:
+            pass
+
+#___________________________________________________________________________________________________ _createFailure
+    @classmethod
+    def _createFailure(cls, error, requestData):
+        """ Creates the REQUEST_FAILURE_NT for an exception raised by the final request
+            attempt. """
+        logger = requestData.get('logger')
+
+        if isinstance(error, exceptions.SSLError):
+            if logger:
+                logger.writeError([
+                    'SSL Request Error:',
+                    'Default CA Bundle Path: ' + StringUtils.toUnicode(
+                        requestUtils.DEFAULT_CA_BUNDLE_PATH)
+                ], error)
+
+            return cls._createError(
+                ident=RequestUtils.CONNECTION_FAILURE,
+                error=error,
+                response=None,
+                requestData=requestData,
+                message='Unable to establish secure connection.'
+            )
+
+        if isinstance(error, RequestVerificationError):
+            return cls._createError(
+                ident=RequestUtils.VERIFICATION_FAILURE,
+                error=error,
+                response=None,
+                requestData=requestData,
+                message='Downloaded content failed verification.'
+            )
+
+        if isinstance(error, exceptions.Timeout):
+            return cls._createError(
+                ident=RequestUtils.TIMEOUT,
+                error=error,
+                response=None,
+                requestData=requestData,
+                message='The remote server did not respond in time.'
+            )
+
+        if isinstance(error, RemoteTaskCancelledError):
+            return cls._createError(
+                ident=RequestUtils.CANCELLED,
+                error=error,
+                response=None,
+                requestData=requestData,
+                message='Request was cancelled.'
+            )
+
+        if isinstance(error, requests.ConnectionError):
+            return cls._createError(
+                ident=RequestUtils.CONNECTION_FAILURE,
+                error=error,
+                response=None,
+                requestData=requestData,
+                message='Unable to create connection. No available internet connection was found.'
+            )
+
+        return cls._createError(
+            ident=RequestUtils.ATTEMPT_FAILURE,
+            error=error,
+            response=None,
+            requestData=requestData,
+            message='Unable to connect to remote server at this time.'
+        )
+
 #___________________________________________________________________________________________________ _createError
     @classmethod
     def _createError(cls, ident, error, message, response, requestData):
@@ -133,5 +619,6 @@ class RequestUtils(QtCore.QObject):
             response=response,
             requestData=requestData
         )
-        cls.logError(requestData.logger, out)
+        if requestData.get('logger'):
+            cls.logError(requestData['logger'], out)
         return out
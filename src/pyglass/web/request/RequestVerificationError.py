@@ -0,0 +1,9 @@
+# RequestVerificationError.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+#___________________________________________________________________________________________________ RequestVerificationError
+class RequestVerificationError(Exception):
+    """ Raised when the hash of downloaded content does not match the expected hash. """
@@ -0,0 +1,157 @@
+# RequestWatchdog.py
+# (C)2014
+# Scott Ernst
+
+from __future__ import print_function, absolute_import, unicode_literals, division
+
+import time
+import threading
+
+from PySide import QtCore
+
+from pyaid.debug.Logger import Logger
+
+try:
+    from urllib.parse import urlsplit
+except Exception as err:
+    from urlparse import urlsplit
+
+#___________________________________________________________________________________________________ RequestWatchdog
+class RequestWatchdog(object):
+    """ Releases asynchronous requests that are still outstanding past their deadline, such as
+        requests whose thread is stuck on a stalled server, so that their callbacks are not left
+        waiting forever and they do not accumulate in Request._activeRequests. A released
+        request completes with a TIMEOUT error and the thread or future executing it is
+        cancelled. Released requests are reported in the log.
+
+        The watchdog also keeps the timeout metrics of every host, counting connect and read
+        timeouts, exceeded deadlines and released requests, which are recorded from whichever
+        thread the timeout occurs on. """
+
+#===================================================================================================
+#                                                                                       C L A S S
+
+    # The interval, in milliseconds, at which outstanding requests are checked
+    CHECK_INTERVAL = 1000
+
+    # The seconds past its deadline that a request is given to time out on its own before it
+    # is released by the watchdog
+    GRACE_PERIOD = 5.0
+
+    CONNECT = 'connect'
+
+    READ = 'read'
+
+    DEADLINE = 'deadline'
+
+    RELEASED = 'released'
+
+    _instance = None
+
+#___________________________________________________________________________________________________ __init__
+    def __init__(self):
+        """Creates a new instance of RequestWatchdog."""
+        self._lock     = threading.Lock()
+        self._log      = Logger(self)
+        self._watched  = dict()
+        self._timeouts = dict()
+        self._timer    = None
+
+#===================================================================================================
+#                                                                                   G E T / S E T
+
+#___________________________________________________________________________________________________ GS: watchedCount
+    @property
+    def watchedCount(self):
+        return len(self._watched)
+
+#___________________________________________________________________________________________________ GS: stats
+    @property
+    def stats(self):
+        """ The number of connect, read, deadline and released timeouts by host. """
+        with self._lock:
+            return dict([(host, dict(counts)) for host, counts in self._timeouts.items()])
+
+#===================================================================================================
+#                                                                                     P U B L I C
+
+#___________________________________________________________________________________________________ getInstance
+    @classmethod
+    def getInstance(cls):
+        """ Returns the shared watchdog, creating it on first access. """
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+#___________________________________________________________________________________________________ watch
+    def watch(self, request, deadline):
+        """ Watches the request, which will be released if it has not completed within deadline
+            seconds plus the grace period. Must be called on the GUI thread. The request must
+            have a url, implement _handleDeadlineExceeded() and be unwatched when it completes.
+
+            The deadline is measured from the startTime of the request, if it has one, which is
+            None while it is queued for execution and not yet subject to its deadline, or
+            otherwise from the time it is watched. """
+        self._watched[request] = (time.time(), deadline)
+
+        if self._timer is None:
+            self._timer = QtCore.QTimer()
+            self._timer.timeout.connect(self._handleTimer)
+        if not self._timer.isActive():
+            self._timer.start(self.CHECK_INTERVAL)
+
+#___________________________________________________________________________________________________ unwatch
+    def unwatch(self, request):
+        return self._watched.pop(request, None) is not None
+
+#___________________________________________________________________________________________________ recordTimeout
+    def recordTimeout(self, url, kind):
+        """ Counts a timeout of the specified kind, CONNECT, READ, DEADLINE or RELEASED, for the
+            host of the url. Safe to call from any thread. """
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            counts = self._timeouts.get(host)
+            if counts is None:
+                counts = {self.CONNECT:0, self.READ:0, self.DEADLINE:0, self.RELEASED:0}
+                self._timeouts[host] = counts
+            counts[kind] += 1
+
+#___________________________________________________________________________________________________ check
+    def check(self):
+        """ Releases every watched request past its deadline and returns the released requests. """
+        now     = time.time()
+        expired = []
+        for request, (watchTime, deadline) in list(self._watched.items()):
+            start = getattr(request, 'startTime', watchTime)
+            if start is not None and start + deadline + self.GRACE_PERIOD <= now:
+                expired.append(request)
+
+        for request in expired:
+            self._watched.pop(request, None)
+            self.recordTimeout(request.url, self.RELEASED)
+            self._log.write(
+                'WARNING: Released request to %s that was still outstanding past its deadline'
+                % request.url)
+            request._handleDeadlineExceeded()
+
+        if not self._watched and self._timer is not None:
+            self._timer.stop()
+        return expired
+
+#===================================================================================================
+#                                                                                 H A N D L E R S
+
+#___________________________________________________________________________________________________ _handleTimer
+    def _handleTimer(self):
+        self.check()
+
+#===================================================================================================
+#                                                                               I N T R I N S I C
+
+#___________________________________________________________________________________________________ __repr__
+    def __repr__(self):
+        return self.__str__()
+
+#___________________________________________________________________________________________________ __str__
+    def __str__(self):
+        return '<%s watched[%s]>' % (self.__class__.__name__, len(self._watched))